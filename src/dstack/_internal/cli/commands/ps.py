@@ -5,6 +5,7 @@ from rich.live import Live
 
 import dstack._internal.cli.utils.run as run_utils
 from dstack._internal.cli.commands import APIBaseCommand
+from dstack._internal.cli.services.runs import RunsWatcher
 from dstack._internal.cli.utils.common import (
     LIVE_TABLE_PROVISION_INTERVAL_SECS,
     LIVE_TABLE_REFRESH_RATE_PER_SEC,
@@ -39,16 +40,19 @@ class PsCommand(APIBaseCommand):
 
     def _command(self, args: argparse.Namespace):
         super()._command(args)
-        runs = self.api.runs.list(all=args.all)
         if not args.watch:
+            runs = self.api.runs.list(all=args.all)
             console.print(run_utils.get_runs_table(runs, verbose=args.verbose))
             return
 
+        runs_watcher = RunsWatcher(api=self.api, all=args.all)
         try:
             with Live(console=console, refresh_per_second=LIVE_TABLE_REFRESH_RATE_PER_SEC) as live:
                 while True:
-                    live.update(run_utils.get_runs_table(runs, verbose=args.verbose))
+                    runs_watcher.update()
+                    live.update(
+                        run_utils.get_runs_table(runs_watcher.list(), verbose=args.verbose)
+                    )
                     time.sleep(LIVE_TABLE_PROVISION_INTERVAL_SECS)
-                    runs = self.api.runs.list(all=args.all)
         except KeyboardInterrupt:
             pass
@@ -8,6 +8,7 @@ from rich.table import Table
 
 from dstack._internal.cli.commands import APIBaseCommand
 from dstack._internal.cli.services.completion import RunNameCompleter
+from dstack._internal.cli.services.runs import RunsWatcher
 from dstack._internal.cli.utils.common import (
     LIVE_TABLE_PROVISION_INTERVAL_SECS,
     LIVE_TABLE_REFRESH_RATE_PER_SEC,
@@ -47,12 +48,18 @@ class StatsCommand(APIBaseCommand):
             console.print(_get_stats_table(run, metrics))
             return
 
+        runs_watcher = RunsWatcher(api=self.api)
+        runs_watcher.update()
         try:
             with Live(console=console, refresh_per_second=LIVE_TABLE_REFRESH_RATE_PER_SEC) as live:
                 while True:
                     live.update(_get_stats_table(run, metrics))
                     time.sleep(LIVE_TABLE_PROVISION_INTERVAL_SECS)
-                    run = self.api.runs.get(run_name=args.run_name)
+                    runs_watcher.update()
+                    run = runs_watcher.get(run_name=args.run_name)
+                    if run is None:
+                        # The run may be not in the latest runs after the watcher reloads them
+                        run = self.api.runs.get(run_name=args.run_name)
                     if run is None:
                         raise CLIError(f"Run {args.run_name} not found")
                     if run.status.is_finished():
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from dstack._internal.core.errors import ServerValidationError
+from dstack._internal.core.models.runs import Run as RunModel
+from dstack._internal.server.schemas.runs import RunsListProjection
+from dstack.api import Client, Run
+
+# Runs are fetched again if they changed this long before the last seen change,
+# since the server may commit changes with earlier timestamps after they were listed
+CHANGES_CURSOR_MARGIN = timedelta(seconds=60)
+# The page size of `/api/runs/list`. If more runs changed, all runs are listed again.
+LIST_LIMIT = 100
+
+
+class RunsWatcher:
+    """
+    Keeps runs shown by `dstack ps` up to date by fetching only runs that changed
+    since the previous update instead of listing runs with all job submissions every time.
+    Runs only include the latest submission of each job.
+    Falls back to listing all runs every time if the server does not support it.
+    """
+
+    def __init__(self, api: Client, all: bool = False):
+        self.api = api
+        self.all = all
+        self._runs: Dict[UUID, RunModel] = {}
+        self._last_changed_at: Optional[datetime] = None
+        self._incremental = True
+
+    def update(self) -> None:
+        if self._last_changed_at is None or not self._incremental:
+            # Either not loaded yet, or there were no runs, or the server is too old
+            self._load_runs()
+            return
+        try:
+            changed_runs = self.api.client.runs.list(
+                project_name=self.api.project,
+                repo_id=None,
+                changed_after=self._last_changed_at - CHANGES_CURSOR_MARGIN,
+                limit=LIST_LIMIT,
+                projection=RunsListProjection.LATEST_SUBMISSION,
+            )
+        except ServerValidationError:
+            # Older servers do not support `changed_after` and `projection`
+            self._incremental = False
+            self._load_runs()
+            return
+        if len(changed_runs) >= LIST_LIMIT:
+            self._load_runs()
+            return
+        self._merge_runs(changed_runs)
+
+    def list(self) -> List[Run]:
+        """
+        Returns the same runs as `Client.runs.list(all)`.
+        """
+        runs = sorted(self._runs.values(), key=lambda r: r.submitted_at, reverse=True)
+        if self.all:
+            runs = runs[:LIST_LIMIT]
+        else:
+            active_runs = [r for r in runs if not r.status.is_finished()]
+            runs = active_runs or runs[:1]
+        return [self.api.runs.from_model(r) for r in runs]
+
+    def get(self, run_name: str) -> Optional[Run]:
+        runs = [r for r in self._runs.values() if r.run_spec.run_name == run_name]
+        if len(runs) == 0:
+            return None
+        run = max(runs, key=lambda r: r.submitted_at)
+        return self.api.runs.from_model(run)
+
+    def _load_runs(self) -> None:
+        if self._incremental:
+            try:
+                runs = self._list_runs(RunsListProjection.LATEST_SUBMISSION)
+            except ServerValidationError:
+                self._incremental = False
+        if not self._incremental:
+            runs = self._list_runs(RunsListProjection.FULL)
+        self._runs = {}
+        self._last_changed_at = None
+        self._merge_runs(runs)
+
+    def _list_runs(self, projection: RunsListProjection) -> List[RunModel]:
+        if self.all:
+            return self.api.client.runs.list(
+                project_name=self.api.project,
+                repo_id=None,
+                limit=LIST_LIMIT,
+                projection=projection,
+            )
+        # The latest run is shown if there are no active runs
+        return self.api.client.runs.list(
+            project_name=self.api.project,
+            repo_id=None,
+            only_active=True,
+            projection=projection,
+        ) + self.api.client.runs.list(
+            project_name=self.api.project,
+            repo_id=None,
+            limit=1,
+            projection=projection,
+        )
+
+    def _merge_runs(self, runs: List[RunModel]) -> None:
+        for run in runs:
+            if run.deleted:
+                self._runs.pop(run.id, None)
+            else:
+                self._runs[run.id] = run
+            changed_at = _get_run_last_changed_at(run)
+            if self._last_changed_at is None or changed_at > self._last_changed_at:
+                self._last_changed_at = changed_at
+
+
+def _get_run_last_changed_at(run: RunModel) -> datetime:
+    return max(
+        [run.last_processed_at]
+        + [s.last_processed_at for job in run.jobs for s in job.job_submissions]
+    )
@@ -1,5 +1,4 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 import boto3
 import botocore.client
@@ -9,6 +8,11 @@ from pydantic import ValidationError
 import dstack._internal.core.backends.aws.resources as aws_resources
 from dstack._internal import settings
 from dstack._internal.core.backends.aws.config import AWSConfig
+from dstack._internal.core.backends.aws.regions import (
+    get_credentials_key,
+    get_region_metadata_cache,
+    has_quota,
+)
 from dstack._internal.core.backends.base.compute import (
     Compute,
     get_gateway_user_data,
@@ -70,21 +74,20 @@ class AWSCompute(Compute):
             )
         else:  # default creds
             self.session = boto3.Session()
+        self._credentials_key = get_credentials_key(config.creds)
 
     def get_offers(
         self, requirements: Optional[Requirements] = None
     ) -> List[InstanceOfferWithAvailability]:
         filter = _supported_instances
+        region_metadata_cache = get_region_metadata_cache()
         if requirements and requirements.reservation:
-            region_to_reservation = {}
-            for region in self.config.regions:
-                reservation = aws_resources.get_reservation(
-                    ec2_client=self.session.client("ec2", region_name=region),
-                    reservation_id=requirements.reservation,
-                    instance_count=1,
-                )
-                if reservation is not None:
-                    region_to_reservation[region] = reservation
+            region_to_reservation = region_metadata_cache.get_regions_reservations(
+                session=self.session,
+                credentials_key=self._credentials_key,
+                regions=self.config.regions,
+                reservation_id=requirements.reservation,
+            )
 
             def _supported_instances_with_reservation(offer: InstanceOffer) -> bool:
                 # Filter: only instance types supported by dstack
@@ -109,20 +112,23 @@ class AWSCompute(Compute):
             configurable_disk_size=CONFIGURABLE_DISK_SIZE,
             extra_filter=filter,
         )
-        regions = list(set(i.region for i in offers))
-        regions_to_quotas = _get_regions_to_quotas(self.session, regions)
-        regions_to_zones = _get_regions_to_zones(self.session, regions)
+        regions_metadata = region_metadata_cache.get_regions_metadata(
+            session=self.session,
+            credentials_key=self._credentials_key,
+            regions=set(i.region for i in offers),
+        )
 
         availability_offers = []
         for offer in offers:
             availability = InstanceAvailability.UNKNOWN
-            if not _has_quota(regions_to_quotas[offer.region], offer.instance.name):
+            region_metadata = regions_metadata[offer.region]
+            if not has_quota(region_metadata.quotas, offer.instance.name):
                 availability = InstanceAvailability.NO_QUOTA
             availability_offers.append(
                 InstanceOfferWithAvailability(
                     **offer.dict(),
                     availability=availability,
-                    availability_zones=regions_to_zones[offer.region],
+                    availability_zones=region_metadata.availability_zones,
                 )
             )
         return availability_offers
@@ -754,54 +760,6 @@ def _get_vpc_id_subnet_id_by_vpc_name_or_error(
     )
 
 
-def _get_regions_to_quotas(
-    session: boto3.Session, regions: List[str]
-) -> Dict[str, Dict[str, int]]:
-    def get_region_quotas(client: botocore.client.BaseClient) -> Dict[str, int]:
-        region_quotas = {}
-        for page in client.get_paginator("list_service_quotas").paginate(ServiceCode="ec2"):
-            for q in page["Quotas"]:
-                if "On-Demand" in q["QuotaName"]:
-                    region_quotas[q["UsageMetric"]["MetricDimensions"]["Class"]] = q["Value"]
-        return region_quotas
-
-    regions_to_quotas = {}
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_region = {}
-        for region in regions:
-            future = executor.submit(
-                get_region_quotas, session.client("service-quotas", region_name=region)
-            )
-            future_to_region[future] = region
-        for future in as_completed(future_to_region):
-            regions_to_quotas[future_to_region[future]] = future.result()
-    return regions_to_quotas
-
-
-def _has_quota(quotas: Dict[str, int], instance_name: str) -> bool:
-    if instance_name.startswith("p"):
-        return quotas.get("P/OnDemand", 0) > 0
-    if instance_name.startswith("g"):
-        return quotas.get("G/OnDemand", 0) > 0
-    return quotas.get("Standard/OnDemand", 0) > 0
-
-
-def _get_regions_to_zones(session: boto3.Session, regions: List[str]) -> Dict[str, List[str]]:
-    regions_to_zones = {}
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_region = {}
-        for region in regions:
-            future = executor.submit(
-                aws_resources.get_availability_zones,
-                session.client("ec2", region_name=region),
-                region,
-            )
-            future_to_region[future] = region
-        for future in as_completed(future_to_region):
-            regions_to_zones[future_to_region[future]] = future.result()
-    return regions_to_zones
-
-
 def _supported_instances(offer: InstanceOffer) -> bool:
     for family in [
         "t2.small",
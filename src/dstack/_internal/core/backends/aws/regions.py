@@ -0,0 +1,158 @@
+"""
+Per-region AWS metadata used to compute offers: On-Demand quotas, availability zones,
+and capacity reservations.
+
+The metadata is cached per credentials, so it's shared by all requirements and by all
+projects configured with the same credentials. Expired entries are served while being
+refreshed in the background, so computing offers doesn't wait for AWS APIs once warm.
+"""
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import boto3
+import botocore.client
+
+import dstack._internal.core.backends.aws.resources as aws_resources
+from dstack._internal import settings
+from dstack._internal.core.models.backends.aws import AnyAWSCreds, AWSAccessKeyCreds
+from dstack._internal.core.models.common import is_core_model_instance
+from dstack._internal.utils.cache import CacheStats, SingleFlightCache
+
+
+@dataclass(frozen=True)
+class RegionMetadata:
+    # quota class, e.g. "P/OnDemand" -> vCPUs
+    quotas: Dict[str, int]
+    availability_zones: List[str]
+
+
+class RegionMetadataCache:
+    def __init__(
+        self,
+        ttl: float = settings.AWS_REGION_METADATA_CACHE_TTL,
+        stale_ttl: float = settings.AWS_REGION_METADATA_CACHE_STALE_TTL,
+        reservations_ttl: float = settings.AWS_RESERVATIONS_CACHE_TTL,
+        # Reservations are used up quickly, so they're not served stale by default
+        reservations_stale_ttl: float = settings.AWS_RESERVATIONS_CACHE_STALE_TTL,
+        max_workers: int = 8,
+    ) -> None:
+        # (credentials key, region) -> metadata
+        self._metadata: SingleFlightCache[Tuple[str, str], RegionMetadata] = SingleFlightCache(
+            maxsize=1024, ttl=ttl, stale_ttl=stale_ttl
+        )
+        # (credentials key, region, reservation id) -> reservation
+        self._reservations: SingleFlightCache[Tuple[str, str, str], Optional[Dict[str, Any]]] = (
+            SingleFlightCache(maxsize=1024, ttl=reservations_ttl, stale_ttl=reservations_stale_ttl)
+        )
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def get_regions_metadata(
+        self, session: boto3.Session, credentials_key: str, regions: Iterable[str]
+    ) -> Dict[str, RegionMetadata]:
+        return self._get_many(
+            cache=self._metadata,
+            keys={region: (credentials_key, region) for region in regions},
+            load=lambda region: _load_region_metadata(session, region),
+        )
+
+    def get_regions_reservations(
+        self,
+        session: boto3.Session,
+        credentials_key: str,
+        regions: Iterable[str],
+        reservation_id: str,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns region -> reservation for the regions where the reservation is active
+        and has available instances.
+        """
+        regions_to_reservations = self._get_many(
+            cache=self._reservations,
+            keys={region: (credentials_key, region, reservation_id) for region in regions},
+            load=lambda region: aws_resources.get_reservation(
+                ec2_client=session.client("ec2", region_name=region),
+                reservation_id=reservation_id,
+                instance_count=1,
+            ),
+        )
+        return {r: res for r, res in regions_to_reservations.items() if res is not None}
+
+    def clear(self) -> None:
+        self._metadata.clear()
+        self._reservations.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._metadata.stats
+
+    def _get_many(self, cache: SingleFlightCache, keys: Dict[str, Any], load) -> Dict[str, Any]:
+        # Cached regions, including expired ones, are returned right away.
+        # Missing regions are loaded concurrently.
+        result = {}
+        futures = {}
+        for region, key in keys.items():
+            if cache.peek(key) is not None:
+                result[region] = cache.get(key, lambda region=region: load(region))
+            else:
+                futures[region] = self._get_executor().submit(
+                    cache.get, key, lambda region=region: load(region)
+                )
+        for region, future in futures.items():
+            result[region] = future.result()
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="dstack-aws-regions"
+                )
+            return self._executor
+
+
+def get_credentials_key(creds: AnyAWSCreds) -> str:
+    """
+    Returns a key identifying the AWS account behind the credentials without containing them.
+    """
+    if is_core_model_instance(creds, AWSAccessKeyCreds):
+        return hashlib.sha256(f"{creds.access_key}:{creds.secret_key}".encode()).hexdigest()
+    return "default"
+
+
+def has_quota(quotas: Dict[str, int], instance_name: str) -> bool:
+    if instance_name.startswith("p"):
+        return quotas.get("P/OnDemand", 0) > 0
+    if instance_name.startswith("g"):
+        return quotas.get("G/OnDemand", 0) > 0
+    return quotas.get("Standard/OnDemand", 0) > 0
+
+
+_region_metadata_cache = RegionMetadataCache()
+
+
+def get_region_metadata_cache() -> RegionMetadataCache:
+    return _region_metadata_cache
+
+
+def _load_region_metadata(session: boto3.Session, region: str) -> RegionMetadata:
+    return RegionMetadata(
+        quotas=_get_region_quotas(session.client("service-quotas", region_name=region)),
+        availability_zones=aws_resources.get_availability_zones(
+            session.client("ec2", region_name=region), region
+        ),
+    )
+
+
+def _get_region_quotas(client: botocore.client.BaseClient) -> Dict[str, int]:
+    region_quotas = {}
+    for page in client.get_paginator("list_service_quotas").paginate(ServiceCode="ec2"):
+        for q in page["Quotas"]:
+            if "On-Demand" in q["QuotaName"]:
+                region_quotas[q["UsageMetric"]["MetricDimensions"]["Class"]] = q["Value"]
+    return region_quotas
@@ -1,6 +1,5 @@
 import os
 import re
-import threading
 from abc import ABC, abstractmethod
 from functools import lru_cache
 from typing import Dict, List, Optional
@@ -8,7 +7,6 @@ from typing import Dict, List, Optional
 import git
 import requests
 import yaml
-from cachetools import TTLCache, cachedmethod
 
 from dstack._internal import settings
 from dstack._internal.core.consts import (
@@ -31,6 +29,7 @@ from dstack._internal.core.models.volumes import (
     VolumeAttachmentData,
     VolumeProvisioningData,
 )
+from dstack._internal.utils.cache import CacheStats, SingleFlightCache
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -44,8 +43,13 @@ DSTACK_RUNNER_BINARY_PATH = f"/usr/local/bin/{DSTACK_RUNNER_BINARY_NAME}"
 
 class Compute(ABC):
     def __init__(self):
-        self._offers_cache_lock = threading.Lock()
-        self._offers_cache = TTLCache(maxsize=5, ttl=30)
+        self._offers_cache: SingleFlightCache[int, List[InstanceOfferWithAvailability]] = (
+            SingleFlightCache(
+                maxsize=settings.OFFERS_CACHE_SIZE,
+                ttl=settings.OFFERS_CACHE_TTL,
+                stale_ttl=settings.OFFERS_CACHE_STALE_TTL,
+            )
+        )
 
     @abstractmethod
     def get_offers(
@@ -111,6 +115,30 @@ class Compute(ABC):
         """
         pass
 
+    def update_provisioning_data_batch(
+        self,
+        provisioning_data_list: List[JobProvisioningData],
+        project_ssh_public_key: str,
+        project_ssh_private_key: str,
+    ) -> List[Optional[Exception]]:
+        """
+        Same as `update_provisioning_data()` for many instances of the project.
+        Returns an error for each provisioning data, or `None` if no error occurred.
+        Backends that can get many instances with one API call should override it.
+        The default implementation calls `update_provisioning_data()` for each instance.
+        """
+        errors: List[Optional[Exception]] = []
+        for provisioning_data in provisioning_data_list:
+            try:
+                self.update_provisioning_data(
+                    provisioning_data, project_ssh_public_key, project_ssh_private_key
+                )
+            except Exception as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+        return errors
+
     def create_placement_group(
         self,
         placement_group: PlacementGroup,
@@ -198,15 +226,20 @@ class Compute(ABC):
             return hash(None)
         return hash(requirements.json())
 
-    @cachedmethod(
-        cache=lambda self: self._offers_cache,
-        key=_get_offers_cached_key,
-        lock=lambda self: self._offers_cache_lock,
-    )
     def get_offers_cached(
         self, requirements: Optional[Requirements] = None
     ) -> List[InstanceOfferWithAvailability]:
-        return self.get_offers(requirements)
+        """
+        Returns `get_offers()` results cached per requirements. Concurrent calls with the same
+        requirements share a single `get_offers()` call, and recently expired results are
+        returned while being refreshed in the background.
+        """
+        return self._offers_cache.get(
+            self._get_offers_cached_key(requirements), lambda: self.get_offers(requirements)
+        )
+
+    def get_offers_cache_stats(self) -> CacheStats:
+        return self._offers_cache.stats
 
 
 def get_instance_name(run: Run, job: Job) -> str:
@@ -1,5 +1,6 @@
 from dataclasses import asdict
-from typing import Callable, List, Optional
+from functools import lru_cache
+from typing import Callable, List, Optional, Set, Tuple
 
 import gpuhunt
 
@@ -149,13 +150,112 @@ def requirements_to_query_filter(req: Optional[Requirements]) -> gpuhunt.QueryFi
 def match_requirements(
     offers: List[InstanceOffer], requirements: Optional[Requirements]
 ) -> List[InstanceOffer]:
-    query_filter = requirements_to_query_filter(requirements)
-    filtered_offers = []
-    for offer in offers:
-        catalog_item = offer_to_catalog_item(offer)
-        if gpuhunt.matches(catalog_item, q=query_filter):
-            filtered_offers.append(offer)
-    return filtered_offers
+    matcher = OffersMatcher(requirements)
+    return [offer for offer in offers if matcher.matches(offer)]
+
+
+class OffersMatcher:
+    """
+    Matches offers against requirements the same way as `gpuhunt.matches()`,
+    but converts the requirements once instead of per offer and checks offer fields
+    directly instead of building a `gpuhunt.CatalogItem` for each offer.
+    """
+
+    def __init__(self, requirements: Optional[Requirements]):
+        q = requirements_to_query_filter(requirements)
+        self._q = q
+        self._providers: Optional[Set[str]] = None
+        if q.provider is not None:
+            self._providers = {p.lower() for p in q.provider}
+        self._gpu_names: Optional[Set[str]] = None
+        if q.gpu_name is not None:
+            self._gpu_names = {n.lower() for n in q.gpu_name}
+        self._check_compute_capability = (
+            q.min_compute_capability is not None or q.max_compute_capability is not None
+        )
+
+    def matches(self, offer: InstanceOffer) -> bool:
+        resources = offer.instance.resources
+        return self._matches(
+            offer=offer,
+            cpus=resources.cpus,
+            memory_mib=resources.memory_mib,
+            gpu_count=len(resources.gpus),
+        )
+
+    def get_min_matching_blocks(self, offer: InstanceOffer, total_blocks: int) -> Optional[int]:
+        """
+        Returns the minimum number of blocks such that the shared offer for these blocks
+        matches, or `None` if no number of blocks matches. Shared offer resources are
+        computed as in `generate_shared_offer()` without building the shared offers.
+        """
+        resources = offer.instance.resources
+        cpus_per_block = resources.cpus // total_blocks
+        memory_mib_per_block = resources.memory_mib // total_blocks
+        gpus_per_block = len(resources.gpus) // total_blocks
+        for blocks in range(1, total_blocks + 1):
+            if self._matches(
+                offer=offer,
+                cpus=cpus_per_block * blocks,
+                memory_mib=memory_mib_per_block * blocks,
+                gpu_count=gpus_per_block * blocks,
+            ):
+                return blocks
+        return None
+
+    def _matches(self, offer: InstanceOffer, cpus: int, memory_mib: int, gpu_count: int) -> bool:
+        q = self._q
+        resources = offer.instance.resources
+        if self._providers is not None and offer.backend.value.lower() not in self._providers:
+            return False
+        if not _is_between(offer.price, q.min_price, q.max_price):
+            return False
+        if q.spot is not None and resources.spot != q.spot:
+            return False
+        if not _is_between(cpus, q.min_cpu, q.max_cpu):
+            return False
+        if not _is_between(memory_mib / 1024, q.min_memory, q.max_memory):
+            return False
+        gpu = resources.gpus[0] if gpu_count > 0 else None
+        if q.gpu_vendor and (gpu is None or q.gpu_vendor != gpu.vendor):
+            return False
+        if not _is_between(gpu_count, q.min_gpu_count, q.max_gpu_count):
+            return False
+        if self._gpu_names is not None:
+            if gpu is None or gpu.name.lower() not in self._gpu_names:
+                return False
+        if self._check_compute_capability:
+            if gpu is None or gpu.vendor != gpuhunt.AcceleratorVendor.NVIDIA:
+                return False
+            cc = _get_nvidia_compute_capability(gpu.name)
+            if cc is None or not _is_between(
+                cc, q.min_compute_capability, q.max_compute_capability
+            ):
+                return False
+        gpu_memory = gpu.memory_mib / 1024 if gpu is not None else 0
+        if not _is_between(gpu_memory, q.min_gpu_memory, q.max_gpu_memory):
+            return False
+        if not _is_between(gpu_count * gpu_memory, q.min_total_gpu_memory, q.max_total_gpu_memory):
+            return False
+        if not _is_between(resources.disk.size_mib / 1024, q.min_disk_size, q.max_disk_size):
+            return False
+        return True
+
+
+@lru_cache
+def _get_nvidia_compute_capability(gpu_name: str) -> Optional[Tuple[int, int]]:
+    for gpu in gpuhunt.KNOWN_NVIDIA_GPUS:
+        if gpu.name.lower() == gpu_name.lower():
+            return gpu.compute_capability
+    return None
+
+
+def _is_between(value, min_value, max_value) -> bool:
+    if min_value is not None and value < min_value:
+        return False
+    if max_value is not None and value > max_value:
+        return False
+    return True
 
 
 def choose_disk_size_mib(
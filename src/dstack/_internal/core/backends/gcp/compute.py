@@ -1,6 +1,7 @@
 import concurrent.futures
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Dict, List, Literal, Optional
 
 import google.api_core.exceptions
@@ -57,6 +58,8 @@ logger = get_logger(__name__)
 # than 32TB because of filesystem settings
 CONFIGURABLE_DISK_SIZE = Range[Memory](min=Memory.parse("20GB"), max=Memory.parse("32TB"))
 
+# Instances are listed by name in chunks to keep the list filter reasonably short
+INSTANCES_LIST_FILTER_MAX_NAMES = 50
 
 TPU_VERSIONS = [tpu.name for tpu in KNOWN_TPUS]
 
@@ -351,11 +354,85 @@ class GCPCompute(Compute):
             )
         except google.api_core.exceptions.NotFound:
             raise ProvisioningError("Failed to get instance IP address. Instance not found.")
+        self._update_provisioning_data_from_instance(provisioning_data, instance)
 
+    def update_provisioning_data_batch(
+        self,
+        provisioning_data_list: List[JobProvisioningData],
+        project_ssh_public_key: str,
+        project_ssh_private_key: str,
+    ) -> List[Optional[Exception]]:
+        # VM instances are listed with one request per zone.
+        # TPUs cannot be listed by name, so they are updated one by one in parallel.
+        errors: List[Optional[Exception]] = [None] * len(provisioning_data_list)
+        indices_by_zone: Dict[str, List[int]] = defaultdict(list)
+        tpu_futures: Dict[int, concurrent.futures.Future] = {}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for i, provisioning_data in enumerate(provisioning_data_list):
+                backend_data_dict = {}
+                if provisioning_data.backend_data is not None:
+                    backend_data_dict = json.loads(provisioning_data.backend_data)
+                if backend_data_dict.get("is_tpu", False):
+                    tpu_futures[i] = executor.submit(
+                        self.update_provisioning_data,
+                        provisioning_data,
+                        project_ssh_public_key,
+                        project_ssh_private_key,
+                    )
+                    continue
+                zone = backend_data_dict.get("zone", provisioning_data.region)
+                indices_by_zone[zone].append(i)
+            self._update_instances_provisioning_data(
+                provisioning_data_list, indices_by_zone, errors
+            )
+            for i, future in tpu_futures.items():
+                errors[i] = future.exception()
+        return errors
+
+    def _update_instances_provisioning_data(
+        self,
+        provisioning_data_list: List[JobProvisioningData],
+        indices_by_zone: Dict[str, List[int]],
+        errors: List[Optional[Exception]],
+    ) -> None:
+        for zone, indices in indices_by_zone.items():
+            for chunk_start in range(0, len(indices), INSTANCES_LIST_FILTER_MAX_NAMES):
+                chunk = indices[chunk_start : chunk_start + INSTANCES_LIST_FILTER_MAX_NAMES]
+                names = [provisioning_data_list[i].instance_id for i in chunk]
+                try:
+                    instances = {
+                        instance.name: instance
+                        for instance in self.instances_client.list(
+                            request=compute_v1.ListInstancesRequest(
+                                project=self.config.project_id,
+                                zone=zone,
+                                filter=" OR ".join(f'(name = "{name}")' for name in names),
+                            )
+                        )
+                    }
+                except Exception as e:
+                    for i in chunk:
+                        errors[i] = e
+                    continue
+                for i in chunk:
+                    provisioning_data = provisioning_data_list[i]
+                    instance = instances.get(provisioning_data.instance_id)
+                    try:
+                        if instance is None:
+                            raise ProvisioningError(
+                                "Failed to get instance IP address. Instance not found."
+                            )
+                        self._update_provisioning_data_from_instance(provisioning_data, instance)
+                    except Exception as e:
+                        errors[i] = e
+
+    def _update_provisioning_data_from_instance(
+        self, provisioning_data: JobProvisioningData, instance: compute_v1.Instance
+    ) -> None:
         if instance.status in ["PROVISIONING", "STAGING"]:
             return
         if instance.status == "RUNNING":
-            if allocate_public_ip:
+            if self.config.allocate_public_ips:
                 hostname = instance.network_interfaces[0].access_configs[0].nat_i_p
             else:
                 hostname = instance.network_interfaces[0].network_i_p
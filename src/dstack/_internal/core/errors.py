@@ -18,6 +18,10 @@ class ClientError(DstackError):
     pass
 
 
+class ServerValidationError(ClientError):
+    pass
+
+
 class ServerClientErrorCode(str, enum.Enum):
     UNSPECIFIED_ERROR = "error"
     RESOURCE_EXISTS = "resource_exists"
@@ -11,7 +11,7 @@ from dstack._internal.core.errors import SSHError
 from dstack._internal.core.models.instances import SSHConnectionParams
 from dstack._internal.core.services.ssh import get_ssh_error
 from dstack._internal.core.services.ssh.client import get_ssh_client_info
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import storage_io_executor
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.path import FilePath, FilePathOrContent, PathLike
 from dstack._internal.utils.ssh import normalize_path
@@ -163,6 +163,17 @@ class SSHTunnel:
     def exec_command(self) -> List[str]:
         return [self.ssh_exec_path, "-S", self.control_sock_path, self.destination]
 
+    def forward_command(self, forwarded_sockets: Iterable[SocketPair]) -> List[str]:
+        """
+        Returns a command that adds local forwardings to an already running master connection.
+        Requires multiplexing support, see `SSHClientInfo.supports_multiplexing`.
+        """
+        command = [self.ssh_exec_path, "-S", self.control_sock_path, "-O", "forward"]
+        for socket_pair in forwarded_sockets:
+            command += ["-L", f"{socket_pair.local.render()}:{socket_pair.remote.render()}"]
+        command += [self.destination]
+        return command
+
     def open(self) -> None:
         # We cannot use `stderr=subprocess.PIPE` here since the forked process (daemon) does not
         # close standard streams if ProxyJump is used, therefore we will wait EOF from the pipe
@@ -186,7 +197,7 @@ class SSHTunnel:
         raise get_ssh_error(stderr)
 
     async def aopen(self) -> None:
-        await run_async(self._remove_log_file)
+        await storage_io_executor.run(self._remove_log_file)
         proc = await asyncio.create_subprocess_exec(
             *self.open_command(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
@@ -199,13 +210,42 @@ class SSHTunnel:
             raise SSHError(msg) from e
         if proc.returncode == 0:
             return
-        stderr = await run_async(self._read_log_file)
+        stderr = await storage_io_executor.run(self._read_log_file)
         logger.debug("SSH tunnel failed: %s", stderr)
         raise get_ssh_error(stderr)
 
     def close(self) -> None:
         subprocess.run(self.close_command(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
+    def check(self) -> bool:
+        try:
+            r = subprocess.run(
+                self.check_command(),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=SSH_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return r.returncode == 0
+
+    def forward(self, forwarded_sockets: Iterable[SocketPair]) -> None:
+        try:
+            r = subprocess.run(
+                self.forward_command(forwarded_sockets),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=SSH_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired as e:
+            msg = f"SSH forwarding to {self.destination} was not set up in {SSH_TIMEOUT} seconds"
+            logger.debug(msg)
+            raise SSHError(msg) from e
+        if r.returncode == 0:
+            return
+        logger.debug("SSH forwarding failed: %s", r.stderr)
+        raise get_ssh_error(r.stderr)
+
     async def aclose(self) -> None:
         proc = await asyncio.create_subprocess_exec(
             *self.close_command(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
@@ -28,7 +28,7 @@ from dstack._internal.proxy.gateway.services.registry import ACCESS_LOG_PATH, ap
 from dstack._internal.proxy.gateway.services.server_client import HTTPMultiClient
 from dstack._internal.proxy.gateway.services.stats import StatsCollector
 from dstack._internal.proxy.lib.routers.model_proxy import router as model_proxy_router
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import storage_io_executor
 from dstack.version import __version__
 
 STATE_FILE = DSTACK_DIR_ON_GATEWAY / "state-v2.json"
@@ -42,7 +42,7 @@ async def lifespan(app: FastAPI):
     repo = await get_gateway_proxy_repo(await injector.get_repo().__anext__())
     nginx = injector.get_nginx()
     service_conn_pool = await injector.get_service_connection_pool()
-    await run_async(nginx.write_global_conf)
+    await storage_io_executor.run(nginx.write_global_conf)
     await apply_all(repo, nginx, service_conn_pool)
 
     yield
@@ -64,7 +64,7 @@ def make_app(repo: Optional[GatewayProxyRepo] = None, nginx: Optional[Nginx] = N
             server_client=HTTPMultiClient(SERVER_CONNECTIONS_DIR_ON_GATEWAY)
         ),
         nginx=nginx or Nginx(),
-        stats_collector=StatsCollector(ACCESS_LOG_PATH),
+        stats_collector=StatsCollector(ACCESS_LOG_PATH, request_time_percentiles=True),
     )
 
     # TODO: add CORS only to openai routers once fastapi supports it.
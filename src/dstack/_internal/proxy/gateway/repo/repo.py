@@ -1,15 +1,22 @@
+import json
 from contextlib import asynccontextmanager
 from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from aiorwlock import RWLock
 from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
 
 from dstack._internal.proxy.gateway.models import GlobalProxyConfig, ModelEntrypoint
 from dstack._internal.proxy.lib.models import ChatModel, Project, Service
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import storage_io_executor
+from dstack._internal.utils.logging import get_logger
+
+# The journal is compacted into a full snapshot once it has this many entries
+JOURNAL_MAX_ENTRIES = 1000
+logger = get_logger(__name__)
 
 
 class State(BaseModel):
@@ -23,12 +30,16 @@ class State(BaseModel):
 class GatewayProxyRepo(BaseProxyRepo):
     """
     Repo implementation used on gateways. Stores state in memory and maintains a copy on disk.
+    The copy on disk is a snapshot of the state and a journal of changes made after it,
+    so that each change only appends to the journal.
     """
 
     def __init__(self, state: Optional[State] = None, file: Optional[Path] = None) -> None:
         self._state = state or State()
         self._file = file
         self._lock = RWLock()
+        # Entries in the journal file
+        self._journal_size = 0
 
     async def list_services(self) -> list[Service]:
         async with self.reader():
@@ -42,13 +53,15 @@ class GatewayProxyRepo(BaseProxyRepo):
             return self._state.services.get(project_name, {}).get(run_name)
 
     async def set_service(self, service: Service) -> None:
-        async with self.writer():
+        async with self.writer() as journal:
             self._state.services.setdefault(service.project_name, {})[service.run_name] = service
+            journal.set(["services", service.project_name, service.run_name], service)
 
     async def delete_service(self, project_name: str, run_name: str) -> None:
-        async with self.writer():
+        async with self.writer() as journal:
             project_services = self._state.services.get(project_name, {})
-            project_services.pop(run_name, None)
+            if project_services.pop(run_name, None) is not None:
+                journal.delete(["services", project_name, run_name])
             if not project_services:
                 self._state.services.pop(project_name, None)
 
@@ -61,15 +74,17 @@ class GatewayProxyRepo(BaseProxyRepo):
             return self._state.models.get(project_name, {}).get(name)
 
     async def set_model(self, model: ChatModel) -> None:
-        async with self.writer():
+        async with self.writer() as journal:
             self._state.models.setdefault(model.project_name, {})[model.name] = model
+            journal.set(["models", model.project_name, model.name], model)
 
     async def delete_models_by_run(self, project_name: str, run_name: str) -> None:
-        async with self.writer():
+        async with self.writer() as journal:
             project_models = self._state.models.get(project_name, {})
             models_to_delete = [m for m in project_models.values() if m.run_name == run_name]
             for model in models_to_delete:
                 project_models.pop(model.name, None)
+                journal.delete(["models", project_name, model.name])
             if not project_models:
                 self._state.models.pop(project_name, None)
 
@@ -78,24 +93,27 @@ class GatewayProxyRepo(BaseProxyRepo):
             return list(self._state.entrypoints.values())
 
     async def set_entrypoint(self, entrypoint: ModelEntrypoint) -> None:
-        async with self.writer():
+        async with self.writer() as journal:
             self._state.entrypoints[entrypoint.project_name] = entrypoint
+            journal.set(["entrypoints", entrypoint.project_name], entrypoint)
 
     async def get_project(self, name: str) -> Optional[Project]:
         async with self.reader():
             return self._state.projects.get(name)
 
     async def set_project(self, project: Project) -> None:
-        async with self.writer():
+        async with self.writer() as journal:
             self._state.projects[project.name] = project
+            journal.set(["projects", project.name], project)
 
     async def get_config(self) -> GlobalProxyConfig:
         async with self.reader():
             return self._state.config
 
     async def set_config(self, config: GlobalProxyConfig) -> None:
-        async with self.writer():
+        async with self.writer() as journal:
             self._state.config = config
+            journal.set(["config"], config)
 
     @asynccontextmanager
     async def reader(self):
@@ -103,19 +121,105 @@ class GatewayProxyRepo(BaseProxyRepo):
             yield
 
     @asynccontextmanager
-    async def writer(self):
+    async def writer(self) -> AsyncIterator["_JournalEntries"]:
         async with self._lock.writer:
-            yield
-            await run_async(self.save)
+            journal = _JournalEntries()
+            yield journal
+            if journal.entries:
+                await storage_io_executor.run(self._persist, journal.entries)
 
     @staticmethod
     def load(state_file: Path) -> "GatewayProxyRepo":
-        if state_file.exists():
-            state = State.parse_file(state_file)
-        else:
-            state = None
-        return GatewayProxyRepo(state=state, file=state_file)
+        """Loads the state from the snapshot file and replays the journal on top of it"""
+
+        raw_state = json.loads(state_file.read_text()) if state_file.exists() else {}
+        journal_file = _get_journal_file(state_file)
+        entries, is_damaged = [], False
+        if journal_file.exists():
+            entries, is_damaged = _read_journal(journal_file)
+        for entry in entries:
+            _apply_journal_entry(raw_state, entry)
+        repo = GatewayProxyRepo(state=State.parse_obj(raw_state), file=state_file)
+        repo._journal_size = len(entries)
+        if is_damaged:
+            # Appending to a damaged journal would glue new entries to the broken line
+            repo.save()
+        return repo
 
     def save(self) -> None:
-        if self._file is not None:
-            self._file.write_text(self._state.json())
+        """Writes a full snapshot of the state and clears the journal"""
+
+        if self._file is None:
+            return
+        tmp_file = self._file.with_name(self._file.name + ".tmp")
+        tmp_file.write_text(self._state.json())
+        tmp_file.replace(self._file)
+        # Replaying a journal over a snapshot that already includes it is harmless,
+        # so crashing before the journal is removed does not corrupt the state
+        _get_journal_file(self._file).unlink(missing_ok=True)
+        self._journal_size = 0
+
+    def _persist(self, entries: list[dict]) -> None:
+        if self._file is None:
+            return
+        if self._journal_size + len(entries) > JOURNAL_MAX_ENTRIES:
+            self.save()
+            return
+        with _get_journal_file(self._file).open("a") as f:
+            f.write("".join(json.dumps(e, default=pydantic_encoder) + "\n" for e in entries))
+        self._journal_size += len(entries)
+
+
+class _JournalEntries:
+    """
+    Changes made within one `GatewayProxyRepo.writer()` context. Each entry sets or deletes
+    (value `None`) the value at a path in the JSON representation of `State`.
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[dict] = []
+
+    def set(self, path: list[str], value: BaseModel) -> None:
+        self.entries.append({"path": path, "value": value})
+
+    def delete(self, path: list[str]) -> None:
+        self.entries.append({"path": path, "value": None})
+
+
+def _get_journal_file(state_file: Path) -> Path:
+    return state_file.with_name(state_file.name + ".journal")
+
+
+def _read_journal(journal_file: Path) -> tuple[list[dict], bool]:
+    """
+    Returns journal entries and whether the journal is damaged, e.g. has an incomplete
+    last line because the gateway stopped while writing it. Damaged lines are skipped.
+    """
+    content = journal_file.read_text()
+    is_damaged = content != "" and not content.endswith("\n")
+    entries = []
+    for line in content.splitlines():
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            logger.warning("Skipping damaged entry in %s", journal_file)
+            is_damaged = True
+    return entries, is_damaged
+
+
+def _apply_journal_entry(raw_state: dict, entry: dict) -> None:
+    *parent_path, key = entry["path"]
+    parents = [raw_state]
+    for name in parent_path:
+        parents.append(parents[-1].setdefault(name, {}))
+    if entry["value"] is not None:
+        parents[-1][key] = entry["value"]
+        return
+    parents[-1].pop(key, None)
+    # Drop emptied containers, same as the repo does in memory
+    for parent, name in zip(reversed(parents[:-1]), reversed(parent_path)):
+        if parent[name]:
+            break
+        parent.pop(name)
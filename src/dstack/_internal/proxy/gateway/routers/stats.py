@@ -2,17 +2,32 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
-from dstack._internal.proxy.gateway.deps import get_gateway_proxy_repo, get_stats_collector
+from dstack._internal.proxy.gateway.deps import (
+    get_gateway_proxy_repo,
+    get_nginx,
+    get_stats_collector,
+)
 from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
-from dstack._internal.proxy.gateway.schemas.stats import ServiceStats
+from dstack._internal.proxy.gateway.schemas.stats import CertificateFailure, ServiceStats
+from dstack._internal.proxy.gateway.services.nginx import Nginx
 from dstack._internal.proxy.gateway.services.stats import StatsCollector, get_service_stats
 
 router = APIRouter()
 
 
-@router.get("/collect")
+@router.get("/collect", response_model_exclude_none=True)
 async def collect_stats(
     repo: Annotated[GatewayProxyRepo, Depends(get_gateway_proxy_repo)],
     collector: Annotated[StatsCollector, Depends(get_stats_collector)],
 ) -> list[ServiceStats]:
     return await get_service_stats(repo, collector)
+
+
+@router.get("/certificate-failures")
+async def get_certificate_failures(
+    nginx: Annotated[Nginx, Depends(get_nginx)],
+) -> list[CertificateFailure]:
+    return [
+        CertificateFailure(domain=f.domain, error=f.error, retry_in=f.retry_in)
+        for f in nginx.get_certificate_failures()
+    ]
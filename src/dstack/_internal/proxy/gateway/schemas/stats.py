@@ -1,9 +1,16 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class Stat(BaseModel):
     requests: int
+    # Average request time in seconds
     request_time: float
+    # Request time percentiles in seconds, if collected and there were requests
+    request_time_p50: Optional[float] = None
+    request_time_p95: Optional[float] = None
+    request_time_p99: Optional[float] = None
 
 
 PerWindowStats = dict[int, Stat]  # keys - length of time window in seconds
@@ -13,3 +20,10 @@ class ServiceStats(BaseModel):
     project_name: str
     run_name: str
     stats: PerWindowStats
+
+
+class CertificateFailure(BaseModel):
+    domain: str
+    error: str
+    # Seconds until the next attempt to obtain the certificate
+    retry_in: float
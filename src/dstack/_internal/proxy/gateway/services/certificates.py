@@ -0,0 +1,176 @@
+"""
+Obtaining TLS certificates in the background, so that a slow ACME challenge for one domain
+does not delay registrations of other domains.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from dstack._internal.proxy.gateway.models import ACMESettings
+from dstack._internal.proxy.lib.errors import ProxyError
+from dstack._internal.utils.executors import cloud_api_executor
+from dstack._internal.utils.logging import get_logger
+
+# certbot refuses to run if another certbot instance holds its lock,
+# so issuances are queued rather than run in parallel
+MAX_CONCURRENT_ISSUANCES = 1
+# A failed issuance is retried after this many seconds,
+# to stay within ACME rate limits for failed validations
+RETRY_INTERVAL = 300
+logger = get_logger(__name__)
+
+
+@dataclass
+class CertificateFailure:
+    domain: str
+    error: str
+    # Seconds until the next attempt
+    retry_in: float
+
+
+@dataclass
+class _Failure:
+    error: str
+    failed_at: float
+    retry: asyncio.TimerHandle
+
+
+class CertificateManager:
+    """
+    Runs certificate issuances in the background, at most `MAX_CONCURRENT_ISSUANCES`
+    at a time. Concurrent requests for the same domain share one issuance.
+    Failed issuances are retried every `RETRY_INTERVAL` until cancelled.
+    """
+
+    def __init__(
+        self,
+        issue: Callable[[str, ACMESettings], None],
+        max_concurrent_issuances: int = MAX_CONCURRENT_ISSUANCES,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._issue = issue
+        self._semaphore = asyncio.Semaphore(max_concurrent_issuances)
+        self._timer = timer
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._failures: dict[str, _Failure] = {}
+        # Domains with issuances in progress that should not be retried if they fail
+        self._cancelled: set[str] = set()
+
+    def request(
+        self,
+        domain: str,
+        acme: ACMESettings,
+        on_issued: Callable[[str], Awaitable[None]],
+    ) -> Optional[asyncio.Task[None]]:
+        """
+        Starts obtaining a certificate for `domain` unless it is already in progress
+        or has failed recently, in which case it will be retried later.
+        Calls `on_issued` once the certificate is obtained. If `on_issued` fails,
+        it is retried the same way as a failed issuance.
+        """
+
+        task = self._tasks.get(domain)
+        if task is not None:
+            self._cancelled.discard(domain)
+            return task
+        if domain in self._failures:
+            logger.debug("Not retrying TLS certificate for %s yet", domain)
+            return None
+        return self._start(domain, acme, on_issued)
+
+    def cancel(self, domain: str) -> None:
+        """Stops retrying a failed issuance, e.g. if the certificate is no longer needed"""
+        if domain in self._tasks:
+            self._cancelled.add(domain)
+        failure = self._failures.pop(domain, None)
+        if failure is not None:
+            failure.retry.cancel()
+
+    def is_in_progress(self, domain: str) -> bool:
+        return domain in self._tasks
+
+    def get_failures(self) -> list[CertificateFailure]:
+        now = self._timer()
+        return [
+            CertificateFailure(
+                domain=domain,
+                error=failure.error,
+                retry_in=max(0, failure.failed_at + RETRY_INTERVAL - now),
+            )
+            for domain, failure in self._failures.items()
+        ]
+
+    async def wait(self) -> None:
+        """
+        Waits for all issuances in progress, including the ones started while waiting.
+        Does not wait for scheduled retries.
+        """
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _start(
+        self,
+        domain: str,
+        acme: ACMESettings,
+        on_issued: Callable[[str], Awaitable[None]],
+    ) -> asyncio.Task[None]:
+        self._failures.pop(domain, None)
+        task = asyncio.create_task(self._run(domain, acme, on_issued))
+        self._tasks[domain] = task
+        task.add_done_callback(lambda _: self._forget_task(domain, task))
+        return task
+
+    def _forget_task(self, domain: str, task: asyncio.Task[None]) -> None:
+        if self._tasks.get(domain) is task:
+            del self._tasks[domain]
+            self._cancelled.discard(domain)
+
+    async def _run(
+        self,
+        domain: str,
+        acme: ACMESettings,
+        on_issued: Callable[[str], Awaitable[None]],
+    ) -> None:
+        async with self._semaphore:
+            try:
+                await cloud_api_executor.run(self._issue, domain, acme)
+            except ProxyError as e:
+                logger.error(
+                    "Serving %s over HTTP only, retrying in %ss. %s",
+                    domain,
+                    RETRY_INTERVAL,
+                    e.detail,
+                )
+                self._on_failed(domain, e.detail, acme, on_issued)
+                return
+            except Exception as e:
+                logger.exception(
+                    "Unexpected error obtaining TLS certificate for %s, retrying in %ss",
+                    domain,
+                    RETRY_INTERVAL,
+                )
+                self._on_failed(domain, f"Unexpected error: {e}", acme, on_issued)
+                return
+        try:
+            await on_issued(domain)
+        except Exception as e:
+            logger.error(
+                "Failed to enable HTTPS for %s, retrying in %ss: %s", domain, RETRY_INTERVAL, e
+            )
+            self._on_failed(domain, f"Failed to enable HTTPS: {e}", acme, on_issued)
+
+    def _on_failed(
+        self,
+        domain: str,
+        error: str,
+        acme: ACMESettings,
+        on_issued: Callable[[str], Awaitable[None]],
+    ) -> None:
+        if domain in self._cancelled:
+            return
+        retry = asyncio.get_running_loop().call_later(
+            RETRY_INTERVAL, self._start, domain, acme, on_issued
+        )
+        self._failures[domain] = _Failure(error=error, failed_at=self._timer(), retry=retry)
@@ -1,8 +1,11 @@
+import asyncio
 import importlib.resources
 import subprocess
 import tempfile
 from asyncio import Lock
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 import jinja2
 from pydantic import BaseModel
@@ -10,13 +13,22 @@ from typing_extensions import Literal
 
 from dstack._internal.proxy.gateway.const import PROXY_PORT_ON_GATEWAY
 from dstack._internal.proxy.gateway.models import ACMESettings
+from dstack._internal.proxy.gateway.services.certificates import (
+    CertificateFailure,
+    CertificateManager,
+)
 from dstack._internal.proxy.lib.errors import ProxyError, UnexpectedProxyError
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import storage_io_executor
 from dstack._internal.utils.logging import get_logger
 
+# Config changes made within this time are applied with one nginx reload
+RELOAD_DEBOUNCE_TIME = 0.1
 CERTBOT_TIMEOUT = 40
 CERTBOT_2ND_TIMEOUT = 5
 CONFIGS_DIR = Path("/etc/nginx/sites-enabled")
+# certbot puts ACME HTTP-01 challenge files here and nginx serves them, so that certbot
+# does not need to change nginx config and reload nginx concurrently with us
+ACME_WEBROOT = Path("/var/www/html")
 logger = get_logger(__name__)
 
 
@@ -30,6 +42,7 @@ class SiteConfig(BaseModel):
         return jinja2.Template(template).render(
             **self.dict(),
             proxy_port=PROXY_PORT_ON_GATEWAY,
+            acme_webroot=ACME_WEBROOT,
         )
 
 
@@ -53,21 +66,68 @@ class ModelEntrypointConfig(SiteConfig):
     project_name: str
 
 
+class _ReloadBatch:
+    """Config changes to be applied with one nginx reload"""
+
+    def __init__(self) -> None:
+        # (config path, previous config or None) for rolling back changes if reload fails
+        self.changes: list[tuple[Path, Optional[str]]] = []
+        self.done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+
 class Nginx:
-    """Updates nginx config and issues SSL certificates."""
+    """
+    Updates nginx config and issues SSL certificates.
+    Config changes made within `RELOAD_DEBOUNCE_TIME` are applied with one nginx reload.
+    """
 
     def __init__(self, conf_dir: Path = Path("/etc/nginx/sites-enabled")) -> None:
         self._conf_dir = conf_dir
+        # Guards config files and reloads
         self._lock: Lock = Lock()
+        self._reload_batch: Optional[_ReloadBatch] = None
+        self._reload_tasks: set[asyncio.Task] = set()
+        self._certificates = CertificateManager(issue=self._issue_certificate)
+        # Domains known to have a TLS certificate
+        self._certified_domains: set[str] = set()
+        # HTTPS sites served over HTTP until their certificates are obtained
+        self._awaiting_certificate: dict[str, SiteConfig] = {}
 
     async def register(self, conf: SiteConfig, acme: ACMESettings) -> None:
-        logger.debug("Registering %s domain %s", conf.type, conf.domain)
-        conf_name = self.get_config_name(conf.domain)
+        """
+        Writes the site config and reloads nginx. If the site needs a TLS certificate
+        that does not exist yet, the site is served over HTTP while the certificate
+        is being obtained in the background, then switched to HTTPS.
+        """
 
+        logger.debug("Registering %s domain %s", conf.type, conf.domain)
+        conf_path = self._conf_dir / self.get_config_name(conf.domain)
+        if (
+            conf.https
+            and conf.domain not in self._certified_domains
+            and await storage_io_executor.run(self.certificate_exists, conf.domain)
+        ):
+            self._certified_domains.add(conf.domain)
+
+        needs_certificate = False
         async with self._lock:
-            if conf.https:
-                await run_async(self.run_certbot, conf.domain, acme)
-            await run_async(self.write_conf, conf.render(), conf_name)
+            if conf.https and conf.domain not in self._certified_domains:
+                self._awaiting_certificate[conf.domain] = conf
+                needs_certificate = True
+                conf = conf.copy(update={"https": False})
+            else:
+                self._awaiting_certificate.pop(conf.domain, None)
+                self._certificates.cancel(conf.domain)
+            batch = await self._write_conf(conf_path, conf.render())
+        if batch is not None:
+            await batch.done
+        if needs_certificate:
+            # Only after the site is served over HTTP, since the ACME challenge is served by it
+            self._certificates.request(conf.domain, acme, self._on_certificate_issued)
+            if self._certificates.is_in_progress(conf.domain):
+                logger.info(
+                    "Serving %s over HTTP until its TLS certificate is obtained", conf.domain
+                )
 
         logger.info("Registered %s domain %s", conf.type, conf.domain)
 
@@ -77,12 +137,97 @@ class Nginx:
         if not conf_path.exists():
             return
         async with self._lock:
-            await run_async(sudo_rm, conf_path)
-            await run_async(self.reload)
+            self._awaiting_certificate.pop(domain, None)
+            self._certificates.cancel(domain)
+            old_conf = await storage_io_executor.run(conf_path.read_text)
+            await storage_io_executor.run(sudo_rm, conf_path)
+            batch = self._add_to_reload_batch(conf_path, old_conf)
+        await batch.done
         logger.info("Unregistered domain %s", domain)
 
+    async def wait_for_certificates(self) -> None:
+        """Waits until all TLS certificates being obtained are obtained and applied"""
+        await self._certificates.wait()
+
+    def get_certificate_failures(self) -> list[CertificateFailure]:
+        """Domains served over HTTP because their TLS certificates could not be obtained"""
+        return self._certificates.get_failures()
+
+    def _issue_certificate(self, domain: str, acme: ACMESettings) -> None:
+        self.run_certbot(domain, acme)
+
+    async def _on_certificate_issued(self, domain: str) -> None:
+        conf_path = self._conf_dir / self.get_config_name(domain)
+        async with self._lock:
+            self._certified_domains.add(domain)
+            conf = self._awaiting_certificate.pop(domain, None)
+            if conf is None:
+                # The site was unregistered or no longer needs HTTPS
+                return
+            batch = await self._write_conf(conf_path, conf.render())
+        if batch is not None:
+            try:
+                await batch.done
+            except Exception:
+                # The config was rolled back, keep serving over HTTP until retried
+                async with self._lock:
+                    self._awaiting_certificate.setdefault(domain, conf)
+                raise
+        logger.info("Obtained TLS certificate for %s, serving it over HTTPS now", domain)
+
+    async def _write_conf(self, conf_path: Path, conf: str) -> Optional[_ReloadBatch]:
+        """
+        Must be called with `self._lock` acquired. Returns `None` if the config is unchanged
+        and already applied.
+        """
+        old_conf = await storage_io_executor.run(sudo_write_if_changed, conf_path, conf)
+        if old_conf is None:
+            batch = self._reload_batch
+            if batch is not None and any(path == conf_path for path, _ in batch.changes):
+                # Written by another caller, but not applied yet
+                return batch
+            return None
+        return self._add_to_reload_batch(conf_path, old_conf.previous)
+
+    def _add_to_reload_batch(self, conf_path: Path, old_conf: Optional[str]) -> _ReloadBatch:
+        """Must be called with `self._lock` acquired, right after changing `conf_path`"""
+        if self._reload_batch is None:
+            self._reload_batch = _ReloadBatch()
+            task = asyncio.create_task(self._run_reload_batch(self._reload_batch))
+            self._reload_tasks.add(task)
+            task.add_done_callback(self._reload_tasks.discard)
+        self._reload_batch.changes.append((conf_path, old_conf))
+        return self._reload_batch
+
+    async def _run_reload_batch(self, batch: _ReloadBatch) -> None:
+        await asyncio.sleep(RELOAD_DEBOUNCE_TIME)
+        async with self._lock:
+            # No more changes can join the batch after this point
+            self._reload_batch = None
+            logger.debug("Reloading nginx to apply %s config changes", len(batch.changes))
+            try:
+                await storage_io_executor.run(self._reload_or_rollback, batch.changes)
+            except Exception as e:
+                batch.done.set_exception(e)
+            else:
+                batch.done.set_result(None)
+
+    def _reload_or_rollback(self, changes: list[tuple[Path, Optional[str]]]) -> None:
+        try:
+            self.reload()
+        except UnexpectedProxyError:
+            for conf_path, old_conf in reversed(changes):
+                if old_conf is not None:
+                    sudo_write(conf_path, old_conf)
+                else:
+                    sudo_rm(conf_path)
+            raise
+
     @staticmethod
     def reload() -> None:
+        r = subprocess.run(["sudo", "nginx", "-t"], capture_output=True, timeout=10)
+        if r.returncode != 0:
+            raise UnexpectedProxyError(f"Invalid nginx config:\n{r.stderr.decode()}")
         cmd = ["sudo", "systemctl", "reload", "nginx.service"]
         r = subprocess.run(cmd, timeout=10)
         if r.returncode != 0:
@@ -91,19 +236,10 @@ class Nginx:
     def write_conf(self, conf: str, conf_name: str) -> None:
         """Update config and reload nginx. Rollback changes on error."""
         conf_path = self._conf_dir / conf_name
-        old_conf = conf_path.read_text() if conf_path.exists() else None
-        if conf == old_conf:
+        old_conf = sudo_write_if_changed(conf_path, conf)
+        if old_conf is None:
             return
-        sudo_write(conf_path, conf)
-        try:
-            self.reload()
-        except UnexpectedProxyError:
-            # rollback changes
-            if old_conf is not None:
-                sudo_write(conf_path, old_conf)
-            else:
-                sudo_rm(conf_path)
-            raise
+        self._reload_or_rollback([(conf_path, old_conf.previous)])
 
     @classmethod
     def run_certbot(cls, domain: str, acme: ACMESettings) -> None:
@@ -115,7 +251,7 @@ class Nginx:
         cmd = ["sudo", "timeout", "--kill-after", str(CERTBOT_2ND_TIMEOUT), str(CERTBOT_TIMEOUT)]
         cmd += ["certbot", "certonly"]
         cmd += ["--non-interactive", "--agree-tos", "--register-unsafely-without-email"]
-        cmd += ["--keep", "--nginx", "--domain", domain]
+        cmd += ["--keep", "--webroot", "--webroot-path", str(ACME_WEBROOT), "--domain", domain]
 
         if acme.server:
             cmd += ["--server", str(acme.server)]
@@ -169,6 +305,23 @@ def sudo_write(path: Path, content: str) -> None:
             raise UnexpectedProxyError("Failed to copy file as sudo")
 
 
+@dataclass
+class _PreviousContent:
+    previous: Optional[str]
+
+
+def sudo_write_if_changed(path: Path, content: str) -> Optional[_PreviousContent]:
+    """
+    Writes the file if its content differs from `content`.
+    Returns the previous content if the file was written, otherwise `None`.
+    """
+    old_content = path.read_text() if path.exists() else None
+    if content == old_content:
+        return None
+    sudo_write(path, content)
+    return _PreviousContent(previous=old_content)
+
+
 def sudo_rm(path: Path) -> None:
     r = subprocess.run(sudo() + ["rm", path], timeout=3)
     if r.returncode != 0:
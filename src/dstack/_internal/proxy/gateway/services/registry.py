@@ -1,5 +1,7 @@
 import asyncio
 from asyncio import Lock
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, Optional
@@ -25,7 +27,24 @@ from dstack._internal.utils.logging import get_logger
 
 ACCESS_LOG_PATH = Path("/var/log/nginx/dstack.access.log")
 logger = get_logger(__name__)
-lock = Lock()
+# Changes to one service are serialized, changes to different services run concurrently
+# and are applied with as few nginx reloads as possible, see `Nginx`
+service_locks: defaultdict[tuple[str, str], Lock] = defaultdict(Lock)
+
+
+@dataclass
+class _ReplicaChange:
+    replica_id: str
+    # `None` if the replica is being unregistered
+    replica: Optional[models.Replica]
+    done: asyncio.Future[None] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+# Replica changes waiting for their service lock. Whoever acquires the lock first
+# applies all waiting changes to the service at once, e.g. when a service scales up
+_pending_replica_changes: defaultdict[tuple[str, str], list[_ReplicaChange]] = defaultdict(list)
 
 
 async def register_service(
@@ -51,7 +70,7 @@ async def register_service(
         replicas=(),
     )
 
-    async with lock:
+    async with service_locks[(project_name, run_name)]:
         if await repo.get_service(project_name, run_name) is not None:
             raise ProxyError(f"Service {service.fmt()} is already registered")
 
@@ -95,7 +114,7 @@ async def unregister_service(
     nginx: Nginx,
     service_conn_pool: ServiceConnectionPool,
 ) -> None:
-    async with lock:
+    async with service_locks[(project_name, run_name)]:
         service = await repo.get_service(project_name, run_name)
         if service is None:
             raise ProxyError(
@@ -139,34 +158,14 @@ async def register_replica(
         ssh_head_proxy_private_key=ssh_head_proxy_private_key,
     )
 
-    async with lock:
-        old_service = await repo.get_service(project_name, run_name)
-        if old_service is None:
-            raise ProxyError(
-                f"Service {project_name}/{run_name} does not exist, cannot register replica"
-            )
-
-        if old_service.find_replica(replica_id) is not None:
-            raise ProxyError(f"Replica {replica_id} already exists in service {old_service.fmt()}")
-
-        service = old_service.with_replicas(old_service.replicas + (replica,))
-
-        logger.debug("Registering replica %s in service %s", replica.id, service.fmt())
-        failures = await apply_service(
-            service=service,
-            old_service=old_service,
-            repo=repo,
-            nginx=nginx,
-            service_conn_pool=service_conn_pool,
-        )
-        if replica in failures:
-            raise ProxyError(
-                f"Cannot register replica {replica.id}"
-                f" in service {service.fmt()}: {failures[replica]}"
-            )
-        await repo.set_service(service)
-
-    logger.info("Replica %s in service %s is registered now", replica.id, service.fmt())
+    await _apply_replica_change(
+        project_name=project_name,
+        run_name=run_name,
+        change=_ReplicaChange(replica_id=replica_id, replica=replica),
+        repo=repo,
+        nginx=nginx,
+        service_conn_pool=service_conn_pool,
+    )
 
 
 async def unregister_replica(
@@ -177,34 +176,153 @@ async def unregister_replica(
     nginx: Nginx,
     service_conn_pool: ServiceConnectionPool,
 ) -> None:
-    async with lock:
-        old_service = await repo.get_service(project_name, run_name)
-        if old_service is None:
-            raise ProxyError(
-                f"Service {project_name}/{run_name} does not exist, cannot unregister replica"
-            )
-
-        replica = old_service.find_replica(replica_id)
-        if replica is None:
-            raise ProxyError(
-                f"Replica {replica_id} does not exist in service {old_service.fmt()},"
-                " cannot unregister"
-            )
+    await _apply_replica_change(
+        project_name=project_name,
+        run_name=run_name,
+        change=_ReplicaChange(replica_id=replica_id, replica=None),
+        repo=repo,
+        nginx=nginx,
+        service_conn_pool=service_conn_pool,
+    )
 
-        service = old_service.with_replicas(tuple(r for r in old_service.replicas if r != replica))
 
-        logger.debug("Unregistering replica %s in service %s", replica.id, service.fmt())
+async def _apply_replica_change(
+    project_name: str,
+    run_name: str,
+    change: _ReplicaChange,
+    repo: GatewayProxyRepo,
+    nginx: Nginx,
+    service_conn_pool: ServiceConnectionPool,
+) -> None:
+    key = (project_name, run_name)
+    _pending_replica_changes[key].append(change)
+    try:
+        async with service_locks[key]:
+            if not change.done.done():
+                changes = _pending_replica_changes.pop(key, [])
+                try:
+                    await _apply_replica_changes(
+                        project_name=project_name,
+                        run_name=run_name,
+                        changes=changes,
+                        repo=repo,
+                        nginx=nginx,
+                        service_conn_pool=service_conn_pool,
+                    )
+                except Exception as e:
+                    # Every popped change must be resolved, otherwise its waiter hangs
+                    for c in changes:
+                        if not c.done.done():
+                            c.done.set_exception(e)
+                except BaseException:
+                    for c in changes:
+                        c.done.cancel()
+                    raise
+                if not change.done.done():
+                    change.done.set_exception(
+                        UnexpectedProxyError(f"Replica {change.replica_id} change was lost")
+                    )
+    except asyncio.CancelledError:
+        pending = _pending_replica_changes.get(key, [])
+        if change in pending:
+            pending.remove(change)
+        raise
+    await change.done
+
+
+async def _apply_replica_changes(
+    project_name: str,
+    run_name: str,
+    changes: list[_ReplicaChange],
+    repo: GatewayProxyRepo,
+    nginx: Nginx,
+    service_conn_pool: ServiceConnectionPool,
+) -> None:
+    """
+    Applies replica changes to the service with one nginx config update.
+    Must be called with the service lock acquired. Sets the result of each change,
+    except if an error is raised.
+    """
+
+    old_service = await repo.get_service(project_name, run_name)
+    if old_service is None:
+        for change in changes:
+            action = "register" if change.replica is not None else "unregister"
+            change.done.set_exception(
+                ProxyError(
+                    f"Service {project_name}/{run_name} does not exist, cannot {action} replica"
+                )
+            )
+        return
+
+    replicas = list(old_service.replicas)
+    accepted: list[_ReplicaChange] = []
+    for change in changes:
+        existing = next((r for r in replicas if r.id == change.replica_id), None)
+        if change.replica is not None:
+            if existing is not None:
+                change.done.set_exception(
+                    ProxyError(
+                        f"Replica {change.replica_id} already exists"
+                        f" in service {old_service.fmt()}"
+                    )
+                )
+                continue
+            logger.debug(
+                "Registering replica %s in service %s", change.replica_id, old_service.fmt()
+            )
+            replicas.append(change.replica)
+        else:
+            if existing is None:
+                change.done.set_exception(
+                    ProxyError(
+                        f"Replica {change.replica_id} does not exist"
+                        f" in service {old_service.fmt()}, cannot unregister"
+                    )
+                )
+                continue
+            logger.debug(
+                "Unregistering replica %s in service %s", change.replica_id, old_service.fmt()
+            )
+            replicas.remove(existing)
+        accepted.append(change)
+    if not accepted:
+        return
+
+    service = old_service.with_replicas(tuple(replicas))
+    failures = await apply_service(
+        service=service,
+        old_service=old_service,
+        repo=repo,
+        nginx=nginx,
+        service_conn_pool=service_conn_pool,
+    )
 
-        await apply_service(
-            service=service,
-            old_service=old_service,
-            repo=repo,
-            nginx=nginx,
-            service_conn_pool=service_conn_pool,
+    # Newly registered replicas that cannot be connected to are not saved,
+    # existing ones are kept and will be retried on the next service update
+    failed_new_replicas = {
+        change.replica: failures[change.replica]
+        for change in accepted
+        if change.replica is not None and change.replica in failures
+    }
+    if failed_new_replicas:
+        service = service.with_replicas(
+            tuple(r for r in service.replicas if r not in failed_new_replicas)
         )
-        await repo.set_service(service)
-
-    logger.info("Replica %s in service %s is unregistered now", replica_id, service.fmt())
+    await repo.set_service(service)
+
+    for change in accepted:
+        if change.replica in failed_new_replicas:
+            change.done.set_exception(
+                ProxyError(
+                    f"Cannot register replica {change.replica_id}"
+                    f" in service {service.fmt()}: {failed_new_replicas[change.replica]}"
+                )
+            )
+            continue
+        action = "registered" if change.replica is not None else "unregistered"
+        logger.info("Replica %s in service %s is %s now", change.replica_id, service.fmt(), action)
+        change.done.set_result(None)
 
 
 async def register_model_entrypoint(
@@ -1,17 +1,15 @@
 import asyncio
+import bisect
 import datetime
 import logging
 import os
 from collections import deque
-from collections.abc import Reversible
 from pathlib import Path
 from typing import Iterable, Optional, TextIO
 
-from pydantic import BaseModel
-
 from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
 from dstack._internal.proxy.gateway.schemas.stats import PerWindowStats, ServiceStats, Stat
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import storage_io_executor
 
 logger = logging.getLogger(__name__)
 IGNORE_STATUSES = {403, 404}
@@ -20,32 +18,125 @@ TTL = WINDOWS[-1]
 EMPTY_STATS = {window: Stat(requests=0, request_time=0.0) for window in WINDOWS}
 
 
-class StatFrame(BaseModel):
+# Upper bounds of request time histogram buckets used for percentiles, in seconds:
+# from 1ms to ~17min, each bucket 2^(1/4) (~19%) wider than the previous one
+REQUEST_TIME_BUCKETS = [0.001 * 2 ** (i / 4) for i in range(81)]
+PERCENTILES = (50, 95, 99)
+
+
+class _StatFrame:
     """Service metrics aggregated over a 1s frame"""
 
-    timestamp: int
-    requests: int
-    requests_time_total: float
+    __slots__ = ("timestamp", "requests", "requests_time_total", "histogram")
 
+    def __init__(self, timestamp: int) -> None:
+        self.timestamp = timestamp
+        self.requests = 0
+        self.requests_time_total = 0.0
+        # bucket index -> requests count, only if percentiles are enabled
+        self.histogram: Optional[dict[int, int]] = None
 
-class LogEntry(BaseModel):
-    """A line from the access log"""
 
-    timestamp: datetime.datetime
-    host: str
-    status: int
-    request_time: float
+class _Window:
+    """
+    Frames within a sliding window with running totals, so that aggregating the window
+    does not require walking its frames.
+    """
+
+    def __init__(self, length: int, percentiles: bool) -> None:
+        self.length = length
+        self.frames: deque[_StatFrame] = deque()
+        self.requests = 0
+        self.requests_time_total = 0.0
+        self.histogram: Optional[list[int]] = None
+        if percentiles:
+            self.histogram = [0] * len(REQUEST_TIME_BUCKETS)
+
+    def add(self, request_time: float, bucket: Optional[int]) -> None:
+        self.requests += 1
+        self.requests_time_total += request_time
+        if self.histogram is not None and bucket is not None:
+            self.histogram[bucket] += 1
+
+    def evict(self, now: float) -> None:
+        while self.frames and now - self.frames[0].timestamp > self.length:
+            frame = self.frames.popleft()
+            self.requests -= frame.requests
+            self.requests_time_total -= frame.requests_time_total
+            if self.histogram is not None and frame.histogram is not None:
+                for bucket, count in frame.histogram.items():
+                    self.histogram[bucket] -= count
+        if self.requests == 0:
+            # Avoid accumulating floating point errors
+            self.requests_time_total = 0.0
+
+    def get_stat(self) -> Stat:
+        if self.requests == 0:
+            return Stat(requests=0, request_time=0.0)
+        stat = Stat(
+            requests=self.requests,
+            request_time=round(self.requests_time_total / self.requests, 3),
+        )
+        if self.histogram is not None:
+            stat.request_time_p50, stat.request_time_p95, stat.request_time_p99 = _get_percentiles(
+                self.histogram, self.requests
+            )
+        return stat
+
+
+class _HostStats:
+    def __init__(self, percentiles: bool) -> None:
+        self.windows = [_Window(window, percentiles) for window in WINDOWS]
+        self.percentiles = percentiles
+
+    def add(self, timestamp: int, request_time: float) -> None:
+        latest_frames = self.windows[-1].frames
+        # presume that log entries are sorted by timestamp,
+        # entries that are out of order are added to the latest frame
+        if latest_frames and latest_frames[-1].timestamp >= timestamp:
+            frame = latest_frames[-1]
+        else:
+            frame = _StatFrame(timestamp)
+            for window in self.windows:
+                window.frames.append(frame)
+        bucket = None
+        if self.percentiles:
+            bucket = min(
+                bisect.bisect_left(REQUEST_TIME_BUCKETS, request_time),
+                len(REQUEST_TIME_BUCKETS) - 1,
+            )
+            if frame.histogram is None:
+                frame.histogram = {}
+            frame.histogram[bucket] = frame.histogram.get(bucket, 0) + 1
+        frame.requests += 1
+        frame.requests_time_total += request_time
+        for window in self.windows:
+            # the frame may be already evicted from shorter windows
+            if window.frames and window.frames[-1] is frame:
+                window.add(request_time, bucket)
+
+    def evict(self, now: float) -> None:
+        for window in self.windows:
+            window.evict(now)
+
+    def is_empty(self) -> bool:
+        return not self.windows[-1].frames
+
+    def get_stats(self) -> PerWindowStats:
+        return {window.length: window.get_stat() for window in self.windows}
 
 
 class StatsCollector:
     """
     StatCollector parses nginx access log and calculates average request time and requests count.
+    Optionally, it also calculates request time percentiles with ~19% precision.
     """
 
-    def __init__(self, access_log: Path) -> None:
+    def __init__(self, access_log: Path, request_time_percentiles: bool = False) -> None:
         self._path = access_log
         self._file: Optional[TextIO] = None
-        self._stats: dict[str, deque[StatFrame]] = {}
+        self._request_time_percentiles = request_time_percentiles
+        self._stats: dict[str, _HostStats] = {}
         self._lock = asyncio.Lock()
 
     async def collect(self) -> dict[str, PerWindowStats]:
@@ -54,81 +145,53 @@ class StatsCollector:
         """
         result = {}
         async with self._lock:
-            await run_async(self._collect)
-            now = datetime.datetime.now(tz=datetime.timezone.utc)
-            for host, frames in self._stats.items():
-                result[host] = self._aggregate(frames, now)
-        return result
-
-    @staticmethod
-    def _aggregate(frames: Reversible[StatFrame], now: datetime.datetime) -> PerWindowStats:
-        """
-        Aggregate 1s `frames` into windows 30s, 1m, 5m before `now`
-        """
-        result = {}
-        for window in WINDOWS:
-            req_count = 0
-            req_time_total = 0.0
-            for frame in reversed(frames):
-                if now.timestamp() - frame.timestamp > window:
-                    break
-                req_time_total += frame.requests_time_total
-                req_count += frame.requests
-            if req_count > 0:
-                result[window] = Stat(
-                    requests=req_count,
-                    request_time=round(req_time_total / req_count, 3),
-                )
-            else:
-                result[window] = Stat(requests=0, request_time=0.0)
+            await storage_io_executor.run(self._collect)
+            for host, host_stats in self._stats.items():
+                result[host] = host_stats.get_stats()
         return result
 
     def _collect(self) -> None:
-        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        now = datetime.datetime.now(tz=datetime.timezone.utc).timestamp()
 
-        for entry in self._read_access_log(now - datetime.timedelta(seconds=TTL)):
-            if entry.status in IGNORE_STATUSES:
+        for timestamp, host, status, request_time in self._read_access_log(now - TTL):
+            if status in IGNORE_STATUSES:
                 continue
-
-            frame_timestamp = int(entry.timestamp.timestamp())
-            frames = self._stats.setdefault(entry.host, deque(maxlen=TTL))
-
-            # presume that log entries are sorted by timestamp
-            if not frames or frames[-1].timestamp != frame_timestamp:
-                latest_frame = StatFrame(
-                    timestamp=frame_timestamp, requests=1, requests_time_total=entry.request_time
-                )
-                frames.append(latest_frame)
-            else:
-                latest_frame = frames[-1]
-                latest_frame.requests += 1
-                latest_frame.requests_time_total += entry.request_time
+            host_stats = self._stats.get(host)
+            if host_stats is None:
+                host_stats = _HostStats(self._request_time_percentiles)
+                self._stats[host] = host_stats
+            host_stats.add(timestamp, request_time)
 
         for host in list(self._stats.keys()):
-            if self._stats[host][-1].timestamp < now.timestamp() - TTL:
+            host_stats = self._stats[host]
+            host_stats.evict(now)
+            if host_stats.is_empty():
                 del self._stats[host]
 
-    def _read_access_log(self, after: datetime.datetime) -> Iterable[LogEntry]:
+    def _read_access_log(self, after: float) -> Iterable[tuple[int, str, int, float]]:
+        """
+        Yields (timestamp, host, status, request_time) of log lines not older than `after`
+        """
         try:
             st_ino = os.stat(self._path).st_ino
         except FileNotFoundError:
             st_ino = None
 
         if self._file is not None:
+            # Many consecutive lines have the same timestamp, so parse it once
+            prev_timestamp_str = None
+            timestamp = 0.0
             while True:
                 line = self._file.readline()
                 if not line:
                     break
                 timestamp_str, host, status, request_time = line.split()
-                timestamp = datetime.datetime.fromisoformat(timestamp_str)
+                if timestamp_str != prev_timestamp_str:
+                    timestamp = datetime.datetime.fromisoformat(timestamp_str).timestamp()
+                    prev_timestamp_str = timestamp_str
                 if timestamp < after:
                     continue
-                yield LogEntry(
-                    timestamp=timestamp,
-                    host=host,
-                    status=int(status),
-                    request_time=float(request_time),
-                )
+                yield int(timestamp), host, int(status), float(request_time)
             if os.fstat(self._file.fileno()).st_ino != st_ino:
                 # file was rotated
                 self._file.close()
@@ -141,6 +204,20 @@ class StatsCollector:
             yield from self._read_access_log(after)
 
 
+def _get_percentiles(histogram: list[int], total: int) -> tuple[float, ...]:
+    result = []
+    ranks = [total * p / 100 for p in PERCENTILES]
+    count = 0
+    for bucket, bucket_count in enumerate(histogram):
+        count += bucket_count
+        while ranks and count >= ranks[0]:
+            ranks.pop(0)
+            result.append(round(REQUEST_TIME_BUCKETS[bucket], 3))
+        if not ranks:
+            break
+    return tuple(result)
+
+
 async def get_service_stats(
     repo: GatewayProxyRepo, collector: StatsCollector
 ) -> list[ServiceStats]:
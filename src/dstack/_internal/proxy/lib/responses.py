@@ -0,0 +1,23 @@
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    A streaming response that calls `on_close` once it's sent or fails to be sent,
+    even if its content is never iterated, e.g. if the client disconnects early.
+    Used to release upstream responses, which otherwise stay open along with
+    their connections and replica stats.
+    """
+
+    def __init__(self, *args: Any, on_close: Callable[[], Awaitable[None]], **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._on_close = on_close
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._on_close()
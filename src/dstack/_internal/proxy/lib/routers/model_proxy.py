@@ -1,12 +1,13 @@
+import inspect
 from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import StreamingResponse
 from typing_extensions import Annotated
 
 from dstack._internal.proxy.lib.deps import ProxyAuth, get_proxy_repo, get_service_connection_pool
 from dstack._internal.proxy.lib.errors import ProxyError, UnexpectedProxyError
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.responses import ClosingStreamingResponse
 from dstack._internal.proxy.lib.schemas.model_proxy import (
     ChatCompletionsChunk,
     ChatCompletionsRequest,
@@ -58,10 +59,12 @@ async def post_chat_completions(
     if not body.stream:
         return await client.generate(body)
     else:
-        return StreamingResponse(
-            await StreamingAdaptor(client.stream(body)).get_stream(),
+        adaptor = StreamingAdaptor(client.stream(body))
+        return ClosingStreamingResponse(
+            await adaptor.get_stream(),
             media_type="text/event-stream",
             headers={"X-Accel-Buffering": "no"},
+            on_close=adaptor.aclose,
         )
 
 
@@ -82,6 +85,11 @@ class StreamingAdaptor:
             first_chunk = None
         return self._adaptor(first_chunk)
 
+    async def aclose(self) -> None:
+        """Closes the upstream stream, which is left open if the SSE stream is not iterated"""
+        if inspect.isasyncgen(self._stream):
+            await self._stream.aclose()
+
     async def _adaptor(self, first_chunk: Optional[ChatCompletionsChunk]) -> AsyncIterator[bytes]:
         if first_chunk is not None:
             yield self._encode_chunk(first_chunk)
@@ -1,6 +1,7 @@
 import datetime
 import json
 import uuid
+from functools import lru_cache
 from typing import AsyncIterator, Dict, List
 
 import httpx
@@ -20,6 +21,9 @@ from dstack._internal.proxy.lib.schemas.model_proxy import (
 )
 from dstack._internal.proxy.lib.services.model_proxy.clients.base import ChatCompletionsClient
 
+# The maximum number of distinct compiled chat templates kept in memory
+CHAT_TEMPLATES_CACHE_SIZE = 256
+
 
 class TGIChatCompletions(ChatCompletionsClient):
     # https://huggingface.github.io/text-generation-inference/
@@ -28,11 +32,7 @@ class TGIChatCompletions(ChatCompletionsClient):
         self.eos_token = eos_token
 
         try:
-            jinja_env = jinja2.sandbox.ImmutableSandboxedEnvironment(
-                trim_blocks=True, lstrip_blocks=True
-            )
-            jinja_env.globals["raise_exception"] = raise_exception
-            self.chat_template = jinja_env.from_string(chat_template)
+            self.chat_template = compile_chat_template(chat_template)
         except jinja2.TemplateError as e:
             raise ProxyError(f"Failed to compile chat template: {e}")
 
@@ -206,3 +206,16 @@ class TGIChatCompletions(ChatCompletionsClient):
 
 def raise_exception(message: str):
     raise jinja2.TemplateError(message)
+
+
+_jinja_env = jinja2.sandbox.ImmutableSandboxedEnvironment(trim_blocks=True, lstrip_blocks=True)
+_jinja_env.globals["raise_exception"] = raise_exception
+
+
+@lru_cache(maxsize=CHAT_TEMPLATES_CACHE_SIZE)
+def compile_chat_template(chat_template: str) -> jinja2.Template:
+    """
+    Compiles the template once per distinct template text rather than once per request.
+    Compiled templates can be rendered concurrently.
+    """
+    return _jinja_env.from_string(chat_template)
@@ -0,0 +1,200 @@
+"""
+Choosing service replicas for requests proxied directly to replicas, i.e. not via Nginx.
+"""
+
+import random
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from dstack._internal.proxy.lib.models import Replica
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Weight of the latest request latency in the latency moving average
+EWMA_ALPHA = 0.3
+# A replica is ejected for EJECTION_TIME seconds after this many consecutive connection errors
+EJECTION_CONSECUTIVE_ERRORS = 3
+EJECTION_TIME = 30
+# Errors that mean the replica is not reachable, as opposed to errors returned by the app
+CONNECTION_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+class ReplicaBalancingStrategy(str, Enum):
+    RANDOM = "random"
+    LEAST_REQUESTS = "least-requests"
+    EWMA_LATENCY = "ewma-latency"
+    POWER_OF_TWO_CHOICES = "power-of-two-choices"
+
+
+class ReplicaStats:
+    def __init__(self, timer: Callable[[], float] = time.monotonic) -> None:
+        self._timer = timer
+        # Requests sent to the replica whose responses are not fully read yet
+        self.in_flight = 0
+        # Moving average of the time to response headers, in seconds
+        self.ewma_latency: Optional[float] = None
+        self.consecutive_errors = 0
+        self.ejected_until: Optional[float] = None
+
+    def is_ejected(self) -> bool:
+        return self.ejected_until is not None and self._timer() < self.ejected_until
+
+    def on_request_started(self) -> None:
+        self.in_flight += 1
+
+    def on_request_finished(self) -> None:
+        self.in_flight -= 1
+
+    def on_response(self, latency: float) -> None:
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+        self.consecutive_errors = 0
+        self.ejected_until = None
+
+    def on_connection_error(self) -> None:
+        self.consecutive_errors += 1
+        if self.consecutive_errors >= EJECTION_CONSECUTIVE_ERRORS:
+            self.ejected_until = self._timer() + EJECTION_TIME
+
+
+class ReplicaBalancer(ABC):
+    """
+    Chooses a replica for each request based on replica stats.
+    Replicas ejected due to connection errors are skipped unless all replicas are ejected.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, ReplicaStats] = {}
+
+    def get_stats(self, replica_id: str) -> ReplicaStats:
+        stats = self._stats.get(replica_id)
+        if stats is None:
+            stats = ReplicaStats()
+            self._stats[replica_id] = stats
+        return stats
+
+    def remove_stats(self, replica_id: str) -> None:
+        self._stats.pop(replica_id, None)
+
+    def choose(self, replicas: Sequence[Replica]) -> Replica:
+        candidates = [r for r in replicas if not self.get_stats(r.id).is_ejected()]
+        if not candidates:
+            logger.debug("All %s replicas are ejected, choosing among all", len(replicas))
+            candidates = list(replicas)
+        return self._choose(candidates)
+
+    @abstractmethod
+    def _choose(self, replicas: List[Replica]) -> Replica:
+        pass
+
+
+class RandomReplicaBalancer(ReplicaBalancer):
+    def _choose(self, replicas: List[Replica]) -> Replica:
+        return random.choice(replicas)
+
+
+class LeastRequestsReplicaBalancer(ReplicaBalancer):
+    def _choose(self, replicas: List[Replica]) -> Replica:
+        min_in_flight = min(self.get_stats(r.id).in_flight for r in replicas)
+        return random.choice(
+            [r for r in replicas if self.get_stats(r.id).in_flight == min_in_flight]
+        )
+
+
+class EWMALatencyReplicaBalancer(ReplicaBalancer):
+    """
+    Chooses the replica with the lowest latency moving average weighted by
+    the number of in-flight requests. Replicas with no latency data yet are preferred.
+    """
+
+    def _choose(self, replicas: List[Replica]) -> Replica:
+        random.shuffle(replicas)
+        return min(replicas, key=self._get_cost)
+
+    def _get_cost(self, replica: Replica) -> float:
+        stats = self.get_stats(replica.id)
+        if stats.ewma_latency is None:
+            return 0
+        return stats.ewma_latency * (stats.in_flight + 1)
+
+
+class PowerOfTwoChoicesReplicaBalancer(ReplicaBalancer):
+    """
+    Chooses the replica with fewer in-flight requests out of two random replicas.
+    """
+
+    def _choose(self, replicas: List[Replica]) -> Replica:
+        if len(replicas) == 1:
+            return replicas[0]
+        first, second = random.sample(replicas, 2)
+        if self.get_stats(second.id).in_flight < self.get_stats(first.id).in_flight:
+            return second
+        return first
+
+
+def get_replica_balancer(strategy: ReplicaBalancingStrategy) -> ReplicaBalancer:
+    if strategy == ReplicaBalancingStrategy.LEAST_REQUESTS:
+        return LeastRequestsReplicaBalancer()
+    if strategy == ReplicaBalancingStrategy.EWMA_LATENCY:
+        return EWMALatencyReplicaBalancer()
+    if strategy == ReplicaBalancingStrategy.POWER_OF_TWO_CHOICES:
+        return PowerOfTwoChoicesReplicaBalancer()
+    return RandomReplicaBalancer()
+
+
+class StatsTrackingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport to report in-flight requests, latencies, and connection errors
+    of a replica to its `ReplicaStats`. A request is in flight until its response is closed.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        stats: ReplicaStats,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._transport = transport
+        self._stats = stats
+        self._timer = timer
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats.on_request_started()
+        started_at = self._timer()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException as e:
+            self._stats.on_request_finished()
+            if isinstance(e, CONNECTION_ERRORS):
+                self._stats.on_connection_error()
+            raise
+        self._stats.on_response(self._timer() - started_at)
+        response.stream = _StatsTrackingStream(response.stream, self._stats)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _StatsTrackingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, stats: ReplicaStats) -> None:
+        self._stream = stream
+        self._stats = stats
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._stats.on_request_finished()
+        await self._stream.aclose()
@@ -1,6 +1,6 @@
 import asyncio
 import os
-import random
+from collections import OrderedDict
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Dict, Optional
@@ -18,6 +18,12 @@ from dstack._internal.core.services.ssh.tunnel import (
 from dstack._internal.proxy.lib.errors import UnexpectedProxyError
 from dstack._internal.proxy.lib.models import Project, Replica, Service
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.services.replica_balancing import (
+    RandomReplicaBalancer,
+    ReplicaBalancer,
+    ReplicaStats,
+    StatsTrackingTransport,
+)
 from dstack._internal.utils.common import get_or_error
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.path import FileContent
@@ -25,6 +31,12 @@ from dstack._internal.utils.path import FileContent
 logger = get_logger(__name__)
 OPEN_TUNNEL_TIMEOUT = 10
 HTTP_TIMEOUT = 60  # Same as default Nginx proxy timeout
+# Limits of the connection pool to Nginx shared by all services with domains
+NGINX_MAX_CONNECTIONS = 512
+NGINX_MAX_KEEPALIVE_CONNECTIONS = 128
+NGINX_KEEPALIVE_EXPIRY = 60
+# The maximum number of services with domains whose Nginx clients are kept
+NGINX_MAX_CLIENTS = 1024
 
 
 class ServiceClient(httpx.AsyncClient):
@@ -34,7 +46,13 @@ class ServiceClient(httpx.AsyncClient):
 
 
 class ServiceConnection:
-    def __init__(self, project: Project, service: Service, replica: Replica) -> None:
+    def __init__(
+        self,
+        project: Project,
+        service: Service,
+        replica: Replica,
+        stats: Optional[ReplicaStats] = None,
+    ) -> None:
         self._temp_dir = TemporaryDirectory()
         options = {
             **SSH_DEFAULT_OPTIONS,
@@ -65,8 +83,11 @@ class ServiceConnection:
             ],
             options=options,
         )
+        transport: httpx.AsyncBaseTransport = AsyncHTTPTransport(uds=str(self._app_socket_path))
+        if stats is not None:
+            transport = StatsTrackingTransport(transport, stats)
         self._client = ServiceClient(
-            transport=AsyncHTTPTransport(uds=str(self._app_socket_path)),
+            transport=transport,
             # The hostname in base_url is there for troubleshooting, as it may appear in
             # logs and in the Host header. The actual destination is the Unix socket.
             base_url=f"http://{replica.id}-{service.run_name}/",
@@ -93,9 +114,14 @@ class ServiceConnection:
 
 
 class ServiceConnectionPool:
-    def __init__(self) -> None:
+    def __init__(self, balancer: Optional[ReplicaBalancer] = None) -> None:
         # TODO(#2238): remove connections to stopped replicas in-server
         self.connections: Dict[str, ServiceConnection] = {}
+        self.balancer = balancer or RandomReplicaBalancer()
+        # Clients for forwarding requests to Nginx, per service domain.
+        # All of them share one transport, i.e. one pool of keepalive connections.
+        self._nginx_clients: OrderedDict[str, ServiceClient] = OrderedDict()
+        self._nginx_transport: Optional[AsyncHTTPTransport] = None
 
     async def get(self, replica_id: str) -> Optional[ServiceConnection]:
         return self.connections.get(replica_id)
@@ -106,21 +132,54 @@ class ServiceConnectionPool:
         connection = self.connections.get(replica.id)
         if connection is not None:
             return connection
-        connection = ServiceConnection(project, service, replica)
+        stats = self.balancer.get_stats(replica.id)
+        connection = ServiceConnection(project, service, replica, stats=stats)
         self.connections[replica.id] = connection
         try:
             await connection.open()
-        except BaseException:
+        except BaseException as e:
             self.connections.pop(replica.id, None)
+            if isinstance(e, Exception):
+                stats.on_connection_error()
             raise
         return connection
 
     async def remove(self, replica_id: str) -> None:
+        self.balancer.remove_stats(replica_id)
         connection = self.connections.pop(replica_id, None)
         if connection is not None:
             await connection.close()
 
+    def get_nginx_client(self, domain: str) -> ServiceClient:
+        client = self._nginx_clients.get(domain)
+        if client is not None:
+            self._nginx_clients.move_to_end(domain)
+            return client
+        if self._nginx_transport is None:
+            self._nginx_transport = AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=NGINX_MAX_CONNECTIONS,
+                    max_keepalive_connections=NGINX_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=NGINX_KEEPALIVE_EXPIRY,
+                ),
+            )
+        client = ServiceClient(
+            transport=self._nginx_transport,
+            base_url="http://127.0.0.1",
+            headers={"Host": domain},
+            timeout=HTTP_TIMEOUT,
+        )
+        self._nginx_clients[domain] = client
+        if len(self._nginx_clients) > NGINX_MAX_CLIENTS:
+            # Not closed since closing the client closes the shared transport
+            self._nginx_clients.popitem(last=False)
+        return client
+
     async def remove_all(self) -> None:
+        self._nginx_clients.clear()
+        if self._nginx_transport is not None:
+            await self._nginx_transport.aclose()
+            self._nginx_transport = None
         replica_ids = list(self.connections)
         results = await asyncio.gather(
             *(self.remove(replica_id) for replica_id in replica_ids), return_exceptions=True
@@ -140,13 +199,9 @@ async def get_service_replica_client(
     """
     if service.domain is not None:
         # Forward to Nginx so that requests are visible to StatsCollector in the access log
-        return httpx.AsyncClient(
-            base_url="http://127.0.0.1",
-            headers={"Host": service.domain},
-            timeout=HTTP_TIMEOUT,
-        )
+        return service_conn_pool.get_nginx_client(service.domain)
     # Nginx not available, forward directly to the tunnel
-    replica = random.choice(service.replicas)
+    replica = service_conn_pool.balancer.choose(service.replicas)
     connection = await service_conn_pool.get(replica.id)
     if connection is None:
         project = await repo.get_project(service.project_name)
@@ -39,11 +39,14 @@ from dstack._internal.server.routers import (
 from dstack._internal.server.services.config import ServerConfigManager
 from dstack._internal.server.services.gateways import gateway_connections_pool, init_gateways
 from dstack._internal.server.services.locking import advisory_lock_ctx
+from dstack._internal.server.services.logs import flush_logs
 from dstack._internal.server.services.projects import get_or_create_default_project
 from dstack._internal.server.services.proxy.deps import ServerProxyDependencyInjector
 from dstack._internal.server.services.proxy.routers import service_proxy
+from dstack._internal.server.services.runner.pool import close_runner_tunnels
 from dstack._internal.server.services.storage import init_default_storage
 from dstack._internal.server.services.users import get_or_create_admin_user
+from dstack._internal.server.services.wakeups import get_wakeup_bus
 from dstack._internal.server.settings import (
     DEFAULT_PROJECT_NAME,
     DO_NOT_UPDATE_DEFAULT_PROJECT,
@@ -58,6 +61,7 @@ from dstack._internal.server.utils.routers import (
     get_server_client_error_details,
 )
 from dstack._internal.settings import DSTACK_VERSION
+from dstack._internal.utils.executors import shutdown_executors
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.ssh import check_required_ssh_version
 
@@ -131,6 +135,8 @@ async def lifespan(app: FastAPI):
     if settings.SERVER_BUCKET is not None:
         init_default_storage()
     scheduler = start_background_tasks()
+    if settings.BACKGROUND_WAKEUPS_ENABLED:
+        await get_wakeup_bus().start_listening()
     dstack_version = DSTACK_VERSION if DSTACK_VERSION else "(no version)"
     logger.info(f"The admin token is {admin.token.get_plaintext_or_error()}", {"show_path": False})
     logger.info(
@@ -141,9 +147,13 @@ async def lifespan(app: FastAPI):
         await func(app)
     yield
     scheduler.shutdown()
+    await flush_logs()
+    await get_wakeup_bus().stop_listening()
     await gateway_connections_pool.remove_all()
+    await close_runner_tunnels()
     service_conn_pool = await get_injector_from_app(app).get_service_connection_pool()
     await service_conn_pool.remove_all()
+    shutdown_executors()
     await get_db().engine.dispose()
     # Let checked-out DB connections close as dispose() only closes checked-in connections
     await asyncio.sleep(3)
@@ -1,6 +1,9 @@
+import functools
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
+from dstack._internal.server import settings
 from dstack._internal.server.background.tasks.process_fleets import process_fleets
 from dstack._internal.server.background.tasks.process_gateways import (
     process_gateways_connections,
@@ -12,6 +15,7 @@ from dstack._internal.server.background.tasks.process_instances import (
 from dstack._internal.server.background.tasks.process_metrics import (
     collect_metrics,
     delete_metrics,
+    rollup_metrics,
 )
 from dstack._internal.server.background.tasks.process_placement_groups import (
     process_placement_groups,
@@ -23,6 +27,12 @@ from dstack._internal.server.background.tasks.process_terminating_jobs import (
     process_terminating_jobs,
 )
 from dstack._internal.server.background.tasks.process_volumes import process_submitted_volumes
+from dstack._internal.server.services.backends import log_offers_cache_stats
+from dstack._internal.server.services.logs import flush_logs
+from dstack._internal.server.services.runner.pool import evict_idle_runner_tunnels
+from dstack._internal.server.services.wakeups import WakeupTopic, get_wakeup_bus
+from dstack._internal.server.utils.parsing import log_parsed_models_cache_stats
+from dstack._internal.utils.executors import log_executors_stats
 
 _scheduler = AsyncIOScheduler()
 
@@ -41,37 +51,50 @@ def start_background_tasks() -> AsyncIOScheduler:
     # * 150 active jobs with up to 2 minutes processing latency
     # * 150 active runs with up to 2 minutes processing latency
     # * 150 active instances with up to 2 minutes processing latency
+    # With batch claiming enabled, each tick claims up to BACKGROUND_BATCH_CLAIM_SIZE rows
+    # in one query and processes them concurrently, so the rates scale with the DB.
+    if settings.BACKGROUND_BATCH_CLAIM_ENABLED:
+        batch_kwargs = {"batch_size": settings.BACKGROUND_BATCH_CLAIM_SIZE, "batch_claim": True}
+    else:
+        batch_kwargs = {"batch_size": 5}
+    # With wakeups enabled, processors that are woken up on every relevant status change
+    # only need polling as a fallback, e.g. to retry jobs waiting for capacity.
+    polling_factor = 1
+    if settings.BACKGROUND_WAKEUPS_ENABLED:
+        polling_factor = settings.BACKGROUND_WAKEUPS_POLLING_FACTOR
+        _subscribe_to_wakeups(batch_kwargs)
     _scheduler.add_job(collect_metrics, IntervalTrigger(seconds=10), max_instances=1)
+    _scheduler.add_job(rollup_metrics, IntervalTrigger(minutes=1), max_instances=1)
     _scheduler.add_job(delete_metrics, IntervalTrigger(minutes=5), max_instances=1)
     # process_submitted_jobs and process_instances max processing rate is 75 jobs(instances) per minute.
     _scheduler.add_job(
         process_submitted_jobs,
-        IntervalTrigger(seconds=4, jitter=2),
-        kwargs={"batch_size": 5},
+        IntervalTrigger(seconds=4 * polling_factor, jitter=2),
+        kwargs=batch_kwargs,
         max_instances=2,
     )
     _scheduler.add_job(
         process_running_jobs,
         IntervalTrigger(seconds=4, jitter=2),
-        kwargs={"batch_size": 5},
+        kwargs=batch_kwargs,
         max_instances=2,
     )
     _scheduler.add_job(
         process_terminating_jobs,
-        IntervalTrigger(seconds=4, jitter=2),
+        IntervalTrigger(seconds=4 * polling_factor, jitter=2),
         kwargs={"batch_size": 5},
         max_instances=2,
     )
     _scheduler.add_job(
         process_runs,
-        IntervalTrigger(seconds=2, jitter=1),
-        kwargs={"batch_size": 5},
+        IntervalTrigger(seconds=2 * polling_factor, jitter=1),
+        kwargs=batch_kwargs,
         max_instances=2,
     )
     _scheduler.add_job(
         process_instances,
         IntervalTrigger(seconds=4, jitter=2),
-        kwargs={"batch_size": 5},
+        kwargs=batch_kwargs,
         max_instances=2,
     )
     _scheduler.add_job(process_fleets, IntervalTrigger(seconds=10, jitter=2))
@@ -83,5 +106,31 @@ def start_background_tasks() -> AsyncIOScheduler:
         process_submitted_volumes, IntervalTrigger(seconds=10, jitter=2), max_instances=5
     )
     _scheduler.add_job(process_placement_groups, IntervalTrigger(seconds=30, jitter=5))
+    if settings.RUNNER_SSH_TUNNEL_POOL_ENABLED:
+        _scheduler.add_job(evict_idle_runner_tunnels, IntervalTrigger(seconds=60))
+    if settings.SERVER_LOG_WRITE_BUFFER_ENABLED:
+        _scheduler.add_job(
+            flush_logs,
+            IntervalTrigger(seconds=settings.SERVER_LOG_WRITE_BUFFER_FLUSH_INTERVAL),
+            max_instances=1,
+        )
+    _scheduler.add_job(log_executors_stats, IntervalTrigger(minutes=1))
+    _scheduler.add_job(log_offers_cache_stats, IntervalTrigger(minutes=1))
+    _scheduler.add_job(log_parsed_models_cache_stats, IntervalTrigger(minutes=1))
     _scheduler.start()
     return _scheduler
+
+
+def _subscribe_to_wakeups(batch_kwargs: dict) -> None:
+    bus = get_wakeup_bus()
+    bus.subscribe(WakeupTopic.RUNS, functools.partial(process_runs, **batch_kwargs))
+    bus.subscribe(
+        WakeupTopic.SUBMITTED_JOBS, functools.partial(process_submitted_jobs, **batch_kwargs)
+    )
+    bus.subscribe(
+        WakeupTopic.RUNNING_JOBS, functools.partial(process_running_jobs, **batch_kwargs)
+    )
+    bus.subscribe(
+        WakeupTopic.TERMINATING_JOBS, functools.partial(process_terminating_jobs, batch_size=5)
+    )
+    bus.subscribe(WakeupTopic.INSTANCES, functools.partial(process_instances, **batch_kwargs))
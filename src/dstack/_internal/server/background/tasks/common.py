@@ -0,0 +1,78 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Sequence, Type, TypeVar, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from dstack._internal.server.db import get_session_ctx
+from dstack._internal.server.models import InstanceModel, JobModel, RunModel
+from dstack._internal.server.services.locking import get_locker
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ModelT = TypeVar("ModelT", bound=Union[InstanceModel, JobModel, RunModel])
+
+
+async def claim_and_process(
+    model: Type[ModelT],
+    filters: Sequence[ColumnElement[bool]],
+    process_func: Callable[[AsyncSession, ModelT], Awaitable[None]],
+    batch_size: int,
+    max_workers: int,
+    options: Sequence[Any] = (),
+) -> None:
+    """
+    Claims up to `batch_size` rows matching `filters` with a single
+    `SELECT ... FOR UPDATE SKIP LOCKED` and processes them with at most `max_workers`
+    concurrent workers, each in its own session.
+
+    The claim only holds the in-memory lockset. The DB lock is released after claiming
+    and re-acquired per row by its worker. A row is skipped if it has been processed
+    by another replica in between, which is detected by a changed `last_processed_at`.
+    Rows are released from the lockset one by one as their processing finishes.
+    """
+    lock, lockset = get_locker().get_lockset(model.__tablename__)
+    async with get_session_ctx() as session:
+        async with lock:
+            res = await session.execute(
+                select(model.id, model.last_processed_at)
+                .where(*filters, model.id.not_in(lockset))
+                .order_by(model.last_processed_at.asc())
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            claimed = res.all()
+            lockset.update(row.id for row in claimed)
+    if len(claimed) == 0:
+        return
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def _worker(model_id: uuid.UUID, last_processed_at: datetime):
+        try:
+            async with semaphore, get_session_ctx() as session:
+                res = await session.execute(
+                    select(model)
+                    .where(
+                        *filters,
+                        model.id == model_id,
+                        model.last_processed_at == last_processed_at,
+                    )
+                    .options(*options)
+                    .with_for_update(skip_locked=True)
+                )
+                model_instance = res.scalar()
+                if model_instance is None:
+                    logger.debug(
+                        "%s %s was processed elsewhere, skipping", model.__name__, model_id
+                    )
+                    return
+                await process_func(session, model_instance)
+        finally:
+            lockset.difference_update([model_id])
+
+    await asyncio.gather(*(_worker(row.id, row.last_processed_at) for row in claimed))
@@ -39,7 +39,7 @@ from dstack._internal.core.consts import DSTACK_SHIM_HTTP_PORT
 # FIXME: ProvisioningError is a subclass of ComputeError and should not be used outside of Compute
 from dstack._internal.core.errors import BackendError, ProvisioningError
 from dstack._internal.core.models.backends.base import BackendType
-from dstack._internal.core.models.fleets import InstanceGroupPlacement
+from dstack._internal.core.models.fleets import FleetSpec, InstanceGroupPlacement
 from dstack._internal.core.models.instances import (
     InstanceAvailability,
     InstanceOfferWithAvailability,
@@ -62,6 +62,8 @@ from dstack._internal.core.models.runs import (
     Retry,
 )
 from dstack._internal.core.services.profiles import get_retry
+from dstack._internal.server import settings as server_settings
+from dstack._internal.server.background.tasks.common import claim_and_process
 from dstack._internal.server.db import get_session_ctx
 from dstack._internal.server.models import (
     FleetModel,
@@ -71,9 +73,10 @@ from dstack._internal.server.models import (
 )
 from dstack._internal.server.schemas.runner import HealthcheckResponse
 from dstack._internal.server.services import backends as backends_services
+from dstack._internal.server.services import provisioning as provisioning_services
 from dstack._internal.server.services.fleets import (
-    fleet_model_to_fleet,
     get_create_instance_offers,
+    get_fleet_spec,
 )
 from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.offers import is_divisible_into_blocks
@@ -91,7 +94,13 @@ from dstack._internal.server.services.pools import (
 from dstack._internal.server.services.runner import client as runner_client
 from dstack._internal.server.services.runner.client import HealthStatus
 from dstack._internal.server.services.runner.ssh import runner_ssh_tunnel
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.server.utils.parsing import parse_raw_cached
+from dstack._internal.utils.common import get_current_datetime
+from dstack._internal.utils.executors import (
+    cloud_api_executor,
+    ssh_deploy_executor,
+    ssh_executor,
+)
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.network import get_ip_from_network, is_ip_among_addresses
 from dstack._internal.utils.ssh import (
@@ -109,7 +118,26 @@ PROVISIONING_TIMEOUT_SECONDS = 10 * 60  # 10 minutes in seconds
 logger = get_logger(__name__)
 
 
-async def process_instances(batch_size: int = 1):
+PROCESSED_INSTANCE_STATUSES = [
+    InstanceStatus.PENDING,
+    InstanceStatus.PROVISIONING,
+    InstanceStatus.BUSY,
+    InstanceStatus.IDLE,
+    InstanceStatus.TERMINATING,
+]
+
+
+async def process_instances(batch_size: int = 1, batch_claim: bool = False):
+    if batch_claim:
+        await claim_and_process(
+            model=InstanceModel,
+            filters=[InstanceModel.status.in_(PROCESSED_INSTANCE_STATUSES)],
+            process_func=_process_instance,
+            batch_size=batch_size,
+            max_workers=server_settings.BACKGROUND_BATCH_CLAIM_MAX_WORKERS,
+            options=[lazyload(InstanceModel.jobs)],
+        )
+        return
     tasks = []
     for _ in range(batch_size):
         tasks.append(_process_next_instance())
@@ -123,15 +151,7 @@ async def _process_next_instance():
             res = await session.execute(
                 select(InstanceModel)
                 .where(
-                    InstanceModel.status.in_(
-                        [
-                            InstanceStatus.PENDING,
-                            InstanceStatus.PROVISIONING,
-                            InstanceStatus.BUSY,
-                            InstanceStatus.IDLE,
-                            InstanceStatus.TERMINATING,
-                        ]
-                    ),
+                    InstanceModel.status.in_(PROCESSED_INSTANCE_STATUSES),
                     InstanceModel.id.not_in(lockset),
                 )
                 .options(lazyload(InstanceModel.jobs))
@@ -158,7 +178,9 @@ async def _process_instance(session: AsyncSession, instance: InstanceModel):
         .where(InstanceModel.id == instance.id)
         .options(joinedload(InstanceModel.project).joinedload(ProjectModel.backends))
         .options(joinedload(InstanceModel.jobs))
-        .options(joinedload(InstanceModel.fleet).joinedload(FleetModel.instances))
+        # Fleet instances are not loaded to avoid loading the whole fleet for every instance.
+        # The few fleet instances needed are fetched with targeted queries.
+        .options(joinedload(InstanceModel.fleet))
         .execution_options(populate_existing=True)
     )
     instance = res.unique().scalar_one()
@@ -255,7 +277,7 @@ async def _add_remote(instance: InstanceModel) -> None:
         authorized_keys.append(instance.project.ssh_public_key.strip())
 
         try:
-            future = run_async(
+            future = ssh_deploy_executor.run(
                 _deploy_instance, remote_details, pkeys, ssh_proxy_pkeys, authorized_keys
             )
             deploy_timeout = 20 * 60  # 20 minutes
@@ -460,7 +482,12 @@ async def _create_instance(session: AsyncSession, instance: InstanceModel) -> No
         )
         return
 
-    if _need_to_wait_fleet_provisioning(instance):
+    fleet_spec = None
+    master_instance = None
+    if instance.fleet is not None:
+        fleet_spec = get_fleet_spec(instance.fleet)
+        master_instance = await _get_fleet_master_instance(session, instance.fleet)
+    if _need_to_wait_fleet_provisioning(instance, fleet_spec, master_instance):
         logger.debug("Waiting for the first instance in the fleet to be provisioned")
         return
 
@@ -502,11 +529,17 @@ async def _create_instance(session: AsyncSession, instance: InstanceModel) -> No
             )
             return
 
+    master_job_provisioning_data = None
+    if instance.fleet is not None:
+        master_job_provisioning_data = await _get_fleet_master_job_provisioning_data(
+            session, instance.fleet
+        )
     offers = await get_create_instance_offers(
         project=instance.project,
         profile=profile,
         requirements=requirements,
-        fleet_model=instance.fleet,
+        fleet_spec=fleet_spec,
+        master_job_provisioning_data=master_job_provisioning_data,
         blocks="auto" if instance.total_blocks is None else instance.total_blocks,
         exclude_not_available=True,
     )
@@ -529,7 +562,9 @@ async def _create_instance(session: AsyncSession, instance: InstanceModel) -> No
     for backend, instance_offer in offers:
         if instance_offer.backend not in BACKENDS_WITH_CREATE_INSTANCE_SUPPORT:
             continue
-        instance_offer = _get_instance_offer_for_instance(instance_offer, instance)
+        instance_offer = _get_instance_offer_for_instance(
+            instance_offer, fleet_spec, master_instance
+        )
         if (
             instance_offer.backend in BACKENDS_WITH_PLACEMENT_GROUPS_SUPPORT
             and instance.fleet
@@ -545,7 +580,9 @@ async def _create_instance(session: AsyncSession, instance: InstanceModel) -> No
             )
             if placement_group_model is not None:
                 placement_group = placement_group_model_to_placement_group(placement_group_model)
-                pgpd = await run_async(backend.compute().create_placement_group, placement_group)
+                pgpd = await cloud_api_executor.run(
+                    backend.compute().create_placement_group, placement_group
+                )
                 placement_group_model.provisioning_data = pgpd.json()
                 session.add(placement_group_model)
                 placement_groups.append(placement_group)
@@ -557,7 +594,7 @@ async def _create_instance(session: AsyncSession, instance: InstanceModel) -> No
             instance_offer.price,
         )
         try:
-            job_provisioning_data = await run_async(
+            job_provisioning_data = await cloud_api_executor.run(
                 backend.compute().create_instance,
                 instance_offer,
                 instance_configuration,
@@ -650,7 +687,7 @@ async def _check_instance(instance: InstanceModel) -> None:
     ssh_private_keys = get_instance_ssh_private_keys(instance)
 
     # May return False if fails to establish ssh connection
-    health_status_response = await run_async(
+    health_status_response = await ssh_executor.run(
         _instance_healthcheck,
         ssh_private_keys,
         job_provisioning_data,
@@ -761,8 +798,8 @@ async def _wait_for_instance_provisioning_data(
         instance.termination_reason = "Backend not available"
         return
     try:
-        await run_async(
-            backend.compute().update_provisioning_data,
+        await provisioning_services.update_provisioning_data(
+            backend.compute(),
             job_provisioning_data,
             project.ssh_public_key,
             project.ssh_private_key,
@@ -820,7 +857,7 @@ async def _terminate(instance: InstanceModel) -> None:
             else:
                 logger.debug("Terminating runner instance %s", jpd.hostname)
                 try:
-                    await run_async(
+                    await cloud_api_executor.run(
                         backend.compute().terminate_instance,
                         jpd.instance_id,
                         jpd.region,
@@ -877,37 +914,72 @@ def _get_termination_deadline(instance: InstanceModel) -> datetime.datetime:
     )
 
 
-def _need_to_wait_fleet_provisioning(instance: InstanceModel) -> bool:
+async def _get_fleet_master_instance(
+    session: AsyncSession, fleet_model: FleetModel
+) -> Optional[InstanceModel]:
+    """Returns the first instance of the fleet without loading all fleet instances"""
+    res = await session.execute(
+        select(InstanceModel)
+        .where(InstanceModel.fleet_id == fleet_model.id)
+        .order_by(InstanceModel.instance_num, InstanceModel.created_at)
+        .limit(1)
+        .options(lazyload(InstanceModel.jobs))
+    )
+    return res.scalar_one_or_none()
+
+
+async def _get_fleet_master_job_provisioning_data(
+    session: AsyncSession, fleet_model: FleetModel
+) -> Optional[JobProvisioningData]:
+    """Returns the provisioning data of the first provisioned instance of the fleet"""
+    res = await session.execute(
+        select(InstanceModel.job_provisioning_data)
+        .where(
+            InstanceModel.fleet_id == fleet_model.id,
+            InstanceModel.job_provisioning_data.is_not(None),
+        )
+        .order_by(InstanceModel.instance_num, InstanceModel.created_at)
+        .limit(1)
+    )
+    job_provisioning_data = res.scalar_one_or_none()
+    if job_provisioning_data is None:
+        return None
+    return parse_raw_cached(JobProvisioningData.__response__, job_provisioning_data)
+
+
+def _need_to_wait_fleet_provisioning(
+    instance: InstanceModel,
+    fleet_spec: Optional[FleetSpec],
+    master_instance: Optional[InstanceModel],
+) -> bool:
     # Cluster cloud instances should wait for the first fleet instance to be provisioned
     # so that they are provisioned in the same backend/region
-    if instance.fleet is None:
+    if fleet_spec is None or master_instance is None:
         return False
     if (
-        instance.id == instance.fleet.instances[0].id
-        or instance.fleet.instances[0].job_provisioning_data is not None
-        or instance.fleet.instances[0].status == InstanceStatus.TERMINATED
+        instance.id == master_instance.id
+        or master_instance.job_provisioning_data is not None
+        or master_instance.status == InstanceStatus.TERMINATED
     ):
         return False
-    fleet = fleet_model_to_fleet(instance.fleet)
     return (
-        fleet.spec.configuration.placement == InstanceGroupPlacement.CLUSTER
-        and fleet.spec.configuration.ssh_config is None
+        fleet_spec.configuration.placement == InstanceGroupPlacement.CLUSTER
+        and fleet_spec.configuration.ssh_config is None
     )
 
 
 def _get_instance_offer_for_instance(
     instance_offer: InstanceOfferWithAvailability,
-    instance: InstanceModel,
+    fleet_spec: Optional[FleetSpec],
+    master_instance: Optional[InstanceModel],
 ) -> InstanceOfferWithAvailability:
-    if instance.fleet is None:
+    if fleet_spec is None or master_instance is None:
         return instance_offer
 
-    fleet = fleet_model_to_fleet(instance.fleet)
-    master_instance = instance.fleet.instances[0]
     master_job_provisioning_data = get_instance_provisioning_data(master_instance)
     instance_offer = instance_offer.copy()
     if (
-        fleet.spec.configuration.placement == InstanceGroupPlacement.CLUSTER
+        fleet_spec.configuration.placement == InstanceGroupPlacement.CLUSTER
         and master_job_provisioning_data is not None
         and master_job_provisioning_data.availability_zone is not None
     ):
@@ -11,7 +11,8 @@ from dstack._internal.server.models import PlacementGroupModel, ProjectModel
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.placement import placement_group_model_to_placement_group
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -81,7 +82,7 @@ async def _delete_placement_group(placement_group_model: PlacementGroupModel):
         )
         return
     try:
-        await run_async(backend.compute().delete_placement_group, placement_group)
+        await cloud_api_executor.run(backend.compute().delete_placement_group, placement_group)
     except PlacementGroupInUseError:
         logger.info(
             "Placement group %s is still in use. Skipping deletion for now.", placement_group.name
@@ -29,6 +29,8 @@ from dstack._internal.core.models.runs import (
     RunSpec,
 )
 from dstack._internal.core.models.volumes import InstanceMountPoint, Volume, VolumeMountPoint
+from dstack._internal.server import settings
+from dstack._internal.server.background.tasks.common import claim_and_process
 from dstack._internal.server.db import get_session_ctx
 from dstack._internal.server.models import (
     InstanceModel,
@@ -60,14 +62,27 @@ from dstack._internal.server.services.runs import (
     run_model_to_run,
 )
 from dstack._internal.server.services.storage import get_default_storage
+from dstack._internal.server.utils.parsing import parse_raw_cached
 from dstack._internal.utils import common as common_utils
+from dstack._internal.utils.executors import ssh_executor, storage_io_executor
 from dstack._internal.utils.interpolator import VariablesInterpolator
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-async def process_running_jobs(batch_size: int = 1):
+async def process_running_jobs(batch_size: int = 1, batch_claim: bool = False):
+    if batch_claim:
+        await claim_and_process(
+            model=JobModel,
+            filters=[
+                JobModel.status.in_([JobStatus.PROVISIONING, JobStatus.PULLING, JobStatus.RUNNING])
+            ],
+            process_func=_process_running_job,
+            batch_size=batch_size,
+            max_workers=settings.BACKGROUND_BATCH_CLAIM_MAX_WORKERS,
+        )
+        return
     tasks = []
     for _ in range(batch_size):
         tasks.append(_process_next_running_job())
@@ -200,7 +215,7 @@ async def _process_running_job(session: AsyncSession, job_model: JobModel):
                 if job_provisioning_data.backend == BackendType.LOCAL:
                     # No need to update ~/.ssh/authorized_keys when running shim localy
                     user_ssh_key = ""
-                success = await common_utils.run_async(
+                success = await ssh_executor.run(
                     _process_provisioning_with_shim,
                     server_ssh_private_keys,
                     job_provisioning_data,
@@ -227,7 +242,7 @@ async def _process_running_job(session: AsyncSession, job_model: JobModel):
                     repo=repo_model,
                     code_hash=run.run_spec.repo_code_hash,
                 )
-                success = await common_utils.run_async(
+                success = await ssh_executor.run(
                     _submit_job_to_runner,
                     server_ssh_private_keys,
                     job_provisioning_data,
@@ -270,7 +285,7 @@ async def _process_running_job(session: AsyncSession, job_model: JobModel):
                 repo=repo_model,
                 code_hash=run.run_spec.repo_code_hash,
             )
-            success = await common_utils.run_async(
+            success = await ssh_executor.run(
                 _process_pulling_with_shim,
                 server_ssh_private_keys,
                 job_provisioning_data,
@@ -287,7 +302,7 @@ async def _process_running_job(session: AsyncSession, job_model: JobModel):
             )
         elif initial_status == JobStatus.RUNNING:
             logger.debug("%s: process running job, age=%s", fmt(job_model), job_submission.age)
-            success = await common_utils.run_async(
+            success = await ssh_executor.run(
                 _process_running,
                 server_ssh_private_keys,
                 job_provisioning_data,
@@ -611,7 +626,8 @@ def _process_running(
         timestamp = job_model.runner_timestamp
     resp = runner_client.pull(timestamp)  # raises error if runner is down, causes retry
     job_model.runner_timestamp = resp.last_updated
-    # may raise LogStorageError, causing a retry
+    # may raise LogStorageError, causing a retry.
+    # With buffered writes, logs are written later and failed writes are retried by the writer.
     logs_services.write_logs(
         project=run_model.project,
         run_name=run_model.run_name,
@@ -645,7 +661,7 @@ def _process_running(
 def _terminate_if_inactivity_duration_exceeded(
     run_model: RunModel, job_model: JobModel, no_connections_secs: Optional[int]
 ) -> None:
-    conf = RunSpec.__response__.parse_raw(run_model.run_spec).configuration
+    conf = parse_raw_cached(RunSpec.__response__, run_model.run_spec).configuration
     if is_core_model_instance(conf, DevEnvironmentConfiguration) and isinstance(
         conf.inactivity_duration, int
     ):
@@ -704,7 +720,7 @@ async def _get_job_code(
     storage = get_default_storage()
     if storage is None or code_model.blob is not None:
         return code_model.blob
-    blob = await common_utils.run_async(
+    blob = await storage_io_executor.run(
         storage.get_code,
         project.name,
         repo.name,
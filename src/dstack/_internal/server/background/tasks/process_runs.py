@@ -20,6 +20,8 @@ from dstack._internal.core.models.runs import (
     RunStatus,
     RunTerminationReason,
 )
+from dstack._internal.server import settings
+from dstack._internal.server.background.tasks.common import claim_and_process
 from dstack._internal.server.db import get_session_ctx
 from dstack._internal.server.models import JobModel, ProjectModel, RunModel
 from dstack._internal.server.services.jobs import (
@@ -36,6 +38,7 @@ from dstack._internal.server.services.runs import (
     run_model_to_run,
     scale_run_replicas,
 )
+from dstack._internal.server.utils.parsing import parse_raw_cached
 from dstack._internal.utils import common
 from dstack._internal.utils.logging import get_logger
 
@@ -43,7 +46,16 @@ logger = get_logger(__name__)
 RETRY_DELAY = datetime.timedelta(seconds=15)
 
 
-async def process_runs(batch_size: int = 1):
+async def process_runs(batch_size: int = 1, batch_claim: bool = False):
+    if batch_claim:
+        await claim_and_process(
+            model=RunModel,
+            filters=[RunModel.status.not_in(RunStatus.finished_statuses())],
+            process_func=_lock_jobs_and_process_run,
+            batch_size=batch_size,
+            max_workers=settings.BACKGROUND_BATCH_CLAIM_MAX_WORKERS,
+        )
+        return
     tasks = []
     for _ in range(batch_size):
         tasks.append(_process_next_run())
@@ -91,6 +103,29 @@ async def _process_next_run():
             job_lockset.difference_update(job_ids)
 
 
+async def _lock_jobs_and_process_run(session: AsyncSession, run_model: RunModel):
+    job_lock, job_lockset = get_locker().get_lockset(JobModel.__tablename__)
+    async with job_lock:
+        res = await session.execute(
+            select(JobModel)
+            .where(
+                JobModel.run_id == run_model.id,
+                JobModel.id.not_in(job_lockset),
+            )
+            .with_for_update(skip_locked=True)
+        )
+        job_models = res.scalars().all()
+        if len(run_model.jobs) != len(job_models):
+            # Some jobs are locked
+            return
+        job_ids = [j.id for j in run_model.jobs]
+        job_lockset.update(job_ids)
+    try:
+        await _process_run(session=session, run_model=run_model)
+    finally:
+        job_lockset.difference_update(job_ids)
+
+
 async def _process_run(session: AsyncSession, run_model: RunModel):
     logger.debug("%s: processing run", fmt(run_model))
     # Refetch to load related attributes.
@@ -188,7 +223,7 @@ async def _process_active_run(session: AsyncSession, run_model: RunModel):
     We handle fails, scaling, and status changes.
     """
     run = run_model_to_run(run_model)
-    run_spec = RunSpec.__response__.parse_raw(run_model.run_spec)
+    run_spec = parse_raw_cached(RunSpec.__response__, run_model.run_spec)
     retry_single_job = _can_retry_single_job(run_spec)
 
     run_statuses: Set[RunStatus] = set()
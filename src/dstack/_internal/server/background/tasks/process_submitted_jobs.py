@@ -35,6 +35,8 @@ from dstack._internal.core.models.runs import (
 )
 from dstack._internal.core.models.volumes import Volume
 from dstack._internal.core.services.profiles import get_termination
+from dstack._internal.server import settings
+from dstack._internal.server.background.tasks.common import claim_and_process
 from dstack._internal.server.db import get_db, get_session_ctx
 from dstack._internal.server.models import (
     FleetModel,
@@ -74,14 +76,25 @@ from dstack._internal.server.services.runs import (
 from dstack._internal.server.services.volumes import (
     volume_model_to_volume,
 )
+from dstack._internal.server.utils.parsing import parse_raw_cached
 from dstack._internal.utils import common as common_utils
 from dstack._internal.utils import env as env_utils
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-async def process_submitted_jobs(batch_size: int = 1):
+async def process_submitted_jobs(batch_size: int = 1, batch_claim: bool = False):
+    if batch_claim:
+        await claim_and_process(
+            model=JobModel,
+            filters=[JobModel.status == JobStatus.SUBMITTED],
+            process_func=_process_submitted_job,
+            batch_size=batch_size,
+            max_workers=settings.BACKGROUND_BATCH_CLAIM_MAX_WORKERS,
+        )
+        return
     tasks = []
     for _ in range(batch_size):
         tasks.append(_process_next_submitted_job())
@@ -130,7 +143,7 @@ async def _process_submitted_job(session: AsyncSession, job_model: JobModel):
     )
     run_model = res.unique().scalar_one()
     project = run_model.project
-    run_spec = RunSpec.__response__.parse_raw(run_model.run_spec)
+    run_spec = parse_raw_cached(RunSpec.__response__, run_model.run_spec)
     profile = run_spec.merged_profile
 
     run = run_model_to_run(run_model)
@@ -187,13 +200,23 @@ async def _process_submitted_job(session: AsyncSession, job_model: JobModel):
     # This is needed to avoid holding instances lock for a long time.
     if not job_model.instance_assigned:
         # Try assigning instances from the pool.
+        # Narrow down the pool in the DB to instances that can be assigned to the job,
+        # so that large pools are not loaded, locked, and filtered on every job.
+        # The rest of the filters are applied in `_assign_job_to_pool_instance()`.
+        filters = [
+            InstanceModel.pool_id == pool.id,
+            InstanceModel.deleted == False,
+            InstanceModel.unreachable == False,
+            InstanceModel.status.in_([InstanceStatus.IDLE, InstanceStatus.BUSY]),
+            InstanceModel.total_blocks > InstanceModel.busy_blocks,
+        ]
+        if run_model.fleet_id is not None:
+            filters.append(InstanceModel.fleet_id == run_model.fleet_id)
+        if profile.instance_name is not None:
+            filters.append(InstanceModel.name == profile.instance_name)
         res = await session.execute(
             select(InstanceModel)
-            .where(
-                InstanceModel.pool_id == pool.id,
-                InstanceModel.deleted == False,
-                InstanceModel.total_blocks > InstanceModel.busy_blocks,
-            )
+            .where(*filters)
             .options(lazyload(InstanceModel.jobs))
             .with_for_update()
         )
@@ -205,7 +228,9 @@ async def _process_submitted_job(session: AsyncSession, job_model: JobModel):
         async with get_locker().lock_ctx(InstanceModel.__tablename__, instances_ids):
             # If another job freed the instance but is still trying to detach volumes,
             # do not provision on it to prevent attaching volumes that are currently detaching.
-            detaching_instances_ids = await get_instances_ids_with_detaching_volumes(session)
+            detaching_instances_ids = await get_instances_ids_with_detaching_volumes(
+                session, instances_ids=instances_ids
+            )
             # Refetch after lock
             res = await session.execute(
                 select(InstanceModel)
@@ -215,6 +240,7 @@ async def _process_submitted_job(session: AsyncSession, job_model: JobModel):
                     InstanceModel.deleted == False,
                     InstanceModel.total_blocks > InstanceModel.busy_blocks,
                 )
+                .options(lazyload(InstanceModel.jobs))
                 .execution_options(populate_existing=True)
             )
             pool_instances = list(res.unique().scalars().all())
@@ -461,7 +487,7 @@ async def _run_job_on_new_instance(
         )
         offer_volumes = _get_offer_volumes(volumes, offer)
         try:
-            job_provisioning_data = await common_utils.run_async(
+            job_provisioning_data = await cloud_api_executor.run(
                 backend.compute().run_job,
                 run,
                 job,
@@ -702,7 +728,7 @@ async def _attach_volume(
     await session.refresh(volume_model)
     if volume_model.deleted:
         raise ServerClientError("Cannot attach a deleted volume")
-    attachment_data = await common_utils.run_async(
+    attachment_data = await cloud_api_executor.run(
         backend.compute().attach_volume,
         volume=volume,
         instance_id=instance_id,
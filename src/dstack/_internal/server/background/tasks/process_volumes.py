@@ -14,7 +14,8 @@ from dstack._internal.server.models import (
 from dstack._internal.server.services import backends as backends_services
 from dstack._internal.server.services import volumes as volumes_services
 from dstack._internal.server.services.locking import get_locker
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -84,13 +85,13 @@ async def _process_submitted_volume(session: AsyncSession, volume_model: VolumeM
     try:
         if volume.configuration.volume_id is not None:
             logger.info("Registering external volume %s", volume_model.name)
-            vpd = await run_async(
+            vpd = await cloud_api_executor.run(
                 backend.compute().register_volume,
                 volume=volume,
             )
         else:
             logger.info("Provisioning new volume %s", volume_model.name)
-            vpd = await run_async(
+            vpd = await cloud_api_executor.run(
                 backend.compute().create_volume,
                 volume=volume,
             )
@@ -648,3 +648,50 @@ class JobMetricsPoint(BaseModel):
     # json-encoded lists of metric values of len(gpus) length
     gpus_memory_usage_bytes: Mapped[str] = mapped_column(Text)
     gpus_util_percent: Mapped[str] = mapped_column(Text)
+
+    __table_args__ = (
+        Index("ix_job_metrics_points_job_id_timestamp_micro", job_id, timestamp_micro),
+        Index("ix_job_metrics_points_timestamp_micro", timestamp_micro),
+    )
+
+
+class JobMetricsRollup(BaseModel):
+    """
+    `JobMetricsPoint`s aggregated over `resolution_seconds`-long buckets.
+    Rollups are kept longer than points to query metrics history.
+    """
+
+    __tablename__ = "job_metrics_rollups"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUIDType(binary=False), primary_key=True, default=uuid.uuid4
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("jobs.id"))
+    job: Mapped["JobModel"] = relationship()
+
+    resolution_seconds: Mapped[int] = mapped_column(Integer)
+    bucket_start_micro: Mapped[int] = mapped_column(BigInteger)
+    # The timestamp and the cumulative CPU usage of the last point in the bucket
+    timestamp_micro: Mapped[int] = mapped_column(BigInteger)
+    cpu_usage_micro: Mapped[int] = mapped_column(BigInteger)
+    # Averages over the bucket
+    memory_usage_bytes: Mapped[int] = mapped_column(BigInteger)
+    memory_working_set_bytes: Mapped[int] = mapped_column(BigInteger)
+    # little-endian int64 arrays of metric values of len(gpus) length
+    gpus_memory_usage_bytes: Mapped[bytes] = mapped_column(LargeBinary)
+    gpus_util_percent: Mapped[bytes] = mapped_column(LargeBinary)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "job_id",
+            "resolution_seconds",
+            "bucket_start_micro",
+            name="uq_job_metrics_rollups_job_id_resolution_seconds_bucket_start_micro",
+        ),
+        Index(
+            "ix_job_metrics_rollups_resolution_seconds_bucket_start_micro",
+            resolution_seconds,
+            bucket_start_micro,
+        ),
+    )
@@ -43,6 +43,9 @@ async def list_fleets(
 
     The results are paginated. To get the next page, pass `created_at` and `id` of
     the last fleet from the previous page as `prev_created_at` and `prev_id`.
+
+    If `changed_after` is specified, returns only fleets that were updated, or whose
+    instances were updated, since then.
     """
     return await fleets_services.list_fleets(
         session=session,
@@ -53,6 +56,7 @@ async def list_fleets(
         prev_id=body.prev_id,
         limit=body.limit,
         ascending=body.ascending,
+        changed_after=body.changed_after,
     )
 
 
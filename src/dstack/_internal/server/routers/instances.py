@@ -30,6 +30,8 @@ async def list_instances(
 
     The results are paginated. To get the next page, pass `created_at` and `id` of
     the last instance from the previous page as `prev_created_at` and `prev_id`.
+
+    If `changed_after` is specified, returns only instances updated since then.
     """
     return await pools.list_user_pool_instances(
         session=session,
@@ -42,4 +44,5 @@ async def list_instances(
         prev_id=body.prev_id,
         limit=body.limit,
         ascending=body.ascending,
+        changed_after=body.changed_after,
     )
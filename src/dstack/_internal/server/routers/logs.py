@@ -1,7 +1,9 @@
-from typing import Tuple
+from typing import AsyncIterator, Tuple
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
+from dstack._internal.core.errors import ServerClientError
 from dstack._internal.core.models.logs import JobSubmissionLogs
 from dstack._internal.server.models import ProjectModel, UserModel
 from dstack._internal.server.schemas.logs import PollLogsRequest
@@ -28,3 +30,31 @@ async def poll_logs(
     # Otherwise, some logs with duplicated timestamps may be filtered out.
     # This limitation is imposed by cloud log services that support up to millisecond timestamp resolution.
     return await logs.poll_logs_async(project=project, request=body)
+
+
+@router.post(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_logs(
+    body: PollLogsRequest,
+    user_project: Tuple[UserModel, ProjectModel] = Depends(ProjectMember()),
+):
+    """
+    Streams new logs as server-sent events until the job submission finishes.
+    Each event contains `JobSubmissionLogs` with logs written since the previous event,
+    starting after `start_time`. `limit` is the maximum number of logs per event.
+    """
+    _, project = user_project
+    if body.descending:
+        raise ServerClientError("Cannot stream logs in descending order")
+
+    async def _stream() -> AsyncIterator[str]:
+        async for log_events in logs.stream_logs(project=project, request=body):
+            if len(log_events) == 0:
+                yield ": keepalive\n\n"
+            else:
+                yield f"data: {JobSubmissionLogs(logs=log_events).json()}\n\n"
+
+    return StreamingResponse(_stream(), media_type="text/event-stream")
@@ -1,6 +1,7 @@
-from typing import Tuple
+from datetime import datetime
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dstack._internal.core.models.metrics import JobMetrics
@@ -24,6 +25,9 @@ async def get_job_metrics(
     run_name: str,
     replica_num: int = 0,
     job_num: int = 0,
+    after: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1),
     session: AsyncSession = Depends(get_session),
     user_project: Tuple[UserModel, ProjectModel] = Depends(ProjectMember()),
 ) -> JobMetrics:
@@ -32,6 +36,10 @@ async def get_job_metrics(
     given `run_name`, `replica_num`, and `job_num`.
     If only `run_name` is specified, returns metrics of `(replica_num=0, job_num=0)`.
 
+    By default, returns the latest values. If `after` and/or `before` are specified,
+    returns up to `limit` latest values in the time range. Time ranges older than
+    the points retention are answered with 1m or 10m aggregates.
+
     Supported metrics: [
         "cpu_usage_percent",
         "memory_usage_bytes",
@@ -48,4 +56,7 @@ async def get_job_metrics(
         run_name=run_name,
         replica_num=replica_num,
         job_num=job_num,
+        after=after,
+        before=before,
+        limit=limit,
     )
@@ -52,6 +52,14 @@ async def list_runs(
 
     The results are paginated. To get the next page, pass `submitted_at` and `id` of
     the last run from the previous page as `prev_submitted_at` and `prev_run_id`.
+
+    If `changed_after` is specified, returns only runs that were updated, or whose jobs
+    were updated, since then. Runs that became finished or deleted are returned too
+    unless excluded by other filters, so watching clients can update their lists.
+
+    `projection` limits how much of each run is returned: `full` (default) returns all job
+    submissions, `latest_submission` returns only the latest submission of each job,
+    and `summary` returns no jobs. Run `cost` only includes the returned submissions.
     """
     return await runs.list_user_runs(
         session=session,
@@ -64,6 +72,8 @@ async def list_runs(
         prev_run_id=body.prev_run_id,
         limit=body.limit,
         ascending=body.ascending,
+        changed_after=body.changed_after,
+        projection=body.projection,
     )
 
 
@@ -15,6 +15,7 @@ class ListFleetsRequest(CoreModel):
     prev_id: Optional[UUID]
     limit: int = Field(100, ge=0, le=100)
     ascending: bool = False
+    changed_after: Optional[datetime] = None
 
 
 class GetFleetRequest(CoreModel):
@@ -13,3 +13,4 @@ class ListInstancesRequest(CoreModel):
     prev_id: Optional[UUID] = None
     limit: int = 1000
     ascending: bool = False
+    changed_after: Optional[datetime] = None
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Annotated, List, Optional
 from uuid import UUID
 
@@ -10,6 +11,15 @@ from dstack._internal.core.models.profiles import Profile
 from dstack._internal.core.models.runs import ApplyRunPlanInput, Requirements, RunSpec
 
 
+class RunsListProjection(str, Enum):
+    # All jobs with all submissions
+    FULL = "full"
+    # All jobs with their latest submissions only
+    LATEST_SUBMISSION = "latest_submission"
+    # No jobs
+    SUMMARY = "summary"
+
+
 class ListRunsRequest(CoreModel):
     project_name: Optional[str]
     repo_id: Optional[str]
@@ -19,6 +29,8 @@ class ListRunsRequest(CoreModel):
     prev_run_id: Optional[UUID]
     limit: int = Field(100, ge=0, le=100)
     ascending: bool = False
+    changed_after: Optional[datetime] = None
+    projection: RunsListProjection = RunsListProjection.FULL
 
 
 class GetRunRequest(CoreModel):
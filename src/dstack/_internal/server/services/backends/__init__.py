@@ -28,7 +28,8 @@ from dstack._internal.core.models.runs import Requirements
 from dstack._internal.server.models import BackendModel, ProjectModel
 from dstack._internal.server.services.backends.configurators.base import Configurator
 from dstack._internal.server.settings import LOCAL_BACKEND_ENABLED
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.cache import CacheStats
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -165,7 +166,7 @@ async def get_backend_config_values(
     configurator = get_configurator(config.type)
     if configurator is None:
         raise BackendNotAvailable()
-    config_values = await run_async(configurator.get_config_values, config)
+    config_values = await cloud_api_executor.run(configurator.get_config_values, config)
     return config_values
 
 
@@ -180,8 +181,10 @@ async def create_backend(
     backend = await get_project_backend_by_type(project=project, backend_type=configurator.TYPE)
     if backend is not None:
         raise ResourceExistsError()
-    await run_async(configurator.get_config_values, config)
-    backend = await run_async(configurator.create_backend, project=project, config=config)
+    await cloud_api_executor.run(configurator.get_config_values, config)
+    backend = await cloud_api_executor.run(
+        configurator.create_backend, project=project, config=config
+    )
     session.add(backend)
     await session.commit()
     return config
@@ -198,8 +201,10 @@ async def update_backend(
     backend_exists = any(configurator.TYPE == b.type for b in project.backends)
     if not backend_exists:
         raise ServerClientError("Backend does not exist")
-    await run_async(configurator.get_config_values, config)
-    backend = await run_async(configurator.create_backend, project=project, config=config)
+    await cloud_api_executor.run(configurator.get_config_values, config)
+    backend = await cloud_api_executor.run(
+        configurator.create_backend, project=project, config=config
+    )
     # FIXME: potentially long write transaction
     await session.execute(
         update(BackendModel)
@@ -299,7 +304,7 @@ async def get_project_backends_with_models(project: ProjectModel) -> List[Backen
                 )
                 continue
             try:
-                backend = await run_async(configurator.get_backend, backend_model)
+                backend = await cloud_api_executor.run(configurator.get_backend, backend_model)
             except BackendInvalidCredentialsError:
                 logger.warning(
                     "Credentials for %s backend are invalid. Backend will be ignored.",
@@ -311,6 +316,28 @@ async def get_project_backends_with_models(project: ProjectModel) -> List[Backen
     return backends
 
 
+def log_offers_cache_stats() -> None:
+    backend_type_to_stats: Dict[BackendType, CacheStats] = {}
+    for project_backends in _BACKENDS_CACHE.values():
+        for backend_type, (_, backend) in project_backends.items():
+            backend_type_to_stats[backend_type] = (
+                backend_type_to_stats.get(backend_type, CacheStats())
+                + backend.compute().get_offers_cache_stats()
+            )
+    for backend_type, stats in backend_type_to_stats.items():
+        logger.debug(
+            "The %s offers cache: %s hits, %s stale hits, %s misses, %s coalesced misses,"
+            " %s load errors, %s entries",
+            backend_type.value,
+            stats.hits,
+            stats.stale_hits,
+            stats.misses,
+            stats.coalesced,
+            stats.load_errors,
+            stats.size,
+        )
+
+
 _get_project_backend_with_model_by_type = None
 
 
@@ -421,7 +448,10 @@ async def get_instance_offers(
     Returns list of instances satisfying minimal resource requirements sorted by price
     """
     logger.info("Requesting instance offers from backends: %s", [b.TYPE.value for b in backends])
-    tasks = [run_async(backend.compute().get_offers_cached, requirements) for backend in backends]
+    tasks = [
+        cloud_api_executor.run(backend.compute().get_offers_cached, requirements)
+        for backend in backends
+    ]
     offers_by_backend = []
     for backend, result in zip(backends, await asyncio.gather(*tasks, return_exceptions=True)):
         if isinstance(result, BackendError):
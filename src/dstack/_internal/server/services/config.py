@@ -36,7 +36,7 @@ from dstack._internal.server.services.permissions import (
     DefaultPermissions,
     set_default_permissions,
 )
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -658,7 +658,7 @@ class ServerConfigManager:
             configurator = backends_services.get_configurator(backend_type)
             if configurator is None:
                 continue
-            config_infos = await run_async(configurator.get_default_configs)
+            config_infos = await cloud_api_executor.run(configurator.get_default_configs)
             for config_info in config_infos:
                 try:
                     await backends_services.create_backend(
@@ -41,7 +41,7 @@ from dstack._internal.core.models.profiles import (
     SpotPolicy,
 )
 from dstack._internal.core.models.resources import ResourcesSpec
-from dstack._internal.core.models.runs import Requirements, get_policy_map
+from dstack._internal.core.models.runs import JobProvisioningData, Requirements, get_policy_map
 from dstack._internal.core.models.users import GlobalRole
 from dstack._internal.core.services import validate_dstack_resource_name
 from dstack._internal.core.services.profiles import get_termination
@@ -83,6 +83,7 @@ async def list_fleets(
     prev_id: Optional[uuid.UUID],
     limit: int,
     ascending: bool,
+    changed_after: Optional[datetime] = None,
 ) -> List[Fleet]:
     if user.global_role == GlobalRole.ADMIN:
         projects = await list_project_models(session=session)
@@ -98,6 +99,7 @@ async def list_fleets(
         prev_id=prev_id,
         limit=limit,
         ascending=ascending,
+        changed_after=changed_after,
     )
     return [
         fleet_model_to_fleet(v, include_deleted_instances=not only_active) for v in fleet_models
@@ -112,11 +114,19 @@ async def list_projects_fleet_models(
     prev_id: Optional[uuid.UUID],
     limit: int,
     ascending: bool,
+    changed_after: Optional[datetime] = None,
 ) -> List[FleetModel]:
     filters = []
     filters.append(FleetModel.project_id.in_(p.id for p in projects))
     if only_active:
         filters.append(FleetModel.deleted == False)
+    if changed_after is not None:
+        filters.append(
+            or_(
+                FleetModel.last_processed_at >= changed_after,
+                FleetModel.instances.any(InstanceModel.last_processed_at >= changed_after),
+            )
+        )
     if prev_created_at is not None:
         if ascending:
             if prev_id is None:
@@ -282,9 +292,13 @@ async def get_create_instance_offers(
     fleet_model: Optional[FleetModel] = None,
     blocks: Union[int, Literal["auto"]] = 1,
     exclude_not_available: bool = False,
+    master_job_provisioning_data: Optional[JobProvisioningData] = None,
 ) -> List[Tuple[Backend, InstanceOfferWithAvailability]]:
+    """
+    Pass `fleet_spec` and `master_job_provisioning_data` instead of `fleet_model`
+    to avoid loading all fleet instances.
+    """
     multinode = False
-    master_job_provisioning_data = None
     if fleet_spec is not None:
         multinode = fleet_spec.configuration.placement == InstanceGroupPlacement.CLUSTER
     if fleet_model is not None:
@@ -49,8 +49,9 @@ from dstack._internal.server.services.locking import (
     string_to_lock_id,
 )
 from dstack._internal.server.utils.common import gather_map_async
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
 from dstack._internal.utils.crypto import generate_rsa_key_pair_bytes
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -105,7 +106,7 @@ async def create_gateway_compute(
         certificate=configuration.certificate,
     )
 
-    gpd = await run_async(
+    gpd = await cloud_api_executor.run(
         backend_compute.create_gateway,
         compute_configuration,
     )
@@ -234,7 +235,7 @@ async def delete_gateways(
             ):
                 logger.info("Deleting gateway compute for %s...", gateway_model.name)
                 try:
-                    await run_async(
+                    await cloud_api_executor.run(
                         backend.compute().terminate_gateway,
                         gateway_model.gateway_compute.instance_id,
                         gateway_compute_configuration,
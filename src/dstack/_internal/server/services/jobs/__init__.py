@@ -57,8 +57,10 @@ from dstack._internal.server.services.volumes import (
     list_project_volume_models,
     volume_model_to_volume,
 )
+from dstack._internal.server.utils.parsing import parse_raw_cached
 from dstack._internal.utils import common
-from dstack._internal.utils.common import get_or_error, run_async
+from dstack._internal.utils.common import get_or_error
+from dstack._internal.utils.executors import cloud_api_executor, ssh_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -110,8 +112,10 @@ def job_model_to_job_submission(job_model: JobModel) -> JobSubmission:
     job_provisioning_data = get_job_provisioning_data(job_model)
     if job_provisioning_data is not None:
         # TODO remove after transitioning to computed fields
-        job_provisioning_data.instance_type.resources.description = (
-            job_provisioning_data.instance_type.resources.pretty_format()
+        # Nested models are copied since parsed provisioning data is shared
+        resources = job_provisioning_data.instance_type.resources
+        job_provisioning_data.instance_type = job_provisioning_data.instance_type.copy(
+            update={"resources": resources.copy(update={"description": resources.pretty_format()})}
         )
         # TODO do we really still need this magic? See https://github.com/dstackai/dstack/pull/1682
         # i.e., replacing `jpd.backend` with `jpd.get_base_backend()` should give the same result
@@ -143,7 +147,7 @@ def job_model_to_job_submission(job_model: JobModel) -> JobSubmission:
 def get_job_provisioning_data(job_model: JobModel) -> Optional[JobProvisioningData]:
     if job_model.job_provisioning_data is None:
         return None
-    return JobProvisioningData.__response__.parse_raw(job_model.job_provisioning_data)
+    return parse_raw_cached(JobProvisioningData.__response__, job_model.job_provisioning_data)
 
 
 def get_job_runtime_data(job_model: JobModel) -> Optional[JobRuntimeData]:
@@ -187,7 +191,7 @@ async def stop_runner(session: AsyncSession, job_model: JobModel):
         jpd = get_job_provisioning_data(job_model)
         if jpd is not None:
             jrd = get_job_runtime_data(job_model)
-            await run_async(_stop_runner, ssh_private_keys, jpd, jrd, job_model)
+            await ssh_executor.run(_stop_runner, ssh_private_keys, jpd, jrd, job_model)
     except SSHError:
         logger.debug("%s: failed to stop runner", fmt(job_model))
 
@@ -345,7 +349,7 @@ async def stop_container(
     if job_provisioning_data.dockerized:
         # send a request to the shim to terminate the docker container
         # SSHError and RequestException are caught in the `runner_ssh_tunner` decorator
-        await run_async(
+        await ssh_executor.run(
             _shim_submit_stop,
             ssh_private_keys,
             job_provisioning_data,
@@ -461,20 +465,20 @@ async def _detach_volume_from_job_instance(
     try:
         if job_model.volumes_detached_at is None:
             # We haven't tried detaching volumes yet, try soft detach first
-            await run_async(
+            await cloud_api_executor.run(
                 backend.compute().detach_volume,
                 volume=volume,
                 instance_id=jpd.instance_id,
                 force=False,
             )
             # For some backends, the volume may be detached immediately
-            detached = await run_async(
+            detached = await cloud_api_executor.run(
                 backend.compute().is_volume_detached,
                 volume=volume,
                 instance_id=jpd.instance_id,
             )
         else:
-            detached = await run_async(
+            detached = await cloud_api_executor.run(
                 backend.compute().is_volume_detached,
                 volume=volume,
                 instance_id=jpd.instance_id,
@@ -485,7 +489,7 @@ async def _detach_volume_from_job_instance(
                     volume_model.name,
                     instance_model.name,
                 )
-                await run_async(
+                await cloud_api_executor.run(
                     backend.compute().detach_volume,
                     volume=volume,
                     instance_id=jpd.instance_id,
@@ -526,16 +530,22 @@ def _should_force_detach_volume(job_model: JobModel, stop_duration: Optional[int
     )
 
 
-async def get_instances_ids_with_detaching_volumes(session: AsyncSession) -> List[UUID]:
-    res = await session.execute(
-        select(JobModel).where(
-            JobModel.status == JobStatus.TERMINATING,
-            JobModel.used_instance_id.is_not(None),
-            JobModel.volumes_detached_at.is_not(None),
-        )
+async def get_instances_ids_with_detaching_volumes(
+    session: AsyncSession, instances_ids: Optional[Iterable[UUID]] = None
+) -> List[UUID]:
+    """
+    Returns ids of instances with volumes being detached.
+    If `instances_ids` is specified, only these instances are checked.
+    """
+    query = select(JobModel.used_instance_id).where(
+        JobModel.status == JobStatus.TERMINATING,
+        JobModel.used_instance_id.is_not(None),
+        JobModel.volumes_detached_at.is_not(None),
     )
-    job_models = res.scalars().all()
-    return [jm.used_instance_id for jm in job_models if jm.used_instance_id]
+    if instances_ids is not None:
+        query = query.where(JobModel.used_instance_id.in_(instances_ids))
+    res = await session.execute(query.distinct())
+    return [instance_id for instance_id in res.scalars().all() if instance_id is not None]
 
 
 async def get_job_configured_volumes(
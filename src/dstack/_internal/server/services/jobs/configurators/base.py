@@ -26,7 +26,7 @@ from dstack._internal.core.models.volumes import MountPoint, VolumeMountPoint
 from dstack._internal.core.services.profiles import get_retry
 from dstack._internal.core.services.ssh.ports import filter_reserved_ports
 from dstack._internal.server.services.docker import ImageConfig, get_image_config
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.interpolator import InterpolatorError, VariablesInterpolator
 
 
@@ -84,7 +84,7 @@ class JobConfigurator(ABC):
     async def _get_image_config(self) -> ImageConfig:
         if self._image_config is not None:
             return self._image_config
-        image_config = await run_async(
+        image_config = await cloud_api_executor.run(
             _get_image_config,
             self._image_name(),
             self.run_spec.configuration.registry_auth,
@@ -271,12 +271,13 @@ def interpolate_job_volumes(
 
 
 def _join_shell_commands(commands: List[str]) -> str:
-    for i, cmd in enumerate(commands):
+    escaped_commands = []
+    for cmd in commands:
         cmd = cmd.strip()
         if cmd.endswith("&"):  # escape background command
             cmd = "{ %s }" % cmd
-        commands[i] = cmd
-    return " && ".join(commands)
+        escaped_commands.append(cmd)
+    return " && ".join(escaped_commands)
 
 
 @cached(TTLCache(maxsize=2048, ttl=80))
@@ -1,23 +1,38 @@
+import asyncio
 import atexit
-from typing import List, Optional
+import threading
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
-from dstack._internal.core.models.logs import JobSubmissionLogs
+from sqlalchemy import select
+
+from dstack._internal.core.models.logs import JobSubmissionLogs, LogEvent
 from dstack._internal.server import settings
-from dstack._internal.server.models import ProjectModel
+from dstack._internal.server.db import get_session_ctx
+from dstack._internal.server.models import JobModel, ProjectModel
 from dstack._internal.server.schemas.logs import PollLogsRequest
 from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
 from dstack._internal.server.services.logs.aws import BOTO_AVAILABLE, CloudWatchLogStorage
 from dstack._internal.server.services.logs.base import LogStorage, LogStorageError
 from dstack._internal.server.services.logs.filelog import FileLogStorage
 from dstack._internal.server.services.logs.gcp import GCP_LOGGING_AVAILABLE, GCPLogStorage
-from dstack._internal.utils.common import run_async
+from dstack._internal.server.services.logs.writer import BufferedLogWriter
+from dstack._internal.utils.executors import storage_io_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Streams poll the log storage when notified about written logs or every LOG_STREAM_POLL_INTERVAL
+LOG_STREAM_POLL_INTERVAL = 1
+LOG_STREAM_JOB_STATUS_CHECK_INTERVAL = 5
+# Streams of finished jobs end after no logs have been written for this long
+LOG_STREAM_FINISHED_JOB_GRACE_PERIOD = 5
+LOG_STREAM_KEEPALIVE_INTERVAL = 15
 
 _log_storage: Optional[LogStorage] = None
+_log_writer: Optional[BufferedLogWriter] = None
 
 
 def get_log_storage() -> LogStorage:
@@ -58,6 +73,16 @@ def get_log_storage() -> LogStorage:
     return _log_storage
 
 
+def get_log_writer() -> BufferedLogWriter:
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = BufferedLogWriter(
+            storage=get_log_storage(),
+            max_buffered_events=settings.SERVER_LOG_WRITE_BUFFER_MAX_EVENTS,
+        )
+    return _log_writer
+
+
 def write_logs(
     project: ProjectModel,
     run_name: str,
@@ -65,14 +90,137 @@ def write_logs(
     runner_logs: List[RunnerLogEvent],
     job_logs: List[RunnerLogEvent],
 ) -> None:
-    return get_log_storage().write_logs(
+    """
+    Writes logs to the log storage or, if buffered writes are enabled, to the buffer
+    that is flushed periodically by `flush_logs()`.
+    """
+    if settings.SERVER_LOG_WRITE_BUFFER_ENABLED:
+        return get_log_writer().write_logs(
+            project=project,
+            run_name=run_name,
+            job_submission_id=job_submission_id,
+            runner_logs=runner_logs,
+            job_logs=job_logs,
+        )
+    get_log_storage().write_logs(
         project=project,
         run_name=run_name,
         job_submission_id=job_submission_id,
         runner_logs=runner_logs,
         job_logs=job_logs,
     )
+    if len(runner_logs) > 0 or len(job_logs) > 0:
+        _notify_log_waiters([job_submission_id])
 
 
 async def poll_logs_async(project: ProjectModel, request: PollLogsRequest) -> JobSubmissionLogs:
-    return await run_async(get_log_storage().poll_logs, project=project, request=request)
+    return await storage_io_executor.run(
+        get_log_storage().poll_logs, project=project, request=request
+    )
+
+
+async def flush_logs() -> None:
+    if _log_writer is not None and len(_log_writer) > 0:
+        await storage_io_executor.run(_log_writer.flush)
+        _notify_log_waiters()
+
+
+async def stream_logs(
+    project: ProjectModel, request: PollLogsRequest
+) -> AsyncIterator[List[LogEvent]]:
+    """
+    Yields new logs as they are written, starting after `request.start_time`,
+    until the job submission finishes. Yields an empty list every
+    LOG_STREAM_KEEPALIVE_INTERVAL seconds if there are no new logs.
+
+    The log storage is polled when logs of the job submission are written by this replica,
+    or every LOG_STREAM_POLL_INTERVAL seconds to pick up logs written by other replicas.
+    """
+    request = request.copy(update={"descending": False})
+    now = time.monotonic()
+    last_yielded_at = now
+    last_checked_at = now - LOG_STREAM_JOB_STATUS_CHECK_INTERVAL
+    finished_at: Optional[float] = None
+    while True:
+        # Subscribe before polling to not miss logs written in between
+        written = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), written)
+        _add_log_waiter(request.job_submission_id, waiter)
+        try:
+            resp = await poll_logs_async(project=project, request=request)
+            now = time.monotonic()
+            if len(resp.logs) > 0:
+                request.start_time = resp.logs[-1].timestamp
+                last_yielded_at = now
+                if finished_at is not None:
+                    finished_at = now
+                yield resp.logs
+                continue
+            if finished_at is not None:
+                if now - finished_at > LOG_STREAM_FINISHED_JOB_GRACE_PERIOD:
+                    return
+            elif now - last_checked_at >= LOG_STREAM_JOB_STATUS_CHECK_INTERVAL:
+                last_checked_at = now
+                if await _is_job_submission_finished(project, request.job_submission_id):
+                    finished_at = now
+            if now - last_yielded_at >= LOG_STREAM_KEEPALIVE_INTERVAL:
+                last_yielded_at = now
+                yield []
+            try:
+                await asyncio.wait_for(written.wait(), timeout=LOG_STREAM_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            _remove_log_waiter(request.job_submission_id, waiter)
+
+
+async def _is_job_submission_finished(project: ProjectModel, job_submission_id: UUID) -> bool:
+    async with get_session_ctx() as session:
+        res = await session.execute(
+            select(JobModel.status).where(
+                JobModel.id == job_submission_id,
+                JobModel.project_id == project.id,
+            )
+        )
+        status = res.scalar()
+    # Unknown job submissions have no logs to wait for
+    return status is None or status.is_finished()
+
+
+_LogWaiter = Tuple[asyncio.AbstractEventLoop, asyncio.Event]
+
+_log_waiters: Dict[UUID, Set[_LogWaiter]] = defaultdict(set)
+# Logs are written from worker threads
+_log_waiters_lock = threading.Lock()
+
+
+def _add_log_waiter(job_submission_id: UUID, waiter: _LogWaiter) -> None:
+    with _log_waiters_lock:
+        _log_waiters[job_submission_id].add(waiter)
+
+
+def _remove_log_waiter(job_submission_id: UUID, waiter: _LogWaiter) -> None:
+    with _log_waiters_lock:
+        waiters = _log_waiters.get(job_submission_id)
+        if waiters is None:
+            return
+        waiters.discard(waiter)
+        if not waiters:
+            del _log_waiters[job_submission_id]
+
+
+def _notify_log_waiters(job_submission_ids: Optional[Iterable[UUID]] = None) -> None:
+    """
+    Wakes up streams of the job submissions or of all job submissions if `None`.
+    Thread-safe.
+    """
+    with _log_waiters_lock:
+        if job_submission_ids is None:
+            waiters = [w for ws in _log_waiters.values() for w in ws]
+        else:
+            waiters = [w for id in job_submission_ids for w in _log_waiters.get(id, ())]
+    for loop, written in waiters:
+        try:
+            loop.call_soon_threadsafe(written.set)
+        except RuntimeError:
+            pass  # the loop is closed
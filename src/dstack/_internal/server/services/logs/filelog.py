@@ -1,5 +1,10 @@
+import base64
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from enum import Enum
 from pathlib import Path
-from typing import List, Union
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
 from uuid import UUID
 
 from dstack._internal.core.models.logs import (
@@ -14,22 +19,74 @@ from dstack._internal.server.schemas.logs import PollLogsRequest
 from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
 from dstack._internal.server.services.logs.base import (
     LogStorage,
+    LogStorageError,
     b64encode_raw_message,
     unix_time_ms_to_datetime,
 )
+from dstack._internal.utils.logging import get_logger
+
+ZSTD_AVAILABLE = True
+try:
+    import zstandard
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+logger = get_logger(__name__)
+
+# Log files have a sidecar index of (timestamp, byte offset) entries, one per
+# INDEX_INTERVAL_BYTES of logs, to seek to log events by time without reading the whole file.
+INDEX_INTERVAL_BYTES = 64 * 1024
+_INDEX_ENTRY = struct.Struct("<qq")
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Binary log files consist of the magic followed by blocks of records.
+# Block: header (flags, payload size), payload, trailer (payload size) to read blocks backwards.
+# Payload, optionally zstd-compressed: records of (timestamp in ms, message size, message).
+_BINARY_LOG_MAGIC = b"DSTKLOG1"
+_BLOCK_HEADER = struct.Struct("<BI")
+_BLOCK_TRAILER = struct.Struct("<I")
+_BLOCK_FLAG_ZSTD = 1
+_BLOCK_SIZE = 64 * 1024
+_RECORD_HEADER = struct.Struct("<qI")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class FileLogFormat(str, Enum):
+    # JSON lines of `LogEvent`
+    JSON = "json"
+    # Length-prefixed binary records with raw messages
+    BINARY = "binary"
 
 
 class FileLogStorage(LogStorage):
     root: Path
 
-    def __init__(self, root: Union[Path, str, None] = None) -> None:
+    def __init__(
+        self,
+        root: Union[Path, str, None] = None,
+        log_format: Optional[FileLogFormat] = None,
+        compress: bool = settings.SERVER_FILE_LOG_COMPRESSION,
+    ) -> None:
         if root is None:
             self.root = settings.SERVER_DIR_PATH
         else:
             self.root = Path(root)
+        if log_format is None:
+            try:
+                log_format = FileLogFormat(settings.SERVER_FILE_LOG_FORMAT)
+            except ValueError:
+                raise LogStorageError(
+                    f"Invalid DSTACK_SERVER_FILE_LOG_FORMAT {settings.SERVER_FILE_LOG_FORMAT!r}."
+                    f" Allowed values: {', '.join(f.value for f in FileLogFormat)}"
+                )
+        self.log_format = log_format
+        self.compress = compress
+        if self.compress and not ZSTD_AVAILABLE:
+            logger.warning("Cannot compress logs: zstandard is not installed")
+            self.compress = False
 
     def poll_logs(self, project: ProjectModel, request: PollLogsRequest) -> JobSubmissionLogs:
-        # TODO Respect request.limit to support pagination
         log_producer = LogProducer.RUNNER if request.diagnose else LogProducer.JOB
         log_file_path = self._get_log_file_path(
             project_name=project.name,
@@ -37,23 +94,70 @@ class FileLogStorage(LogStorage):
             job_submission_id=request.job_submission_id,
             producer=log_producer,
         )
-        logs = []
+        binary_log_file_path = _get_binary_log_file_path(log_file_path)
         try:
-            with open(log_file_path) as f:
-                for line in f:
-                    log_event = LogEvent.__response__.parse_raw(line)
-                    if request.start_time and log_event.timestamp <= request.start_time:
-                        continue
-                    if request.end_time is None or log_event.timestamp < request.end_time:
-                        logs.append(log_event)
-                    else:
-                        break
+            if binary_log_file_path.exists():
+                if request.descending:
+                    logs = _poll_binary_logs_descending(binary_log_file_path, request)
+                else:
+                    logs = _poll_binary_logs_ascending(binary_log_file_path, request)
+            elif request.descending:
+                logs = self._poll_logs_descending(log_file_path, request)
+            else:
+                logs = self._poll_logs_ascending(log_file_path, request)
         except IOError:
-            pass
-        if request.descending:
-            logs = list(reversed(logs))
+            logs = []
         return JobSubmissionLogs(logs=logs)
 
+    def _poll_logs_ascending(
+        self, log_file_path: Path, request: PollLogsRequest
+    ) -> List[LogEvent]:
+        offset = 0
+        if request.start_time is not None:
+            offset = _find_start_offset(
+                _get_index_file_path(log_file_path),
+                _datetime_to_unix_time_us(request.start_time) // 1000,
+            )
+        logs = []
+        with open(log_file_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if len(logs) >= request.limit:
+                    break
+                if not line.endswith(b"\n"):
+                    break  # the line is being written
+                log_event = LogEvent.__response__.parse_raw(line)
+                if request.start_time and log_event.timestamp <= request.start_time:
+                    continue
+                if request.end_time is not None and log_event.timestamp >= request.end_time:
+                    break
+                logs.append(log_event)
+        return logs
+
+    def _poll_logs_descending(
+        self, log_file_path: Path, request: PollLogsRequest
+    ) -> List[LogEvent]:
+        end_offset = None
+        if request.end_time is not None:
+            end_offset = _find_end_offset(
+                _get_index_file_path(log_file_path),
+                _datetime_to_unix_time_us(request.end_time) // 1000,
+            )
+        logs = []
+        with open(log_file_path, "rb") as f:
+            if end_offset is None:
+                end_offset = f.seek(0, os.SEEK_END)
+            for line in _read_lines_reversed(f, end_offset):
+                if len(logs) >= request.limit:
+                    break
+                log_event = LogEvent.__response__.parse_raw(line)
+                if request.end_time is not None and log_event.timestamp >= request.end_time:
+                    continue
+                if request.start_time and log_event.timestamp <= request.start_time:
+                    break
+                logs.append(log_event)
+        return logs
+
     def write_logs(
         self,
         project: ProjectModel,
@@ -80,10 +184,36 @@ class FileLogStorage(LogStorage):
             )
 
     def _write_logs(self, log_file_path: Path, log_events: List[RunnerLogEvent]) -> None:
-        log_events_parsed = [self._runner_log_event_to_log_event(event) for event in log_events]
         log_file_path.parent.mkdir(exist_ok=True, parents=True)
-        with open(log_file_path, "a") as f:
-            f.writelines(log.json() + "\n" for log in log_events_parsed)
+        # Logs are appended in the format they were started in, regardless of the current
+        # format, so that they are not split between files
+        binary_log_file_path = _get_binary_log_file_path(log_file_path)
+        if binary_log_file_path.exists() or (
+            self.log_format == FileLogFormat.BINARY and not log_file_path.exists()
+        ):
+            _write_binary_logs(binary_log_file_path, log_events, compress=self.compress)
+            return
+        index_file_path = _get_index_file_path(log_file_path)
+        last_indexed_offset = _get_last_indexed_offset(index_file_path)
+        lines = []
+        index_entries = []
+        with open(log_file_path, "ab") as f:
+            offset = f.tell()
+            for event in log_events:
+                if (
+                    last_indexed_offset is None
+                    or offset - last_indexed_offset >= INDEX_INTERVAL_BYTES
+                ):
+                    index_entries.append(_INDEX_ENTRY.pack(event.timestamp, offset))
+                    last_indexed_offset = offset
+                line = (_runner_log_event_to_log_event(event).json() + "\n").encode()
+                lines.append(line)
+                offset += len(line)
+            f.writelines(lines)
+        # The index is written after the logs so that it never points past the written data
+        if index_entries:
+            with open(index_file_path, "ab") as f:
+                f.writelines(index_entries)
 
     def _get_log_file_path(
         self,
@@ -102,9 +232,340 @@ class FileLogStorage(LogStorage):
             / f"{producer.value}.log"
         )
 
-    def _runner_log_event_to_log_event(self, runner_log_event: RunnerLogEvent) -> LogEvent:
-        return LogEvent(
-            timestamp=unix_time_ms_to_datetime(runner_log_event.timestamp),
-            log_source=LogEventSource.STDOUT,
-            message=b64encode_raw_message(runner_log_event.message),
+
+def convert_log_file_to_binary(log_file_path: Path, compress: bool = False) -> Path:
+    """
+    Converts a JSON lines log file to the binary format and removes it.
+    Must not be used for logs that are being written.
+
+    Returns:
+        The path to the binary log file.
+    """
+    binary_log_file_path = _get_binary_log_file_path(log_file_path)
+    if binary_log_file_path.exists():
+        raise LogStorageError(f"{binary_log_file_path} already exists")
+    tmp_file_path = binary_log_file_path.with_name(binary_log_file_path.name + ".tmp")
+    tmp_file_path.unlink(missing_ok=True)
+    _get_index_file_path(tmp_file_path).unlink(missing_ok=True)
+    with open(log_file_path, "rb") as f:
+        log_events = []
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            log_event = LogEvent.__response__.parse_raw(line)
+            log_events.append(
+                RunnerLogEvent(
+                    timestamp=_datetime_to_unix_time_us(log_event.timestamp) // 1000,
+                    message=base64.b64decode(log_event.message),
+                )
+            )
+            if len(log_events) >= 10000:
+                _write_binary_logs(tmp_file_path, log_events, compress=compress)
+                log_events = []
+        if log_events:
+            _write_binary_logs(tmp_file_path, log_events, compress=compress)
+    if tmp_file_path.exists():
+        # The index is moved first so that a binary log file always has a complete index
+        _get_index_file_path(tmp_file_path).replace(_get_index_file_path(binary_log_file_path))
+        tmp_file_path.replace(binary_log_file_path)
+    else:
+        binary_log_file_path.write_bytes(_BINARY_LOG_MAGIC)
+    log_file_path.unlink()
+    _get_index_file_path(log_file_path).unlink(missing_ok=True)
+    return binary_log_file_path
+
+
+def _runner_log_event_to_log_event(runner_log_event: RunnerLogEvent) -> LogEvent:
+    return LogEvent(
+        timestamp=unix_time_ms_to_datetime(runner_log_event.timestamp),
+        log_source=LogEventSource.STDOUT,
+        message=b64encode_raw_message(runner_log_event.message),
+    )
+
+
+def _datetime_to_unix_time_us(dt: datetime) -> int:
+    # Unlike dt.timestamp(), exact
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _get_binary_log_file_path(log_file_path: Path) -> Path:
+    return log_file_path.with_suffix(".bin")
+
+
+def _get_index_file_path(log_file_path: Path) -> Path:
+    return log_file_path.with_name(log_file_path.name + ".idx")
+
+
+def _get_last_indexed_offset(index_file_path: Path) -> Optional[int]:
+    try:
+        with open(index_file_path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < _INDEX_ENTRY.size:
+                return None
+            f.seek(size - size % _INDEX_ENTRY.size - _INDEX_ENTRY.size)
+            return _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))[1]
+    except IOError:
+        return None
+
+
+def _find_start_offset(index_file_path: Path, start_time_ms: int) -> int:
+    """
+    Returns an offset such that all log events before it have timestamps <= `start_time_ms`.
+    """
+    try:
+        with open(index_file_path, "rb") as f:
+            i = _bisect_index(f, start_time_ms)
+            if i == 0:
+                return 0
+            return _read_index_entry(f, i - 1)[1]
+    except IOError:
+        return 0
+
+
+def _find_end_offset(index_file_path: Path, end_time_ms: int) -> Optional[int]:
+    """
+    Returns an offset such that all log events after it have timestamps > `end_time_ms`
+    or `None` if there is no such offset in the index.
+    """
+    try:
+        with open(index_file_path, "rb") as f:
+            i = _bisect_index(f, end_time_ms)
+            if i == _get_index_len(f):
+                return None
+            return _read_index_entry(f, i)[1]
+    except IOError:
+        return None
+
+
+def _bisect_index(f: BinaryIO, timestamp_ms: int) -> int:
+    """
+    Returns the number of index entries with timestamps <= `timestamp_ms`.
+    Seeks the index file instead of reading it so that it's O(log n) regardless of the log size.
+    """
+    lo, hi = 0, _get_index_len(f)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _read_index_entry(f, mid)[0] <= timestamp_ms:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _get_index_len(f: BinaryIO) -> int:
+    return f.seek(0, os.SEEK_END) // _INDEX_ENTRY.size
+
+
+def _read_index_entry(f: BinaryIO, i: int) -> Tuple[int, int]:
+    f.seek(i * _INDEX_ENTRY.size)
+    return _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))
+
+
+def _read_lines_reversed(f: BinaryIO, end_offset: int) -> Iterator[bytes]:
+    """
+    Yields complete lines before `end_offset` from last to first, reading the file backwards.
+    """
+    position = end_offset
+    buffer = b""
+    # Whether the end of `buffer` is the end of a line.
+    # False until the first newline is found since the last line may be being written.
+    complete = False
+    while position > 0:
+        size = min(_READ_CHUNK_SIZE, position)
+        position -= size
+        f.seek(position)
+        parts = (f.read(size) + buffer).split(b"\n")
+        buffer = parts[0]
+        if len(parts) == 1:
+            continue
+        if not complete:
+            parts.pop()
+            complete = True
+        for line in reversed(parts[1:]):
+            if line:
+                yield line
+    if complete and buffer:
+        yield buffer
+
+
+def _write_binary_logs(
+    log_file_path: Path, log_events: List[RunnerLogEvent], compress: bool
+) -> None:
+    index_file_path = _get_index_file_path(log_file_path)
+    last_indexed_offset = _get_last_indexed_offset(index_file_path)
+    chunks = []
+    index_entries = []
+    with open(log_file_path, "ab") as f:
+        offset = f.tell()
+        if offset == 0:
+            chunks.append(_BINARY_LOG_MAGIC)
+            offset += len(_BINARY_LOG_MAGIC)
+        for block_events in _split_into_blocks(log_events):
+            if last_indexed_offset is None or offset - last_indexed_offset >= INDEX_INTERVAL_BYTES:
+                index_entries.append(_INDEX_ENTRY.pack(block_events[0].timestamp, offset))
+                last_indexed_offset = offset
+            block = _encode_block(block_events, compress=compress)
+            chunks.append(block)
+            offset += len(block)
+        f.write(b"".join(chunks))
+    if index_entries:
+        with open(index_file_path, "ab") as f:
+            f.writelines(index_entries)
+
+
+def _split_into_blocks(log_events: List[RunnerLogEvent]) -> Iterator[List[RunnerLogEvent]]:
+    block_events = []
+    block_size = 0
+    for event in log_events:
+        block_events.append(event)
+        block_size += _RECORD_HEADER.size + len(event.message)
+        if block_size >= _BLOCK_SIZE:
+            yield block_events
+            block_events = []
+            block_size = 0
+    if block_events:
+        yield block_events
+
+
+def _encode_block(log_events: List[RunnerLogEvent], compress: bool) -> bytes:
+    payload = b"".join(
+        _RECORD_HEADER.pack(event.timestamp, len(event.message)) + event.message
+        for event in log_events
+    )
+    flags = 0
+    if compress:
+        payload = zstandard.ZstdCompressor().compress(payload)
+        flags |= _BLOCK_FLAG_ZSTD
+    return _BLOCK_HEADER.pack(flags, len(payload)) + payload + _BLOCK_TRAILER.pack(len(payload))
+
+
+def _decode_block(flags: int, payload: bytes) -> List[Tuple[int, bytes]]:
+    if flags & _BLOCK_FLAG_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise LogStorageError("Cannot read compressed logs: zstandard is not installed")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    records = []
+    position = 0
+    while position < len(payload):
+        timestamp, size = _RECORD_HEADER.unpack_from(payload, position)
+        position += _RECORD_HEADER.size
+        records.append((timestamp, payload[position : position + size]))
+        position += size
+    return records
+
+
+def _read_blocks(f: BinaryIO, file_size: int) -> Iterator[List[Tuple[int, bytes]]]:
+    """
+    Yields complete blocks starting from the current position.
+    """
+    position = f.tell()
+    while position + _BLOCK_HEADER.size <= file_size:
+        flags, payload_size = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+        if position + _get_block_size(payload_size) > file_size:
+            return  # the block is being written
+        payload = f.read(payload_size)
+        f.seek(_BLOCK_TRAILER.size, os.SEEK_CUR)
+        position += _get_block_size(payload_size)
+        yield _decode_block(flags, payload)
+
+
+def _read_blocks_reversed(f: BinaryIO, end_offset: int) -> Iterator[List[Tuple[int, bytes]]]:
+    """
+    Yields blocks before `end_offset` from last to first. `end_offset` must be a block boundary.
+    """
+    position = end_offset
+    while position > len(_BINARY_LOG_MAGIC):
+        f.seek(position - _BLOCK_TRAILER.size)
+        (payload_size,) = _BLOCK_TRAILER.unpack(f.read(_BLOCK_TRAILER.size))
+        position -= _get_block_size(payload_size)
+        f.seek(position)
+        flags, _ = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+        yield _decode_block(flags, f.read(payload_size))
+
+
+def _find_binary_log_end(f: BinaryIO, index_file_path: Path) -> int:
+    """
+    Returns the end of the last complete block. Skips blocks from the last indexed one
+    instead of trusting the last trailer since the last block may be being written.
+    """
+    file_size = f.seek(0, os.SEEK_END)
+    position = _get_last_indexed_offset(index_file_path) or len(_BINARY_LOG_MAGIC)
+    while position + _BLOCK_HEADER.size <= file_size:
+        f.seek(position)
+        _, payload_size = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+        if position + _get_block_size(payload_size) > file_size:
+            break
+        position += _get_block_size(payload_size)
+    return position
+
+
+def _get_block_size(payload_size: int) -> int:
+    return _BLOCK_HEADER.size + payload_size + _BLOCK_TRAILER.size
+
+
+def _check_binary_log_magic(f: BinaryIO) -> None:
+    if f.read(len(_BINARY_LOG_MAGIC)) != _BINARY_LOG_MAGIC:
+        raise LogStorageError(f"{f.name} is not a binary log file")
+
+
+def _poll_binary_logs_ascending(log_file_path: Path, request: PollLogsRequest) -> List[LogEvent]:
+    start_time_us = None
+    offset = len(_BINARY_LOG_MAGIC)
+    if request.start_time is not None:
+        start_time_us = _datetime_to_unix_time_us(request.start_time)
+        offset = max(
+            offset, _find_start_offset(_get_index_file_path(log_file_path), start_time_us // 1000)
         )
+    end_time_us = None
+    if request.end_time is not None:
+        end_time_us = _datetime_to_unix_time_us(request.end_time)
+    logs = []
+    with open(log_file_path, "rb") as f:
+        _check_binary_log_magic(f)
+        file_size = f.seek(0, os.SEEK_END)
+        f.seek(offset)
+        for records in _read_blocks(f, file_size):
+            for timestamp, message in records:
+                if len(logs) >= request.limit:
+                    return logs
+                if start_time_us is not None and timestamp * 1000 <= start_time_us:
+                    continue
+                if end_time_us is not None and timestamp * 1000 >= end_time_us:
+                    return logs
+                logs.append(
+                    _runner_log_event_to_log_event(
+                        RunnerLogEvent(timestamp=timestamp, message=message)
+                    )
+                )
+    return logs
+
+
+def _poll_binary_logs_descending(log_file_path: Path, request: PollLogsRequest) -> List[LogEvent]:
+    index_file_path = _get_index_file_path(log_file_path)
+    start_time_us = None
+    if request.start_time is not None:
+        start_time_us = _datetime_to_unix_time_us(request.start_time)
+    end_time_us = None
+    end_offset = None
+    if request.end_time is not None:
+        end_time_us = _datetime_to_unix_time_us(request.end_time)
+        end_offset = _find_end_offset(index_file_path, end_time_us // 1000)
+    logs = []
+    with open(log_file_path, "rb") as f:
+        _check_binary_log_magic(f)
+        if end_offset is None:
+            end_offset = _find_binary_log_end(f, index_file_path)
+        for records in _read_blocks_reversed(f, end_offset):
+            for timestamp, message in reversed(records):
+                if len(logs) >= request.limit:
+                    return logs
+                if end_time_us is not None and timestamp * 1000 >= end_time_us:
+                    continue
+                if start_time_us is not None and timestamp * 1000 <= start_time_us:
+                    return logs
+                logs.append(
+                    _runner_log_event_to_log_event(
+                        RunnerLogEvent(timestamp=timestamp, message=message)
+                    )
+                )
+    return logs
@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from uuid import UUID
+
+from dstack._internal.server.models import ProjectModel
+from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
+from dstack._internal.server.services.logs.base import LogStorage
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Logs of a job submission that failed to be written this many times are dropped
+MAX_WRITE_ATTEMPTS = 3
+
+
+@dataclass
+class _PendingLogs:
+    project: ProjectModel
+    run_name: str
+    job_submission_id: UUID
+    runner_logs: List[RunnerLogEvent] = field(default_factory=list)
+    job_logs: List[RunnerLogEvent] = field(default_factory=list)
+    failed_attempts: int = 0
+
+    def __len__(self) -> int:
+        return len(self.runner_logs) + len(self.job_logs)
+
+
+class BufferedLogWriter:
+    """
+    Buffers logs in memory and writes them to the log storage on `flush()`,
+    coalescing all buffered logs of a job submission into one `LogStorage.write_logs()` call.
+
+    If more than `max_buffered_events` events are buffered, `write_logs()` flushes
+    the buffer itself, so that writers slow down if the storage can't keep up.
+
+    Used from worker threads, hence threading locks.
+    """
+
+    def __init__(self, storage: LogStorage, max_buffered_events: int) -> None:
+        self.storage = storage
+        self.max_buffered_events = max_buffered_events
+        self._pending: OrderedDict[Tuple[str, str, UUID], _PendingLogs] = OrderedDict()
+        self._buffered_events = 0
+        self._lock = threading.Lock()
+        # Serializes flushes so that logs of a job submission are written in order
+        self._flush_lock = threading.Lock()
+
+    def write_logs(
+        self,
+        project: ProjectModel,
+        run_name: str,
+        job_submission_id: UUID,
+        runner_logs: List[RunnerLogEvent],
+        job_logs: List[RunnerLogEvent],
+    ) -> None:
+        if len(runner_logs) == 0 and len(job_logs) == 0:
+            return
+        key = (project.name, run_name, job_submission_id)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = _PendingLogs(
+                    project=project, run_name=run_name, job_submission_id=job_submission_id
+                )
+                self._pending[key] = pending
+            pending.runner_logs.extend(runner_logs)
+            pending.job_logs.extend(job_logs)
+            self._buffered_events += len(runner_logs) + len(job_logs)
+            is_full = self._buffered_events >= self.max_buffered_events
+        if is_full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                pending_logs = self._pending
+                self._pending = OrderedDict()
+                self._buffered_events = 0
+            failed: List[Tuple[Tuple[str, str, UUID], _PendingLogs]] = []
+            for key, pending in pending_logs.items():
+                try:
+                    self.storage.write_logs(
+                        project=pending.project,
+                        run_name=pending.run_name,
+                        job_submission_id=pending.job_submission_id,
+                        runner_logs=pending.runner_logs,
+                        job_logs=pending.job_logs,
+                    )
+                except Exception as e:
+                    pending.failed_attempts += 1
+                    if pending.failed_attempts >= MAX_WRITE_ATTEMPTS:
+                        logger.error(
+                            "Dropping %s log events of job submission %s: %r",
+                            len(pending),
+                            pending.job_submission_id,
+                            e,
+                        )
+                    else:
+                        logger.warning(
+                            "Failed to write logs of job submission %s, will retry: %r",
+                            pending.job_submission_id,
+                            e,
+                        )
+                        failed.append((key, pending))
+            if failed:
+                self._requeue(failed)
+
+    def __len__(self) -> int:
+        return self._buffered_events
+
+    def _requeue(self, failed: List[Tuple[Tuple[str, str, UUID], _PendingLogs]]) -> None:
+        # Failed logs go before the logs buffered during the flush to keep them in order
+        with self._lock:
+            pending_logs = OrderedDict(failed)
+            for key, pending in self._pending.items():
+                if key in pending_logs:
+                    pending_logs[key].runner_logs.extend(pending.runner_logs)
+                    pending_logs[key].job_logs.extend(pending.job_logs)
+                else:
+                    pending_logs[key] = pending
+            self._pending = pending_logs
+            self._buffered_events = sum(len(p) for p in pending_logs.values())
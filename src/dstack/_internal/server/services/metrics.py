@@ -1,13 +1,58 @@
+"""
+Job metrics are stored as raw points collected from runners (`JobMetricsPoint`)
+and as rollups (`JobMetricsRollup`) aggregated over 1m buckets from points
+and over 10m buckets from 1m rollups. Points are kept for `SERVER_METRICS_TTL_SECONDS`,
+rollups are kept longer, so metrics history is queried from the finest data available.
+"""
+
+import asyncio
 import json
+import struct
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple, Type, Union
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from dstack._internal.core.errors import ResourceNotExistsError
 from dstack._internal.core.models.metrics import JobMetrics, Metric
-from dstack._internal.server.models import JobMetricsPoint, JobModel, ProjectModel
+from dstack._internal.server import settings
+from dstack._internal.server.db import get_db, get_session_ctx
+from dstack._internal.server.models import (
+    JobMetricsPoint,
+    JobMetricsRollup,
+    JobModel,
+    ProjectModel,
+)
 from dstack._internal.server.services.jobs import get_run_job_model
+from dstack._internal.server.services.locking import string_to_lock_id
+from dstack._internal.utils.common import get_current_datetime
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rollup resolution -> the resolution of its source, None for points
+ROLLUP_RESOLUTIONS: Dict[int, Optional[int]] = {60: None, 600: 60}
+# Buckets are rolled up after this delay so that late points are included
+ROLLUP_DELAY_SECONDS = 30
+# Limits work per rollup_metrics() call when catching up after downtime
+MAX_ROLLUP_BUCKETS = 60
+# The maximum number of samples returned for a time range
+MAX_SAMPLES = 10000
+DELETE_CHUNK_SIZE = 1000
+
+
+@dataclass
+class _Sample:
+    timestamp_micro: int
+    cpu_usage_micro: int
+    memory_usage_bytes: int
+    memory_working_set_bytes: int
+    gpus_memory_usage_bytes: List[int]
+    gpus_util_percent: List[int]
 
 
 async def get_job_metrics(
@@ -16,7 +61,22 @@ async def get_job_metrics(
     run_name: str,
     replica_num: int,
     job_num: int,
+    after: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+    limit: Optional[int] = None,
 ) -> JobMetrics:
+    """
+    Returns metrics of the job in the (`after`, `before`) time range, at most `limit` latest
+    values of each metric. `limit` defaults to 1 if `after` is not set, that is,
+    the current values. Older time ranges are answered with coarser rollups.
+    """
+    if after is not None and after.tzinfo is None:
+        after = after.replace(tzinfo=timezone.utc)
+    if before is not None and before.tzinfo is None:
+        before = before.replace(tzinfo=timezone.utc)
+    if limit is None:
+        limit = 1 if after is None else MAX_SAMPLES
+    limit = min(limit, MAX_SAMPLES)
     job_model = await get_run_job_model(
         session=session,
         project=project,
@@ -29,85 +89,331 @@ async def get_job_metrics(
     job_metrics = await _get_job_metrics(
         session=session,
         job_model=job_model,
+        after=after,
+        before=before,
+        limit=limit,
     )
     return job_metrics
 
 
+async def rollup_metrics() -> None:
+    """
+    Aggregates points and finer rollups into rollups of complete buckets not rolled up yet.
+    """
+    async with get_session_ctx() as session:
+        for resolution, source_resolution in ROLLUP_RESOLUTIONS.items():
+            # A transaction-level lock since the session may switch connections after commit,
+            # and a session-level lock could then not be released
+            if get_db().dialect_name == "postgresql":
+                await session.execute(
+                    select(func.pg_advisory_xact_lock(string_to_lock_id("job_metrics_rollups")))
+                )
+            await _rollup_metrics(session, resolution, source_resolution)
+            await session.commit()
+
+
+async def delete_metrics() -> None:
+    """
+    Deletes expired points and rollups in chunks to not lock the tables for long.
+    """
+    now = _datetime_to_unix_time_micro(get_current_datetime())
+    await _delete_in_chunks(
+        JobMetricsPoint,
+        JobMetricsPoint.timestamp_micro < now - settings.SERVER_METRICS_TTL_SECONDS * 1_000_000,
+    )
+    for resolution, ttl in _get_rollup_ttls().items():
+        await _delete_in_chunks(
+            JobMetricsRollup,
+            JobMetricsRollup.resolution_seconds == resolution,
+            JobMetricsRollup.bucket_start_micro < now - ttl * 1_000_000,
+        )
+
+
+def pack_values(values: List[int]) -> bytes:
+    return struct.pack(f"<{len(values)}q", *values)
+
+
+def unpack_values(data: bytes) -> List[int]:
+    return list(struct.unpack(f"<{len(data) // 8}q", data))
+
+
 async def _get_job_metrics(
     session: AsyncSession,
     job_model: JobModel,
+    after: Optional[datetime],
+    before: Optional[datetime],
+    limit: int,
 ) -> JobMetrics:
+    resolution = _get_resolution(after)
+    model: Union[Type[JobMetricsPoint], Type[JobMetricsRollup]]
+    if resolution is None:
+        model = JobMetricsPoint
+        filters = [JobMetricsPoint.job_id == job_model.id]
+    else:
+        model = JobMetricsRollup
+        filters = [
+            JobMetricsRollup.job_id == job_model.id,
+            JobMetricsRollup.resolution_seconds == resolution,
+        ]
+    # One more sample than requested to calculate rates, so the lower bound is applied later
+    if before is not None:
+        filters.append(model.timestamp_micro < _datetime_to_unix_time_micro(before))
     res = await session.execute(
-        select(JobMetricsPoint)
-        .where(JobMetricsPoint.job_id == job_model.id)
-        .order_by(JobMetricsPoint.timestamp_micro.desc())
-        .limit(2)
+        select(model).where(*filters).order_by(model.timestamp_micro.desc()).limit(limit + 1)
     )
-    points = res.scalars().all()
-    if len(points) < 2:
-        return JobMetrics(metrics=[])
-    last_point = points[0]
-    prev_point = points[1]
-    return _calculate_job_metrics(last_point, prev_point)
+    samples = [_to_sample(row) for row in reversed(res.scalars().all())]
+    if after is not None:
+        after_micro = _datetime_to_unix_time_micro(after)
+        first = next(
+            (i for i, s in enumerate(samples) if s.timestamp_micro > after_micro), len(samples)
+        )
+        samples = samples[max(first - 1, 0) :]
+    return _calculate_job_metrics(samples)
 
 
-def _calculate_job_metrics(last_point: JobMetricsPoint, prev_point: JobMetricsPoint) -> JobMetrics:
-    metrics = []
-    timestamp = _unix_time_micro_to_datetime(last_point.timestamp_micro)
-    metrics.append(
-        Metric(
-            name="cpu_usage_percent",
-            timestamps=[timestamp],
-            values=[_get_cpu_usage(last_point, prev_point)],
+def _get_resolution(after: Optional[datetime]) -> Optional[int]:
+    """
+    Returns the finest resolution whose data covers the time since `after` or `None` for points.
+    """
+    if after is None:
+        return None
+    age = (get_current_datetime() - after).total_seconds()
+    if age <= settings.SERVER_METRICS_TTL_SECONDS:
+        return None
+    rollup_ttls = _get_rollup_ttls()
+    for resolution, ttl in rollup_ttls.items():
+        if age <= ttl:
+            return resolution
+    return max(rollup_ttls)
+
+
+def _get_rollup_ttls() -> Dict[int, int]:
+    return {
+        60: settings.SERVER_METRICS_ROLLUP_1M_TTL_SECONDS,
+        600: settings.SERVER_METRICS_ROLLUP_10M_TTL_SECONDS,
+    }
+
+
+def _calculate_job_metrics(samples: List[_Sample]) -> JobMetrics:
+    # Samples collected twice at the same time by different replicas cannot be used for rates
+    samples = [
+        s
+        for i, s in enumerate(samples)
+        if i == 0 or s.timestamp_micro != samples[i - 1].timestamp_micro
+    ]
+    if len(samples) < 2:
+        return JobMetrics(metrics=[])
+    # Columns of all samples, rates are calculated for all consecutive pairs at once
+    timestamps_micro = [s.timestamp_micro for s in samples]
+    cpu_usages_micro = [s.cpu_usage_micro for s in samples]
+    cpu_usage_percent = [
+        round((c1 - c0) / (t1 - t0) * 100)
+        for t0, t1, c0, c1 in zip(
+            timestamps_micro, timestamps_micro[1:], cpu_usages_micro, cpu_usages_micro[1:]
         )
-    )
-    metrics.append(
+    ]
+    samples = samples[1:]
+    timestamps = [_unix_time_micro_to_datetime(t) for t in timestamps_micro[1:]]
+    metrics = [
+        Metric(name="cpu_usage_percent", timestamps=timestamps, values=cpu_usage_percent),
         Metric(
             name="memory_usage_bytes",
-            timestamps=[timestamp],
-            values=[last_point.memory_usage_bytes],
-        )
-    )
-    metrics.append(
+            timestamps=timestamps,
+            values=[s.memory_usage_bytes for s in samples],
+        ),
         Metric(
             name="memory_working_set_bytes",
-            timestamps=[timestamp],
-            values=[last_point.memory_working_set_bytes],
-        )
-    )
-
-    gpus_memory_usage_bytes = json.loads(last_point.gpus_memory_usage_bytes)
-    gpus_util_percent = json.loads(last_point.gpus_util_percent)
-    gpus_detected_num = len(gpus_memory_usage_bytes)
-    metrics.append(
+            timestamps=timestamps,
+            values=[s.memory_working_set_bytes for s in samples],
+        ),
         Metric(
             name="gpus_detected_num",
-            timestamps=[timestamp],
-            values=[gpus_detected_num],
-        )
-    )
+            timestamps=timestamps,
+            values=[len(s.gpus_memory_usage_bytes) for s in samples],
+        ),
+    ]
+    gpus_detected_num = len(samples[-1].gpus_memory_usage_bytes)
     for i in range(gpus_detected_num):
+        gpu_samples = [
+            (t, s) for t, s in zip(timestamps, samples) if len(s.gpus_memory_usage_bytes) > i
+        ]
+        gpu_timestamps = [t for t, _ in gpu_samples]
         metrics.append(
             Metric(
                 name=f"gpu_memory_usage_bytes_gpu{i}",
-                timestamps=[timestamp],
-                values=[gpus_memory_usage_bytes[i]],
+                timestamps=gpu_timestamps,
+                values=[s.gpus_memory_usage_bytes[i] for _, s in gpu_samples],
             )
         )
         metrics.append(
             Metric(
                 name=f"gpu_util_percent_gpu{i}",
-                timestamps=[timestamp],
-                values=[gpus_util_percent[i]],
+                timestamps=gpu_timestamps,
+                values=[s.gpus_util_percent[i] for _, s in gpu_samples],
             )
         )
     return JobMetrics(metrics=metrics)
 
 
-def _get_cpu_usage(last_point: JobMetricsPoint, prev_point: JobMetricsPoint) -> int:
-    window = last_point.timestamp_micro - prev_point.timestamp_micro
-    return round((last_point.cpu_usage_micro - prev_point.cpu_usage_micro) / window * 100)
+async def _rollup_metrics(
+    session: AsyncSession, resolution: int, source_resolution: Optional[int]
+) -> None:
+    resolution_micro = resolution * 1_000_000
+    res = await session.execute(
+        select(func.max(JobMetricsRollup.bucket_start_micro)).where(
+            JobMetricsRollup.resolution_seconds == resolution
+        )
+    )
+    last_bucket_start = res.scalar()
+    # Skip buckets with no source samples, e.g. when no jobs were running
+    start = await _get_first_source_timestamp(
+        session,
+        source_resolution,
+        after=last_bucket_start + resolution_micro if last_bucket_start is not None else None,
+    )
+    if start is None:
+        return
+    start -= start % resolution_micro
+    now = _datetime_to_unix_time_micro(get_current_datetime())
+    end = now - ROLLUP_DELAY_SECONDS * 1_000_000
+    end -= end % resolution_micro
+    end = min(end, start + MAX_ROLLUP_BUCKETS * resolution_micro)
+    if source_resolution is not None:
+        # Don't roll up buckets whose source rollups are not complete yet
+        res = await session.execute(
+            select(func.max(JobMetricsRollup.bucket_start_micro)).where(
+                JobMetricsRollup.resolution_seconds == source_resolution
+            )
+        )
+        last_source_bucket_start = res.scalar()
+        if last_source_bucket_start is None:
+            return
+        source_end = last_source_bucket_start + source_resolution * 1_000_000
+        end = min(end, source_end - source_end % resolution_micro)
+    if end <= start:
+        return
+    samples = await _get_source_samples(session, source_resolution, start, end)
+    for (job_id, bucket_start), bucket_samples in groupby(
+        samples,
+        key=lambda js: (js[0], js[1].timestamp_micro - js[1].timestamp_micro % resolution_micro),
+    ):
+        rollup = _aggregate_samples([s for _, s in bucket_samples])
+        session.add(
+            JobMetricsRollup(
+                job_id=job_id,
+                resolution_seconds=resolution,
+                bucket_start_micro=bucket_start,
+                timestamp_micro=rollup.timestamp_micro,
+                cpu_usage_micro=rollup.cpu_usage_micro,
+                memory_usage_bytes=rollup.memory_usage_bytes,
+                memory_working_set_bytes=rollup.memory_working_set_bytes,
+                gpus_memory_usage_bytes=pack_values(rollup.gpus_memory_usage_bytes),
+                gpus_util_percent=pack_values(rollup.gpus_util_percent),
+            )
+        )
+    logger.debug(
+        "Rolled up %ss job metrics up to %s", resolution, _unix_time_micro_to_datetime(end)
+    )
+
+
+async def _get_first_source_timestamp(
+    session: AsyncSession, source_resolution: Optional[int], after: Optional[int]
+) -> Optional[int]:
+    model: Union[Type[JobMetricsPoint], Type[JobMetricsRollup]]
+    filters = []
+    if source_resolution is None:
+        model = JobMetricsPoint
+    else:
+        model = JobMetricsRollup
+        filters.append(JobMetricsRollup.resolution_seconds == source_resolution)
+    if after is not None:
+        filters.append(model.timestamp_micro >= after)
+    res = await session.execute(select(func.min(model.timestamp_micro)).where(*filters))
+    return res.scalar()
+
+
+async def _get_source_samples(
+    session: AsyncSession, source_resolution: Optional[int], start: int, end: int
+) -> List[Tuple[object, _Sample]]:
+    """
+    Returns (job_id, sample) pairs with timestamps in [start, end) ordered by job and time.
+    """
+    model: Union[Type[JobMetricsPoint], Type[JobMetricsRollup]]
+    filters = []
+    if source_resolution is None:
+        model = JobMetricsPoint
+    else:
+        model = JobMetricsRollup
+        filters.append(JobMetricsRollup.resolution_seconds == source_resolution)
+    res = await session.execute(
+        select(model)
+        .where(*filters, model.timestamp_micro >= start, model.timestamp_micro < end)
+        .order_by(model.job_id, model.timestamp_micro)
+    )
+    return [(row.job_id, _to_sample(row)) for row in res.scalars().all()]
+
+
+def _aggregate_samples(samples: List[_Sample]) -> _Sample:
+    last = samples[-1]
+    gpus_num = len(last.gpus_memory_usage_bytes)
+    gpu_samples = [s for s in samples if len(s.gpus_memory_usage_bytes) == gpus_num]
+    return _Sample(
+        timestamp_micro=last.timestamp_micro,
+        cpu_usage_micro=last.cpu_usage_micro,
+        memory_usage_bytes=_mean([s.memory_usage_bytes for s in samples]),
+        memory_working_set_bytes=_mean([s.memory_working_set_bytes for s in samples]),
+        gpus_memory_usage_bytes=[
+            _mean(values) for values in zip(*(s.gpus_memory_usage_bytes for s in gpu_samples))
+        ],
+        gpus_util_percent=[
+            _mean(values) for values in zip(*(s.gpus_util_percent for s in gpu_samples))
+        ],
+    )
+
+
+def _mean(values) -> int:
+    values = list(values)
+    return round(sum(values) / len(values))
+
+
+def _to_sample(row: Union[JobMetricsPoint, JobMetricsRollup]) -> _Sample:
+    if isinstance(row, JobMetricsPoint):
+        gpus_memory_usage_bytes = json.loads(row.gpus_memory_usage_bytes)
+        gpus_util_percent = json.loads(row.gpus_util_percent)
+    else:
+        gpus_memory_usage_bytes = unpack_values(row.gpus_memory_usage_bytes)
+        gpus_util_percent = unpack_values(row.gpus_util_percent)
+    return _Sample(
+        timestamp_micro=row.timestamp_micro,
+        cpu_usage_micro=row.cpu_usage_micro,
+        memory_usage_bytes=row.memory_usage_bytes,
+        memory_working_set_bytes=row.memory_working_set_bytes,
+        gpus_memory_usage_bytes=gpus_memory_usage_bytes,
+        gpus_util_percent=gpus_util_percent,
+    )
+
+
+async def _delete_in_chunks(
+    model: Union[Type[JobMetricsPoint], Type[JobMetricsRollup]],
+    *filters: ColumnElement[bool],
+) -> None:
+    while True:
+        async with get_session_ctx() as session:
+            res = await session.execute(select(model.id).where(*filters).limit(DELETE_CHUNK_SIZE))
+            ids = res.scalars().all()
+            if len(ids) == 0:
+                return
+            await session.execute(delete(model).where(model.id.in_(ids)))
+            await session.commit()
+        if len(ids) < DELETE_CHUNK_SIZE:
+            return
+        # Let other tasks use the DB between chunks
+        await asyncio.sleep(0)
+
+
+def _datetime_to_unix_time_micro(dt: datetime) -> int:
+    return int(dt.timestamp() * 1_000_000)
 
 
-def _unix_time_micro_to_datetime(unix_time_ms: int) -> datetime:
-    return datetime.fromtimestamp(unix_time_ms / 1_000_000, tz=timezone.utc)
+def _unix_time_micro_to_datetime(unix_time_micro: int) -> datetime:
+    return datetime.fromtimestamp(unix_time_micro / 1_000_000, tz=timezone.utc)
@@ -41,7 +41,7 @@ async def get_offers_by_requirements(
         and len(profile.backends) == 1
         and BackendType.DSTACK in profile.backends
     ):
-        profile.backends = None
+        profile = profile.copy(update={"backends": None})
 
     backend_types = profile.backends
     regions = profile.regions
@@ -4,16 +4,12 @@ from collections.abc import Container, Iterable
 from datetime import datetime, timezone
 from typing import List, Literal, Optional, Union
 
-import gpuhunt
 from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from dstack._internal.core.backends import BACKENDS_WITH_MULTINODE_SUPPORT
-from dstack._internal.core.backends.base.offers import (
-    offer_to_catalog_item,
-    requirements_to_query_filter,
-)
+from dstack._internal.core.backends.base.offers import OffersMatcher
 from dstack._internal.core.errors import (
     ResourceExistsError,
     ResourceNotExistsError,
@@ -24,7 +20,6 @@ from dstack._internal.core.models.envs import Env
 from dstack._internal.core.models.instances import (
     InstanceAvailability,
     InstanceConfiguration,
-    InstanceOffer,
     InstanceOfferWithAvailability,
     InstanceStatus,
     InstanceType,
@@ -54,6 +49,7 @@ from dstack._internal.server.models import (
 from dstack._internal.server.services.locking import get_locker
 from dstack._internal.server.services.offers import generate_shared_offer
 from dstack._internal.server.services.projects import list_project_models, list_user_project_models
+from dstack._internal.server.utils.parsing import parse_raw_cached
 from dstack._internal.utils import common as common_utils
 from dstack._internal.utils import random_names
 from dstack._internal.utils.common import get_current_datetime
@@ -273,13 +269,13 @@ def instance_model_to_instance(instance_model: InstanceModel) -> Instance:
 def get_instance_provisioning_data(instance_model: InstanceModel) -> Optional[JobProvisioningData]:
     if instance_model.job_provisioning_data is None:
         return None
-    return JobProvisioningData.__response__.parse_raw(instance_model.job_provisioning_data)
+    return parse_raw_cached(JobProvisioningData.__response__, instance_model.job_provisioning_data)
 
 
 def get_instance_offer(instance_model: InstanceModel) -> Optional[InstanceOfferWithAvailability]:
     if instance_model.offer is None:
         return None
-    return InstanceOfferWithAvailability.__response__.parse_raw(instance_model.offer)
+    return parse_raw_cached(InstanceOfferWithAvailability.__response__, instance_model.offer)
 
 
 def get_instance_configuration(instance_model: InstanceModel) -> InstanceConfiguration:
@@ -515,13 +511,12 @@ def filter_pool_instances(
     if requirements is None:
         return candidates
 
-    query_filter = requirements_to_query_filter(requirements)
+    offers_matcher = OffersMatcher(requirements)
     for instance in candidates:
-        if instance.offer is None:
+        offer = get_instance_offer(instance)
+        if offer is None:
             continue
-        offer = InstanceOffer.__response__.parse_raw(instance.offer)
-        catalog_item = offer_to_catalog_item(offer)
-        if gpuhunt.matches(catalog_item, query_filter):
+        if offers_matcher.matches(offer):
             instances.append(instance)
     return instances
 
@@ -536,7 +531,7 @@ def get_shared_pool_instances_with_offers(
     volumes: Optional[List[List[Volume]]] = None,
 ) -> list[tuple[InstanceModel, InstanceOfferWithAvailability]]:
     instances_with_offers: list[tuple[InstanceModel, InstanceOfferWithAvailability]] = []
-    query_filter = requirements_to_query_filter(requirements)
+    offers_matcher = OffersMatcher(requirements)
     filtered_instances = filter_pool_instances(
         pool_instances=pool_instances,
         profile=profile,
@@ -553,17 +548,16 @@ def get_shared_pool_instances_with_offers(
             continue
         total_blocks = common_utils.get_or_error(instance.total_blocks)
         idle_blocks = total_blocks - instance.busy_blocks
-        for blocks in range(1, total_blocks + 1):
-            shared_offer = generate_shared_offer(offer, blocks, total_blocks)
-            catalog_item = offer_to_catalog_item(shared_offer)
-            if gpuhunt.matches(catalog_item, query_filter):
-                if blocks <= idle_blocks:
-                    shared_offer.availability = InstanceAvailability.IDLE
-                else:
-                    shared_offer.availability = InstanceAvailability.BUSY
-                if shared_offer.availability == InstanceAvailability.IDLE or not idle_only:
-                    instances_with_offers.append((instance, shared_offer))
-                break
+        blocks = offers_matcher.get_min_matching_blocks(offer, total_blocks)
+        if blocks is None:
+            continue
+        shared_offer = generate_shared_offer(offer, blocks, total_blocks)
+        if blocks <= idle_blocks:
+            shared_offer.availability = InstanceAvailability.IDLE
+        else:
+            shared_offer.availability = InstanceAvailability.BUSY
+        if shared_offer.availability == InstanceAvailability.IDLE or not idle_only:
+            instances_with_offers.append((instance, shared_offer))
     return instances_with_offers
 
 
@@ -577,10 +571,13 @@ async def list_pools_instance_models(
     prev_id: Optional[uuid.UUID],
     limit: int,
     ascending: bool,
+    changed_after: Optional[datetime] = None,
 ) -> List[InstanceModel]:
     filters: List = [
         InstanceModel.project_id.in_(p.id for p in projects),
     ]
+    if changed_after is not None:
+        filters.append(InstanceModel.last_processed_at >= changed_after)
     if fleet_ids is not None:
         filters.append(InstanceModel.fleet_id.in_(fleet_ids))
     if pool is not None:
@@ -645,6 +642,7 @@ async def list_user_pool_instances(
     prev_id: Optional[uuid.UUID],
     limit: int,
     ascending: bool,
+    changed_after: Optional[datetime] = None,
 ) -> List[Instance]:
     if user.global_role == GlobalRole.ADMIN:
         projects = await list_project_models(session=session)
@@ -676,6 +674,7 @@ async def list_user_pool_instances(
         prev_id=prev_id,
         limit=limit,
         ascending=ascending,
+        changed_after=changed_after,
     )
     instances = []
     for instance in instance_models:
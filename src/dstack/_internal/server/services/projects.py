@@ -22,8 +22,9 @@ from dstack._internal.server.services import users
 from dstack._internal.server.services.backends import get_configurator
 from dstack._internal.server.services.permissions import get_default_permissions
 from dstack._internal.server.settings import DEFAULT_PROJECT_NAME
-from dstack._internal.utils.common import get_current_datetime, run_async
+from dstack._internal.utils.common import get_current_datetime
 from dstack._internal.utils.crypto import generate_rsa_key_pair_bytes
+from dstack._internal.utils.executors import cpu_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -319,7 +320,7 @@ async def get_project_model_by_id_or_error(
 async def create_project_model(
     session: AsyncSession, owner: UserModel, project_name: str
 ) -> ProjectModel:
-    private_bytes, public_bytes = await run_async(
+    private_bytes, public_bytes = await cpu_executor.run(
         generate_rsa_key_pair_bytes, f"{project_name}@dstack"
     )
     project = ProjectModel(
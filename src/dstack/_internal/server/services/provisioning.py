@@ -0,0 +1,101 @@
+"""
+Batching of backend calls that poll instances being provisioned, so that instances processed
+concurrently are polled with `Compute.update_provisioning_data_batch()` instead of one call each.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from dstack._internal.core.backends.base.compute import Compute
+from dstack._internal.core.models.runs import JobProvisioningData
+from dstack._internal.utils.executors import cloud_api_executor
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Calls made within this time for the same backend and region are batched
+BATCH_WINDOW = 0.1
+
+
+class _Batch:
+    def __init__(
+        self, compute: Compute, project_ssh_public_key: str, project_ssh_private_key: str
+    ) -> None:
+        self.compute = compute
+        self.project_ssh_public_key = project_ssh_public_key
+        self.project_ssh_private_key = project_ssh_private_key
+        self.provisioning_data_list: List[JobProvisioningData] = []
+        self.futures: List[asyncio.Future[None]] = []
+
+
+# Backend computes are cached per project, so batches are also per project
+_batches: Dict[Tuple[Compute, str], _Batch] = {}
+_batch_tasks: Set[asyncio.Task] = set()
+
+
+async def update_provisioning_data(
+    compute: Compute,
+    provisioning_data: JobProvisioningData,
+    project_ssh_public_key: str,
+    project_ssh_private_key: str,
+) -> None:
+    """
+    Calls `compute.update_provisioning_data()` batched with concurrent calls
+    for other instances in the same backend and region if the backend supports batching.
+    `provisioning_data` is updated in place, the same as with the non-batched call.
+    """
+    if not _supports_batching(compute):
+        # Batching would only serialize the calls without saving any
+        await cloud_api_executor.run(
+            compute.update_provisioning_data,
+            provisioning_data,
+            project_ssh_public_key,
+            project_ssh_private_key,
+        )
+        return
+    key = (compute, provisioning_data.region)
+    batch = _batches.get(key)
+    if batch is None:
+        batch = _Batch(compute, project_ssh_public_key, project_ssh_private_key)
+        _batches[key] = batch
+        task = asyncio.create_task(_run_batch(key, batch))
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
+    future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    batch.provisioning_data_list.append(provisioning_data)
+    batch.futures.append(future)
+    await future
+
+
+async def _run_batch(key: Tuple[Compute, str], batch: _Batch) -> None:
+    await asyncio.sleep(BATCH_WINDOW)
+    # No more calls can join the batch after this point
+    del _batches[key]
+    logger.debug(
+        "Updating provisioning data of %s instances in %s",
+        len(batch.provisioning_data_list),
+        key[1],
+    )
+    try:
+        errors: List[Optional[Exception]] = await cloud_api_executor.run(
+            batch.compute.update_provisioning_data_batch,
+            batch.provisioning_data_list,
+            batch.project_ssh_public_key,
+            batch.project_ssh_private_key,
+        )
+    except Exception as e:
+        errors = [e] * len(batch.futures)
+    for future, error in zip(batch.futures, errors):
+        if future.done():
+            # The caller was cancelled
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(None)
+
+
+def _supports_batching(compute: Compute) -> bool:
+    return (
+        type(compute).update_provisioning_data_batch is not Compute.update_provisioning_data_batch
+    )
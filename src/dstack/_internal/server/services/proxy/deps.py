@@ -3,12 +3,26 @@ from typing import AsyncGenerator
 from dstack._internal.proxy.lib.auth import BaseProxyAuthProvider
 from dstack._internal.proxy.lib.deps import ProxyDependencyInjector
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.services.replica_balancing import (
+    ReplicaBalancingStrategy,
+    get_replica_balancer,
+)
+from dstack._internal.proxy.lib.services.service_connection import ServiceConnectionPool
+from dstack._internal.server import settings
 from dstack._internal.server.db import get_session_ctx
 from dstack._internal.server.services.proxy.auth import ServerProxyAuthProvider
 from dstack._internal.server.services.proxy.repo import ServerProxyRepo
 
 
 class ServerProxyDependencyInjector(ProxyDependencyInjector):
+    def __init__(self) -> None:
+        super().__init__()
+        self._service_conn_pool = ServiceConnectionPool(
+            balancer=get_replica_balancer(
+                ReplicaBalancingStrategy(settings.SERVER_PROXY_REPLICA_BALANCING)
+            )
+        )
+
     async def get_repo(self) -> AsyncGenerator[BaseProxyRepo, None]:
         async with get_session_ctx() as session:
             yield ServerProxyRepo(session)
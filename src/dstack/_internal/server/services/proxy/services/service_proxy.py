@@ -1,3 +1,4 @@
+from functools import partial
 from typing import AsyncGenerator, AsyncIterator, Optional
 
 import fastapi
@@ -8,6 +9,7 @@ from starlette.requests import ClientDisconnect
 from dstack._internal.proxy.lib.deps import ProxyAuthContext
 from dstack._internal.proxy.lib.errors import ProxyError
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.responses import ClosingStreamingResponse
 from dstack._internal.proxy.lib.services.service_connection import (
     ServiceConnectionPool,
     get_service_replica_client,
@@ -61,10 +63,11 @@ async def proxy(
             raise ProxyError("Timed out requesting upstream", status.HTTP_504_GATEWAY_TIMEOUT)
         raise ProxyError("Error requesting upstream", status.HTTP_502_BAD_GATEWAY)
 
-    return fastapi.responses.StreamingResponse(
+    return ClosingStreamingResponse(
         stream_response(upstream_response),
         status_code=upstream_response.status_code,
         headers=upstream_response.headers,
+        on_close=partial(close_response, upstream_response),
     )
 
 
@@ -76,7 +79,10 @@ async def stream_response(response: httpx.Response) -> AsyncGenerator[bytes, Non
         logger.debug(
             "Error streaming response %s %s: %r", response.request.method, response.request.url, e
         )
+    await close_response(response)
 
+
+async def close_response(response: httpx.Response) -> None:
     try:
         await response.aclose()
     except httpx.RequestError as e:
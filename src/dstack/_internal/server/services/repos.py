@@ -28,7 +28,7 @@ from dstack._internal.server.models import (
     UserModel,
 )
 from dstack._internal.server.services.storage import get_default_storage
-from dstack._internal.utils.common import run_async
+from dstack._internal.utils.executors import storage_io_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -303,7 +303,9 @@ async def upload_code(
             blob_hash=code_hash,
             blob=None,
         )
-        await run_async(storage.upload_code, project.name, repo.name, code.blob_hash, blob)
+        await storage_io_executor.run(
+            storage.upload_code, project.name, repo.name, code.blob_hash, blob
+        )
     session.add(code)
     await session.commit()
 
@@ -0,0 +1,247 @@
+import hashlib
+import socket
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from dstack._internal.core.errors import SSHError
+from dstack._internal.core.models.instances import SSHConnectionParams
+from dstack._internal.core.services.ssh.tunnel import (
+    SSH_DEFAULT_OPTIONS,
+    SSHTunnel,
+    ports_to_forwarded_sockets,
+)
+from dstack._internal.server import settings
+from dstack._internal.utils.executors import ssh_executor
+from dstack._internal.utils.logging import get_logger
+from dstack._internal.utils.path import FileContent
+
+logger = get_logger(__name__)
+
+POOLED_TUNNEL_OPTIONS = {
+    **SSH_DEFAULT_OPTIONS,
+    # Let the master connection exit by itself if the host goes away
+    "ServerAliveInterval": "10",
+    "ServerAliveCountMax": "3",
+}
+
+
+@dataclass(frozen=True)
+class TunnelKey:
+    destination: str
+    port: Optional[int]
+    # sha256 of the private key so that keys are not kept in the key itself
+    identity_hash: str
+    # (hostname, username, port, identity_hash) from outer to inner
+    proxies: Tuple[Tuple[str, str, int, Optional[str]], ...] = ()
+
+
+@dataclass
+class _PooledTunnel:
+    tunnel: SSHTunnel
+    # remote port -> local port
+    ports: Dict[int, int] = field(default_factory=dict)
+    opened: bool = False
+    last_used_at: float = 0
+    last_checked_at: float = 0
+    needs_check: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class RunnerTunnelPool:
+    """
+    Keeps long-lived SSH master connections to instances keyed by `TunnelKey`.
+    Forwardings are added to the master connection on demand via `ssh -O forward`,
+    so a warm tunnel costs no subprocesses at all.
+
+    The pool is used from worker threads (see `runner_ssh_tunnel`), hence threading locks.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = settings.RUNNER_SSH_TUNNEL_POOL_IDLE_TIMEOUT,
+        check_interval: float = settings.RUNNER_SSH_TUNNEL_POOL_CHECK_INTERVAL,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self._tunnels: Dict[TunnelKey, _PooledTunnel] = {}
+        self._lock = threading.Lock()
+
+    def get_ports(
+        self,
+        key: TunnelKey,
+        identity: FileContent,
+        ssh_proxies: List[Tuple[SSHConnectionParams, Optional[FileContent]]],
+        remote_ports: Iterable[int],
+    ) -> Dict[int, int]:
+        """
+        Returns remote->local ports mapping, opening the master connection and
+        adding missing forwardings if necessary.
+
+        Raises:
+            SSHError: the master connection cannot be opened or forwardings cannot be added.
+        """
+        remote_ports = list(remote_ports)
+        while True:
+            pooled = self._get_or_create(key, identity, ssh_proxies)
+            with pooled.lock:
+                with self._lock:
+                    discarded = self._tunnels.get(key) is not pooled
+                if discarded:
+                    # Evicted before we locked it, reopening it would leave it untracked
+                    continue
+                pooled.last_used_at = time.monotonic()
+                try:
+                    self._ensure_open(key, pooled)
+                    missing_ports = [p for p in remote_ports if p not in pooled.ports]
+                    if missing_ports:
+                        new_ports = reserve_ports(missing_ports)
+                        pooled.tunnel.forward(ports_to_forwarded_sockets(new_ports))
+                        pooled.ports.update(new_ports)
+                except SSHError:
+                    self._discard_locked(key, pooled)
+                    raise
+                return {p: pooled.ports[p] for p in remote_ports}
+
+    def mark_suspicious(self, key: TunnelKey) -> None:
+        """
+        Forces a health check on the next use, e.g., after a request through the tunnel failed.
+        """
+        pooled = self._tunnels.get(key)
+        if pooled is not None:
+            pooled.needs_check = True
+
+    def evict_idle(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                (key, pooled)
+                for key, pooled in self._tunnels.items()
+                if now - pooled.last_used_at > self.idle_timeout
+            ]
+        for key, pooled in idle:
+            if not pooled.lock.acquire(blocking=False):
+                continue  # in use
+            try:
+                # Could have been used since it was found idle
+                if time.monotonic() - pooled.last_used_at > self.idle_timeout:
+                    self._discard_locked(key, pooled)
+            finally:
+                pooled.lock.release()
+
+    def close_all(self) -> None:
+        with self._lock:
+            tunnels = list(self._tunnels.items())
+        for key, pooled in tunnels:
+            with pooled.lock:
+                self._discard_locked(key, pooled)
+
+    def __len__(self) -> int:
+        return len(self._tunnels)
+
+    def _get_or_create(
+        self,
+        key: TunnelKey,
+        identity: FileContent,
+        ssh_proxies: List[Tuple[SSHConnectionParams, Optional[FileContent]]],
+    ) -> _PooledTunnel:
+        with self._lock:
+            pooled = self._tunnels.get(key)
+            if pooled is None:
+                pooled = _PooledTunnel(
+                    tunnel=SSHTunnel(
+                        destination=key.destination,
+                        port=key.port,
+                        identity=identity,
+                        options=POOLED_TUNNEL_OPTIONS,
+                        ssh_proxies=ssh_proxies,
+                    )
+                )
+                self._tunnels[key] = pooled
+            return pooled
+
+    def _ensure_open(self, key: TunnelKey, pooled: _PooledTunnel) -> None:
+        now = time.monotonic()
+        if (
+            pooled.opened
+            and not pooled.needs_check
+            and now - pooled.last_checked_at < self.check_interval
+        ):
+            return
+        pooled.needs_check = False
+        if pooled.opened:
+            if pooled.tunnel.check():
+                pooled.last_checked_at = now
+                return
+            logger.debug("Pooled SSH tunnel to %s is dead, reopening", key.destination)
+            pooled.tunnel.close()
+            pooled.opened = False
+        pooled.ports = {}
+        pooled.tunnel.open()
+        pooled.opened = True
+        pooled.last_checked_at = now
+
+    def _discard_locked(self, key: TunnelKey, pooled: _PooledTunnel) -> None:
+        with self._lock:
+            if self._tunnels.get(key) is pooled:
+                del self._tunnels[key]
+        if pooled.opened:
+            pooled.tunnel.close()
+            pooled.opened = False
+
+
+def get_tunnel_key(
+    destination: str,
+    port: Optional[int],
+    identity: FileContent,
+    ssh_proxies: List[Tuple[SSHConnectionParams, Optional[FileContent]]],
+) -> TunnelKey:
+    return TunnelKey(
+        destination=destination,
+        port=port,
+        identity_hash=_hash_identity(identity),
+        proxies=tuple(
+            (
+                params.hostname,
+                params.username,
+                params.port,
+                _hash_identity(proxy_identity) if proxy_identity is not None else None,
+            )
+            for params, proxy_identity in ssh_proxies
+        ),
+    )
+
+
+def reserve_ports(ports: Iterable[int]) -> dict[int, int]:
+    sockets = []
+    try:
+        for port in ports:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.bind(("localhost", 0))  # Bind to a free port provided by the host
+            sockets.append((port, s))
+        return {port: s.getsockname()[1] for port, s in sockets}
+    finally:
+        for _, s in sockets:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.close()
+
+
+def _hash_identity(identity: FileContent) -> str:
+    return hashlib.sha256(identity.content.encode()).hexdigest()
+
+
+_runner_tunnel_pool = RunnerTunnelPool()
+
+
+def get_runner_tunnel_pool() -> RunnerTunnelPool:
+    return _runner_tunnel_pool
+
+
+async def evict_idle_runner_tunnels() -> None:
+    await ssh_executor.run(_runner_tunnel_pool.evict_idle)
+
+
+async def close_runner_tunnels() -> None:
+    await ssh_executor.run(_runner_tunnel_pool.close_all)
@@ -1,16 +1,22 @@
 import functools
-import socket
 import time
-from collections.abc import Iterable
-from typing import Callable, Dict, List, Optional, TypeVar, Union
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import requests
 from typing_extensions import Concatenate, ParamSpec
 
 from dstack._internal.core.errors import DstackError, SSHError
 from dstack._internal.core.models.backends.base import BackendType
+from dstack._internal.core.models.instances import SSHConnectionParams
 from dstack._internal.core.models.runs import JobProvisioningData, JobRuntimeData
+from dstack._internal.core.services.ssh.client import get_ssh_client_info
 from dstack._internal.core.services.ssh.tunnel import SSHTunnel, ports_to_forwarded_sockets
+from dstack._internal.server import settings
+from dstack._internal.server.services.runner.pool import (
+    get_runner_tunnel_pool,
+    get_tunnel_key,
+    reserve_ports,
+)
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.path import FileContent
 
@@ -36,6 +42,9 @@ def runner_ssh_tunnel(
     NOTE: connections from dstack-server to running jobs are expected to be short.
     The runner uses a heuristic to differentiate dstack-server connections from
     client connections based on their duration. See `ConnectionTracker` for details.
+    That's why pooled long-lived connections (see `RunnerTunnelPool`) are only used
+    for dockerized instances, where the server connects to the host's sshd
+    rather than to the container's one.
     """
 
     def decorator(
@@ -79,19 +88,32 @@ def runner_ssh_tunnel(
             if job_provisioning_data.ssh_proxy is not None:
                 ssh_proxies.append((job_provisioning_data.ssh_proxy, proxy_identity))
 
+            destination = f"{job_provisioning_data.username}@{job_provisioning_data.hostname}"
+            if _can_use_tunnel_pool(job_provisioning_data):
+                return _call_with_pooled_tunnel(
+                    func,
+                    container_ports_map,
+                    destination,
+                    job_provisioning_data.ssh_port,
+                    identity,
+                    ssh_proxies,
+                    retries,
+                    retry_interval,
+                    *args,
+                    **kwargs,
+                )
+
             for attempt in range(retries):
                 last = attempt == retries - 1
                 # remote_host:local mapping
-                tunnel_ports_map = _reserve_ports(container_ports_map.values())
+                tunnel_ports_map = reserve_ports(container_ports_map.values())
                 runner_ports_map = {
                     container_port: tunnel_ports_map[host_port]
                     for container_port, host_port in container_ports_map.items()
                 }
                 try:
                     with SSHTunnel(
-                        destination=(
-                            f"{job_provisioning_data.username}@{job_provisioning_data.hostname}"
-                        ),
+                        destination=destination,
                         port=job_provisioning_data.ssh_port,
                         forwarded_sockets=ports_to_forwarded_sockets(tunnel_ports_map),
                         identity=identity,
@@ -114,15 +136,48 @@ def runner_ssh_tunnel(
     return decorator
 
 
-def _reserve_ports(ports: Iterable[int]) -> dict[int, int]:
-    sockets = []
+def _can_use_tunnel_pool(job_provisioning_data: JobProvisioningData) -> bool:
+    if not settings.RUNNER_SSH_TUNNEL_POOL_ENABLED or not job_provisioning_data.dockerized:
+        return False
     try:
-        for port in ports:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.bind(("localhost", 0))  # Bind to a free port provided by the host
-            sockets.append((port, s))
-        return {port: s.getsockname()[1] for port, s in sockets}
-    finally:
-        for _, s in sockets:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            s.close()
+        return get_ssh_client_info().supports_multiplexing
+    except SSHError:
+        return False
+
+
+def _call_with_pooled_tunnel(
+    func: Callable[Concatenate[Dict[int, int], P], R],
+    container_ports_map: Dict[int, int],
+    destination: str,
+    port: Optional[int],
+    identity: FileContent,
+    ssh_proxies: List[Tuple[SSHConnectionParams, Optional[FileContent]]],
+    retries: int,
+    retry_interval: float,
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> Union[bool, R]:
+    pool = get_runner_tunnel_pool()
+    key = get_tunnel_key(destination, port, identity, ssh_proxies)
+    for attempt in range(retries):
+        last = attempt == retries - 1
+        try:
+            # remote_host:local mapping
+            tunnel_ports_map = pool.get_ports(
+                key, identity, ssh_proxies, container_ports_map.values()
+            )
+            runner_ports_map = {
+                container_port: tunnel_ports_map[host_port]
+                for container_port, host_port in container_ports_map.items()
+            }
+            return func(runner_ports_map, *args, **kwargs)
+        except SSHError:
+            pass  # error is logged in the tunnel
+        except (DstackError, requests.RequestException) as e:
+            # The master connection may be stale, check it before the next use
+            pool.mark_suspicious(key)
+            if last:
+                logger.debug("Cannot connect to %s's API: %s", destination, e)
+        if not last:
+            time.sleep(retry_interval)
+    return False
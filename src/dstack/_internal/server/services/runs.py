@@ -7,7 +7,8 @@ from typing import List, Optional
 import pydantic
 from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, lazyload, load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 import dstack._internal.utils.common as common_utils
 from dstack._internal.core.errors import (
@@ -56,6 +57,7 @@ from dstack._internal.server.models import (
     RunModel,
     UserModel,
 )
+from dstack._internal.server.schemas.runs import RunsListProjection
 from dstack._internal.server.services import repos as repos_services
 from dstack._internal.server.services import services
 from dstack._internal.server.services.docker import is_valid_docker_volume_target
@@ -81,6 +83,7 @@ from dstack._internal.server.services.pools import (
 )
 from dstack._internal.server.services.projects import list_project_models, list_user_project_models
 from dstack._internal.server.services.users import get_user_model_by_name
+from dstack._internal.server.utils.parsing import parse_raw_cached
 from dstack._internal.utils.logging import get_logger
 from dstack._internal.utils.random_names import generate_name
 
@@ -104,6 +107,8 @@ async def list_user_runs(
     prev_run_id: Optional[uuid.UUID],
     limit: int,
     ascending: bool,
+    changed_after: Optional[datetime] = None,
+    projection: RunsListProjection = RunsListProjection.FULL,
 ) -> List[Run]:
     if project_name is None and repo_id is not None:
         return []
@@ -139,6 +144,8 @@ async def list_user_runs(
         prev_run_id=prev_run_id,
         limit=limit,
         ascending=ascending,
+        changed_after=changed_after,
+        projection=projection,
     )
     runs = []
     for r in run_models:
@@ -161,6 +168,8 @@ async def list_projects_run_models(
     prev_run_id: Optional[uuid.UUID],
     limit: int,
     ascending: bool,
+    changed_after: Optional[datetime] = None,
+    projection: RunsListProjection = RunsListProjection.FULL,
 ) -> List[RunModel]:
     filters = []
     filters.append(RunModel.project_id.in_(p.id for p in projects))
@@ -170,6 +179,13 @@ async def list_projects_run_models(
         filters.append(RunModel.user_id == runs_user.id)
     if only_active:
         filters.append(RunModel.status.not_in(RunStatus.finished_statuses()))
+    if changed_after is not None:
+        filters.append(
+            or_(
+                RunModel.last_processed_at >= changed_after,
+                RunModel.jobs.any(JobModel.last_processed_at >= changed_after),
+            )
+        )
     if prev_submitted_at is not None:
         if ascending:
             if prev_run_id is None:
@@ -199,17 +215,73 @@ async def list_projects_run_models(
     if ascending:
         order_by = (RunModel.submitted_at.asc(), RunModel.id.desc())
 
+    options = [selectinload(RunModel.user)]
+    if projection != RunsListProjection.FULL:
+        # Jobs are set below
+        options.append(lazyload(RunModel.jobs))
+    if projection == RunsListProjection.SUMMARY:
+        options.append(
+            # Only the columns used by `run_model_to_run()`
+            load_only(
+                RunModel.id,
+                RunModel.deleted,
+                RunModel.project_id,
+                RunModel.user_id,
+                RunModel.submitted_at,
+                RunModel.last_processed_at,
+                RunModel.status,
+                RunModel.termination_reason,
+                RunModel.run_spec,
+                RunModel.service_spec,
+            )
+        )
     res = await session.execute(
-        select(RunModel)
-        .where(*filters)
-        .order_by(*order_by)
-        .limit(limit)
-        .options(selectinload(RunModel.user))
+        select(RunModel).where(*filters).order_by(*order_by).limit(limit).options(*options)
     )
     run_models = list(res.scalars().all())
+    if projection == RunsListProjection.LATEST_SUBMISSION:
+        await _load_latest_job_submissions(session=session, run_models=run_models)
+    elif projection == RunsListProjection.SUMMARY:
+        for run_model in run_models:
+            set_committed_value(run_model, "jobs", [])
     return run_models
 
 
+async def _load_latest_job_submissions(session: AsyncSession, run_models: List[RunModel]):
+    """
+    Sets `RunModel.jobs` to the latest submissions of the runs' jobs.
+    """
+    latest_submissions = (
+        select(
+            JobModel.run_id,
+            JobModel.replica_num,
+            JobModel.job_num,
+            func.max(JobModel.submission_num).label("submission_num"),
+        )
+        .where(JobModel.run_id.in_(r.id for r in run_models))
+        .group_by(JobModel.run_id, JobModel.replica_num, JobModel.job_num)
+        .subquery()
+    )
+    res = await session.execute(
+        select(JobModel)
+        .join(
+            latest_submissions,
+            and_(
+                JobModel.run_id == latest_submissions.c.run_id,
+                JobModel.replica_num == latest_submissions.c.replica_num,
+                JobModel.job_num == latest_submissions.c.job_num,
+                JobModel.submission_num == latest_submissions.c.submission_num,
+            ),
+        )
+        .order_by(JobModel.replica_num, JobModel.job_num)
+    )
+    run_jobs = {r.id: [] for r in run_models}
+    for job_model in res.scalars().all():
+        run_jobs[job_model.run_id].append(job_model)
+    for run_model in run_models:
+        set_committed_value(run_model, "jobs", run_jobs[run_model.id])
+
+
 async def get_run(
     session: AsyncSession,
     project: ProjectModel,
@@ -606,7 +678,8 @@ async def delete_runs(
                 RunModel.project_id == project.id,
                 RunModel.run_name.in_(runs_names),
             )
-            .values(deleted=True)
+            # Bumping last_processed_at lets clients watching for changes see the deletion
+            .values(deleted=True, last_processed_at=common_utils.get_current_datetime())
         )
         await session.commit()
 
@@ -626,7 +699,7 @@ def run_model_to_run(
             submissions = []
             for job_model in job_submissions:
                 if job_spec is None:
-                    job_spec = JobSpec.__response__.parse_raw(job_model.job_spec_data)
+                    job_spec = parse_raw_cached(JobSpec.__response__, job_model.job_spec_data)
                 if include_job_submissions:
                     job_submission = job_model_to_job_submission(job_model)
                     if return_in_api:
@@ -641,7 +714,7 @@ def run_model_to_run(
             if job_spec is not None:
                 jobs.append(Job(job_spec=job_spec, job_submissions=submissions))
 
-    run_spec = RunSpec.__response__.parse_raw(run_model.run_spec)
+    run_spec = parse_raw_cached(RunSpec.__response__, run_model.run_spec)
 
     latest_job_submission = None
     if include_job_submissions:
@@ -651,7 +724,7 @@ def run_model_to_run(
 
     service_spec = None
     if run_model.service_spec is not None:
-        service_spec = ServiceSpec.__response__.parse_raw(run_model.service_spec)
+        service_spec = parse_raw_cached(ServiceSpec.__response__, run_model.service_spec)
 
     run = Run(
         id=run_model.id,
@@ -680,8 +753,13 @@ async def _get_pool_offers(
 ) -> list[InstanceOfferWithAvailability]:
     pool_offers: list[InstanceOfferWithAvailability] = []
 
-    detaching_instances_ids = await get_instances_ids_with_detaching_volumes(session)
-    pool_instances = [i for i in get_pool_instances(pool) if i.id not in detaching_instances_ids]
+    pool_instances = get_pool_instances(pool)
+    detaching_instances_ids = set(
+        await get_instances_ids_with_detaching_volumes(
+            session, instances_ids=[i.id for i in pool_instances]
+        )
+    )
+    pool_instances = [i for i in pool_instances if i.id not in detaching_instances_ids]
     multinode = job.job_spec.jobs_per_replica > 1
 
     if not multinode:
@@ -39,6 +39,7 @@ from dstack._internal.server.services.locking import (
 from dstack._internal.server.services.pools import get_instance_provisioning_data
 from dstack._internal.server.services.projects import list_project_models, list_user_project_models
 from dstack._internal.utils import common, random_names
+from dstack._internal.utils.executors import cloud_api_executor
 from dstack._internal.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -408,7 +409,7 @@ async def _delete_volume(session: AsyncSession, project: ProjectModel, volume_mo
         )
         return
 
-    await common.run_async(
+    await cloud_api_executor.run(
         backend.compute().delete_volume,
         volume=volume,
     )
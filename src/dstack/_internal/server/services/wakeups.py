@@ -0,0 +1,196 @@
+"""
+In-process notifications that wake background processors up when there is new work for them,
+e.g. a run is submitted or a job changes its status, instead of waiting for the next poll.
+
+Status changes of runs, jobs, and instances are detected automatically on flush and published
+after the transaction commits. With Postgres, the notifications are also sent to other server
+replicas via LISTEN/NOTIFY.
+"""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from dstack._internal.core.models.instances import InstanceStatus
+from dstack._internal.core.models.runs import JobStatus
+from dstack._internal.server import settings
+from dstack._internal.server.db import get_db
+from dstack._internal.server.models import InstanceModel, JobModel, RunModel
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PG_CHANNEL = "dstack_wakeups"
+
+
+class WakeupTopic(str, Enum):
+    RUNS = "runs"
+    SUBMITTED_JOBS = "submitted_jobs"
+    RUNNING_JOBS = "running_jobs"
+    TERMINATING_JOBS = "terminating_jobs"
+    INSTANCES = "instances"
+
+
+class WakeupBus:
+    """
+    Runs subscribed coroutines when their topics are published.
+    Wakeups are coalesced: if a handler is already running, it's run once more after it finishes
+    no matter how many times its topic has been published in the meantime.
+    """
+
+    def __init__(self) -> None:
+        self.replica_id = uuid.uuid4().hex
+        self._handlers: Dict[WakeupTopic, List[Callable[[], Awaitable[Any]]]] = defaultdict(list)
+        self._running: Set[Callable[[], Awaitable[Any]]] = set()
+        self._pending: Set[Callable[[], Awaitable[Any]]] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._pg_connection = None
+
+    def subscribe(self, topic: WakeupTopic, handler: Callable[[], Awaitable[Any]]) -> None:
+        self._handlers[topic].append(handler)
+
+    def publish(self, topics: Iterable[WakeupTopic]) -> None:
+        """
+        Wakes up the handlers of the topics. Must be called from the event loop thread.
+        """
+        handlers = {h for topic in topics for h in self._handlers.get(topic, [])}
+        if not handlers:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Committed outside of the event loop, e.g. in a worker thread.
+            # Polling will pick the changes up.
+            return
+        for handler in handlers:
+            if handler in self._running:
+                self._pending.add(handler)
+                continue
+            self._running.add(handler)
+            task = loop.create_task(self._run(handler))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def start_listening(self) -> None:
+        """
+        Starts receiving notifications published by other replicas. Postgres only.
+        """
+        if get_db().dialect_name != "postgresql":
+            return
+        connection = await get_db().engine.connect()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.add_listener(PG_CHANNEL, self._on_pg_notification)
+        self._pg_connection = connection
+
+    async def stop_listening(self) -> None:
+        if self._pg_connection is not None:
+            await self._pg_connection.close()
+            self._pg_connection = None
+
+    async def _run(self, handler: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            while True:
+                self._pending.discard(handler)
+                try:
+                    await handler()
+                except Exception:
+                    logger.exception("Error processing wakeup")
+                if handler not in self._pending:
+                    return
+        finally:
+            self._running.discard(handler)
+
+    def _on_pg_notification(self, connection, pid, channel: str, payload: str) -> None:
+        replica_id, _, topics = payload.partition(":")
+        if replica_id == self.replica_id:
+            return
+        self.publish(_parse_topics(topics))
+
+
+_wakeup_bus = WakeupBus()
+
+
+def get_wakeup_bus() -> WakeupBus:
+    return _wakeup_bus
+
+
+def get_topics_for_job_status(
+    old_status: Optional[JobStatus], new_status: JobStatus
+) -> Set[WakeupTopic]:
+    topics = {WakeupTopic.RUNS}
+    new_topic = _JOB_STATUS_TOPICS.get(new_status)
+    if new_topic is not None and new_topic != _JOB_STATUS_TOPICS.get(old_status):
+        topics.add(new_topic)
+    return topics
+
+
+_JOB_STATUS_TOPICS = {
+    JobStatus.SUBMITTED: WakeupTopic.SUBMITTED_JOBS,
+    JobStatus.PROVISIONING: WakeupTopic.RUNNING_JOBS,
+    JobStatus.PULLING: WakeupTopic.RUNNING_JOBS,
+    JobStatus.RUNNING: WakeupTopic.RUNNING_JOBS,
+    JobStatus.TERMINATING: WakeupTopic.TERMINATING_JOBS,
+}
+
+_INSTANCE_WAKEUP_STATUSES = {InstanceStatus.PENDING, InstanceStatus.TERMINATING}
+
+_SESSION_INFO_KEY = "wakeup_topics"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_topics(session: Session, flush_context) -> None:
+    if not settings.BACKGROUND_WAKEUPS_ENABLED:
+        return
+    topics: Set[WakeupTopic] = set()
+    for obj in (*session.new, *session.dirty):
+        if not isinstance(obj, (RunModel, JobModel, InstanceModel)):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.added:
+            continue
+        old_status = history.deleted[0] if history.deleted else None
+        new_status = history.added[0]
+        if isinstance(obj, RunModel):
+            topics.add(WakeupTopic.RUNS)
+        elif isinstance(obj, JobModel):
+            topics.update(get_topics_for_job_status(old_status, new_status))
+        elif new_status in _INSTANCE_WAKEUP_STATUSES:
+            topics.add(WakeupTopic.INSTANCES)
+    if not topics:
+        return
+    session.info.setdefault(_SESSION_INFO_KEY, set()).update(topics)
+    if session.get_bind().dialect.name == "postgresql":
+        # NOTIFY is transactional, other replicas get it only if the transaction commits
+        payload = f"{_wakeup_bus.replica_id}:{_format_topics(topics)}"
+        session.connection().execute(select(func.pg_notify(PG_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_topics(session: Session) -> None:
+    topics = session.info.pop(_SESSION_INFO_KEY, None)
+    if topics:
+        _wakeup_bus.publish(topics)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_topics(session: Session, previous_transaction) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def _format_topics(topics: Iterable[WakeupTopic]) -> str:
+    return ",".join(sorted(t.value for t in topics))
+
+
+def _parse_topics(s: str) -> List[WakeupTopic]:
+    topics = []
+    for value in s.split(","):
+        try:
+            topics.append(WakeupTopic(value))
+        except ValueError:
+            pass  # sent by a replica of another version
+    return topics
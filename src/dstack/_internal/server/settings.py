@@ -43,7 +43,64 @@ SERVER_CLOUDWATCH_LOG_REGION = os.getenv("DSTACK_SERVER_CLOUDWATCH_LOG_REGION")
 
 SERVER_GCP_LOGGING_PROJECT = os.getenv("DSTACK_SERVER_GCP_LOGGING_PROJECT")
 
+# The format of new log files if logs are stored on the file system: json or binary
+SERVER_FILE_LOG_FORMAT = os.getenv("DSTACK_SERVER_FILE_LOG_FORMAT", "json").lower()
+# Compress binary log files with zstd. Requires zstandard
+SERVER_FILE_LOG_COMPRESSION = os.getenv("DSTACK_SERVER_FILE_LOG_COMPRESSION") is not None
+
+# Buffer logs pulled from runners in memory and write them to the log storage in batches
+SERVER_LOG_WRITE_BUFFER_ENABLED = os.getenv("DSTACK_SERVER_LOG_WRITE_BUFFER_ENABLED") is not None
+SERVER_LOG_WRITE_BUFFER_FLUSH_INTERVAL = float(
+    os.getenv("DSTACK_SERVER_LOG_WRITE_BUFFER_FLUSH_INTERVAL", 2)
+)
+SERVER_LOG_WRITE_BUFFER_MAX_EVENTS = int(
+    os.getenv("DSTACK_SERVER_LOG_WRITE_BUFFER_MAX_EVENTS", 10000)
+)
+
 SERVER_METRICS_TTL_SECONDS = int(os.getenv("DSTACK_SERVER_METRICS_TTL_SECONDS", 3600))
+# Metrics aggregated over 1m and 10m buckets are kept longer to query metrics history
+SERVER_METRICS_ROLLUP_1M_TTL_SECONDS = int(
+    os.getenv("DSTACK_SERVER_METRICS_ROLLUP_1M_TTL_SECONDS", 7 * 24 * 3600)
+)
+SERVER_METRICS_ROLLUP_10M_TTL_SECONDS = int(
+    os.getenv("DSTACK_SERVER_METRICS_ROLLUP_10M_TTL_SECONDS", 30 * 24 * 3600)
+)
+
+# The maximum number of parsed JSON columns (run specs, job specs, provisioning data) cached.
+# 0 disables the cache.
+SERVER_PARSED_MODELS_CACHE_SIZE = int(os.getenv("DSTACK_SERVER_PARSED_MODELS_CACHE_SIZE", 4096))
+
+# Background processors claim up to BATCH_CLAIM_SIZE rows per query if enabled
+# and process them with up to BATCH_CLAIM_MAX_WORKERS concurrent workers
+BACKGROUND_BATCH_CLAIM_ENABLED = (
+    os.getenv("DSTACK_SERVER_BACKGROUND_BATCH_CLAIM_ENABLED") is not None
+)
+BACKGROUND_BATCH_CLAIM_SIZE = int(os.getenv("DSTACK_SERVER_BACKGROUND_BATCH_CLAIM_SIZE", 50))
+BACKGROUND_BATCH_CLAIM_MAX_WORKERS = int(
+    os.getenv("DSTACK_SERVER_BACKGROUND_BATCH_CLAIM_MAX_WORKERS", 5)
+)
+
+# Wake background processors up on runs/jobs/instances status changes instead of waiting
+# for the next poll. Polling of event-driven processors is slowed down by POLLING_FACTOR.
+BACKGROUND_WAKEUPS_ENABLED = os.getenv("DSTACK_SERVER_BACKGROUND_WAKEUPS_ENABLED") is not None
+BACKGROUND_WAKEUPS_POLLING_FACTOR = int(
+    os.getenv("DSTACK_SERVER_BACKGROUND_WAKEUPS_POLLING_FACTOR", 3)
+)
+
+# Long-lived multiplexed SSH connections to instances used for runner/shim API calls
+RUNNER_SSH_TUNNEL_POOL_ENABLED = (
+    os.getenv("DSTACK_SERVER_RUNNER_SSH_TUNNEL_POOL_ENABLED") is not None
+)
+RUNNER_SSH_TUNNEL_POOL_IDLE_TIMEOUT = int(
+    os.getenv("DSTACK_SERVER_RUNNER_SSH_TUNNEL_POOL_IDLE_TIMEOUT", 300)
+)
+RUNNER_SSH_TUNNEL_POOL_CHECK_INTERVAL = int(
+    os.getenv("DSTACK_SERVER_RUNNER_SSH_TUNNEL_POOL_CHECK_INTERVAL", 30)
+)
+
+# How the in-server proxy chooses replicas of services without gateways:
+# random, least-requests, ewma-latency, or power-of-two-choices
+SERVER_PROXY_REPLICA_BALANCING = os.getenv("DSTACK_SERVER_PROXY_REPLICA_BALANCING", "random")
 
 DEFAULT_PROJECT_NAME = "main"
 
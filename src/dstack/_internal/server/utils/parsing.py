@@ -0,0 +1,52 @@
+import hashlib
+from typing import Type, TypeVar
+
+from pydantic import BaseModel
+
+from dstack._internal.server import settings
+from dstack._internal.utils.cache import CacheStats, SingleFlightCache
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+_parsed_models_cache: SingleFlightCache = SingleFlightCache(
+    maxsize=settings.SERVER_PARSED_MODELS_CACHE_SIZE, ttl=float("inf")
+)
+
+
+def parse_raw_cached(model: Type[ModelT], raw: str) -> ModelT:
+    """
+    Same as `model.parse_raw(raw)` but caches parsed models by the JSON content,
+    so that JSON columns that rarely change, e.g. `job_spec_data` or `run_spec`,
+    are not parsed every time the row is loaded.
+
+    Returns a shallow copy of the cached model, so callers can reassign its fields
+    but must not mutate nested models in place.
+    """
+    if settings.SERVER_PARSED_MODELS_CACHE_SIZE <= 0:
+        return model.parse_raw(raw)
+    key = (model, hashlib.blake2b(raw.encode(), digest_size=16).digest())
+    parsed = _parsed_models_cache.get(key, lambda: model.parse_raw(raw))
+    # Not `parsed.copy()` since it drops fields excluded from export, e.g. `merged_profile`
+    return parsed.__class__.construct(_fields_set=parsed.__fields_set__, **parsed.__dict__)
+
+
+def get_parsed_models_cache_stats() -> CacheStats:
+    return _parsed_models_cache.stats
+
+
+def log_parsed_models_cache_stats() -> None:
+    stats = get_parsed_models_cache_stats()
+    logger.debug(
+        "The parsed models cache: %s hits, %s misses, %s entries",
+        stats.hits,
+        stats.misses,
+        stats.size,
+    )
+
+
+def clear_parsed_models_cache() -> None:
+    _parsed_models_cache.clear()
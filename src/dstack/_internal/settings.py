@@ -6,6 +6,29 @@ DSTACK_VERSION = os.getenv("DSTACK_VERSION", version.__version__)
 DSTACK_RELEASE = os.getenv("DSTACK_RELEASE") is not None or version.__is_release__
 DSTACK_USE_LATEST_FROM_BRANCH = os.getenv("DSTACK_USE_LATEST_FROM_BRANCH") is not None
 
+# Backend offers cache, per backend
+OFFERS_CACHE_SIZE = int(os.getenv("DSTACK_OFFERS_CACHE_SIZE", 64))
+OFFERS_CACHE_TTL = int(os.getenv("DSTACK_OFFERS_CACHE_TTL", 30))
+# How long expired offers are still returned while being refreshed in the background
+OFFERS_CACHE_STALE_TTL = int(os.getenv("DSTACK_OFFERS_CACHE_STALE_TTL", 60))
+
+# AWS quotas and availability zones, per region and credentials
+AWS_REGION_METADATA_CACHE_TTL = int(os.getenv("DSTACK_AWS_REGION_METADATA_CACHE_TTL", 600))
+AWS_REGION_METADATA_CACHE_STALE_TTL = int(
+    os.getenv("DSTACK_AWS_REGION_METADATA_CACHE_STALE_TTL", 3600)
+)
+AWS_RESERVATIONS_CACHE_TTL = int(os.getenv("DSTACK_AWS_RESERVATIONS_CACHE_TTL", 60))
+AWS_RESERVATIONS_CACHE_STALE_TTL = int(os.getenv("DSTACK_AWS_RESERVATIONS_CACHE_STALE_TTL", 0))
+
+# Thread pools for blocking calls made from async code, per workload
+EXECUTOR_CLOUD_API_MAX_WORKERS = int(os.getenv("DSTACK_EXECUTOR_CLOUD_API_MAX_WORKERS", 32))
+EXECUTOR_SSH_MAX_WORKERS = int(os.getenv("DSTACK_EXECUTOR_SSH_MAX_WORKERS", 32))
+EXECUTOR_SSH_DEPLOY_MAX_WORKERS = int(os.getenv("DSTACK_EXECUTOR_SSH_DEPLOY_MAX_WORKERS", 8))
+EXECUTOR_STORAGE_IO_MAX_WORKERS = int(os.getenv("DSTACK_EXECUTOR_STORAGE_IO_MAX_WORKERS", 16))
+EXECUTOR_CPU_MAX_WORKERS = int(
+    os.getenv("DSTACK_EXECUTOR_CPU_MAX_WORKERS", min(4, os.cpu_count() or 1))
+)
+
 
 class FeatureFlags:
     """
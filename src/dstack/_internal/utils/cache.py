@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    # Expired values served while being refreshed in the background
+    stale_hits: int = 0
+    misses: int = 0
+    # Misses that waited for a load already in progress instead of loading
+    coalesced: int = 0
+    load_errors: int = 0
+    size: int = 0
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            **{f.name: getattr(self, f.name) + getattr(other, f.name) for f in fields(self)}
+        )
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    loaded_at: float
+
+
+class SingleFlightCache(Generic[K, V]):
+    """
+    A thread-safe LRU cache with TTL that:
+
+    * coalesces concurrent misses of the same key into a single load (single-flight);
+    * serves expired values for `stale_ttl` more seconds while refreshing them in the
+      background (stale-while-revalidate), so that callers don't wait for the load.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        stale_ttl: float = 0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._timer = timer
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._inflight: Dict[K, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: K, load: Callable[[], V]) -> V:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._timer() - entry.loaded_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._stats.stale_hits += 1
+                    if key not in self._inflight:
+                        future = Future()
+                        self._inflight[key] = future
+                        _get_refresh_executor().submit(self._load, key, load, future)
+                    return entry.value
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                self._stats.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._stats.coalesced += 1
+        if is_leader:
+            self._load(key, load, future)
+        return future.result()
+
+    def peek(self, key: K) -> Optional[V]:
+        """
+        Returns the cached value, even if expired, without loading or refreshing it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                stale_hits=self._stats.stale_hits,
+                misses=self._stats.misses,
+                coalesced=self._stats.coalesced,
+                load_errors=self._stats.load_errors,
+                size=len(self._entries),
+            )
+
+    def _load(self, key: K, load: Callable[[], V], future: Future) -> None:
+        try:
+            value = load()
+        except BaseException as e:
+            with self._lock:
+                self._stats.load_errors += 1
+                self._inflight.pop(key, None)
+            logger.debug("Failed to load cache key %s: %r", key, e)
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value=value, loaded_at=self._timer())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_executor_lock = threading.Lock()
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="dstack-cache-refresh"
+            )
+        return _refresh_executor
@@ -0,0 +1,190 @@
+"""
+Named thread pools for blocking work done from async code, so that one kind of work,
+e.g. slow cloud API calls, cannot starve another, e.g. runner polling over SSH.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Optional, TypeVar
+
+from typing_extensions import ParamSpec
+
+from dstack._internal import settings
+from dstack._internal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class ExecutorStats:
+    name: str
+    max_workers: int
+    # Tasks being run
+    active: int
+    # Tasks waiting for a free worker
+    queued: int
+    completed: int
+    # The longest time a task waited for a free worker, in seconds
+    max_wait_time: float
+
+
+class NamedExecutor:
+    """
+    A bounded thread pool that tracks its queue depth and warns if tasks wait
+    for a free worker longer than `saturation_warning_wait_time` seconds.
+    """
+
+    # Saturation warnings are logged at most once per this interval
+    WARNING_INTERVAL = 60
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        saturation_warning_wait_time: float = 5,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.saturation_warning_wait_time = saturation_warning_wait_time
+        self._timer = timer
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+        self._max_wait_time = 0.0
+        self._last_warning_at: Optional[float] = None
+
+    async def run(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        func_with_args = partial(func, *args, **kwargs)
+        with self._lock:
+            self._queued += 1
+        submitted_at = self._timer()
+        future = self._get_executor().submit(self._run_task, func_with_args, submitted_at)
+        future.add_done_callback(self._on_task_done)
+        return await asyncio.wrap_future(future)
+
+    @property
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                name=self.name,
+                max_workers=self.max_workers,
+                active=self._active,
+                queued=self._queued,
+                completed=self._completed,
+                max_wait_time=self._max_wait_time,
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _run_task(self, func: Callable[[], R], submitted_at: float) -> R:
+        wait_time = self._timer() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+            queued = self._queued
+        if wait_time >= self.saturation_warning_wait_time:
+            self._warn_saturated(wait_time, queued)
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def _on_task_done(self, future: Future) -> None:
+        # A task cancelled while queued never runs, so it's not counted by `_run_task()`
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _warn_saturated(self, wait_time: float, queued: int) -> None:
+        now = self._timer()
+        with self._lock:
+            if (
+                self._last_warning_at is not None
+                and now - self._last_warning_at < self.WARNING_INTERVAL
+            ):
+                return
+            self._last_warning_at = now
+        logger.warning(
+            "The %s executor is saturated: a task waited %.1fs for one of %s workers,"
+            " %s more tasks are queued. Consider increasing its size.",
+            self.name,
+            wait_time,
+            self.max_workers,
+            queued,
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"dstack-{self.name}"
+                )
+            return self._executor
+
+
+# Cloud provider SDKs and other external HTTP APIs
+cloud_api_executor = NamedExecutor(
+    name="cloud-api", max_workers=settings.EXECUTOR_CLOUD_API_MAX_WORKERS
+)
+# SSH tunnels and runner/shim API calls through them
+ssh_executor = NamedExecutor(name="ssh", max_workers=settings.EXECUTOR_SSH_MAX_WORKERS)
+# Deploying shims to SSH fleet hosts, which takes minutes per host,
+# so that it does not delay runner/shim polling in `ssh_executor`
+ssh_deploy_executor = NamedExecutor(
+    name="ssh-deploy", max_workers=settings.EXECUTOR_SSH_DEPLOY_MAX_WORKERS
+)
+# Log storage, code storage, and local files
+storage_io_executor = NamedExecutor(
+    name="storage-io", max_workers=settings.EXECUTOR_STORAGE_IO_MAX_WORKERS
+)
+# CPU-bound work, e.g. key generation
+cpu_executor = NamedExecutor(name="cpu", max_workers=settings.EXECUTOR_CPU_MAX_WORKERS)
+
+_executors: List[NamedExecutor] = [
+    cloud_api_executor,
+    ssh_executor,
+    ssh_deploy_executor,
+    storage_io_executor,
+    cpu_executor,
+]
+
+
+def get_executors_stats() -> List[ExecutorStats]:
+    return [executor.stats for executor in _executors]
+
+
+def log_executors_stats() -> None:
+    for stats in get_executors_stats():
+        logger.debug(
+            "The %s executor: %s/%s workers active, %s tasks queued, %s completed,"
+            " max wait time %.1fs",
+            stats.name,
+            stats.active,
+            stats.max_workers,
+            stats.queued,
+            stats.completed,
+            stats.max_wait_time,
+        )
+
+
+def shutdown_executors() -> None:
+    for executor in _executors:
+        executor.shutdown()
@@ -188,6 +188,7 @@ class Run(ABC):
         diagnose: bool = False,
         replica_num: int = 0,
         job_num: int = 0,
+        follow: bool = False,
     ) -> Iterable[bytes]:
         """
         Iterate through run's log messages
@@ -195,6 +196,8 @@ class Run(ABC):
         Args:
             start_time: minimal log timestamp
             diagnose: return runner logs if `True`
+            follow: stream new log messages as they are written until the job finishes
+                instead of returning after the already written ones
 
         Yields:
             log messages
@@ -205,6 +208,22 @@ class Run(ABC):
             job = self._find_job(replica_num=replica_num, job_num=job_num)
             if job is None:
                 return []
+            if follow:
+                for resp in self._api_client.logs.stream(
+                    project_name=self._project,
+                    body=PollLogsRequest(
+                        run_name=self.name,
+                        job_submission_id=job.job_submissions[-1].id,
+                        start_time=start_time,
+                        end_time=None,
+                        descending=False,
+                        limit=1000,
+                        diagnose=diagnose,
+                    ),
+                ):
+                    for log in resp.logs:
+                        yield base64.b64decode(log.message)
+                return []
             next_start_time = start_time
             while True:
                 resp = self._api_client.logs.poll(
@@ -645,6 +664,18 @@ class RunCollection:
         except ResourceNotExistsError:
             return None
 
+    def from_model(self, run: RunModel) -> Run:
+        """
+        Get run from the run model returned by `APIClient.runs`
+
+        Args:
+            run: run model
+
+        Returns:
+            The run
+        """
+        return self._model_to_run(run)
+
     def _model_to_run(self, run: RunModel) -> Run:
         return Run(
             self._api_client,
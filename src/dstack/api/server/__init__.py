@@ -6,7 +6,7 @@ from typing import Dict, List, Optional, Type
 import requests
 
 from dstack import version
-from dstack._internal.core.errors import ClientError, ServerClientError
+from dstack._internal.core.errors import ClientError, ServerClientError, ServerValidationError
 from dstack._internal.utils.logging import get_logger
 from dstack.api.server._backends import BackendsAPIClient
 from dstack.api.server._fleets import FleetsAPIClient
@@ -151,7 +151,7 @@ class APIClient:
                     raise _server_client_errors[code](**kwargs)
             if resp.status_code == 422:
                 formatted_error = pprint.pformat(resp.json())
-                raise ClientError(f"Server validation error: \n{formatted_error}")
+                raise ServerValidationError(f"Server validation error: \n{formatted_error}")
             if resp.status_code == 403:
                 raise ClientError(
                     f"Access to {resp.request.url} is denied. Please check your access token"
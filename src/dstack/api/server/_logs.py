@@ -1,3 +1,6 @@
+import json
+from typing import Iterator
+
 from pydantic import parse_obj_as
 
 from dstack._internal.core.models.logs import JobSubmissionLogs
@@ -9,3 +12,15 @@ class LogsAPIClient(APIClientGroup):
     def poll(self, project_name: str, body: PollLogsRequest) -> JobSubmissionLogs:
         resp = self._request(f"/api/project/{project_name}/logs/poll", body=body.json())
         return parse_obj_as(JobSubmissionLogs.__response__, resp.json())
+
+    def stream(self, project_name: str, body: PollLogsRequest) -> Iterator[JobSubmissionLogs]:
+        """
+        Yields new logs as they are written until the job submission finishes.
+        """
+        resp = self._request(
+            f"/api/project/{project_name}/logs/stream", body=body.json(), stream=True
+        )
+        with resp:
+            for line in resp.iter_lines():
+                if line.startswith(b"data:"):
+                    yield parse_obj_as(JobSubmissionLogs.__response__, json.loads(line[5:]))
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Optional
+
 from pydantic import parse_obj_as
 
 from dstack._internal.core.models.metrics import JobMetrics
@@ -11,13 +14,23 @@ class MetricsAPIClient(APIClientGroup):
         run_name: str,
         replica_num: int = 0,
         job_num: int = 0,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        limit: Optional[int] = None,
     ) -> JobMetrics:
+        params = {
+            "replica_num": replica_num,
+            "job_num": job_num,
+        }
+        if after is not None:
+            params["after"] = after.isoformat()
+        if before is not None:
+            params["before"] = before.isoformat()
+        if limit is not None:
+            params["limit"] = limit
         resp = self._request(
             f"/api/project/{project_name}/metrics/job/{run_name}",
             method="GET",
-            params={
-                "replica_num": replica_num,
-                "job_num": job_num,
-            },
+            params=params,
         )
         return parse_obj_as(JobMetrics.__response__, resp.json())
@@ -29,6 +29,7 @@ from dstack._internal.server.schemas.runs import (
     GetRunPlanRequest,
     GetRunRequest,
     ListRunsRequest,
+    RunsListProjection,
     StopRunsRequest,
     SubmitRunRequest,
 )
@@ -46,6 +47,8 @@ class RunsAPIClient(APIClientGroup):
         prev_run_id: Optional[UUID] = None,
         limit: int = 100,
         ascending: bool = False,
+        changed_after: Optional[datetime] = None,
+        projection: RunsListProjection = RunsListProjection.FULL,
     ) -> List[Run]:
         body = ListRunsRequest(
             project_name=project_name,
@@ -56,8 +59,18 @@ class RunsAPIClient(APIClientGroup):
             prev_run_id=prev_run_id,
             limit=limit,
             ascending=ascending,
+            changed_after=changed_after,
+            projection=projection,
         )
-        resp = self._request("/api/runs/list", body=body.json())
+        # `changed_after` and `projection` are not supported in older servers,
+        # so they're only sent if set. Older servers return all job submissions.
+        excludes = set()
+        if changed_after is None:
+            excludes.add("changed_after")
+        if projection == RunsListProjection.FULL:
+            excludes.add("projection")
+        json_body = body.json(exclude=excludes)
+        resp = self._request("/api/runs/list", body=json_body)
         return parse_obj_as(List[Run.__response__], resp.json())
 
     def get(self, project_name: str, run_name: str) -> Run:
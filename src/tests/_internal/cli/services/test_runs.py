@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from unittest.mock import MagicMock, Mock
+
+from dstack._internal.cli.services.runs import CHANGES_CURSOR_MARGIN, RunsWatcher
+from dstack._internal.core.errors import ServerValidationError
+from dstack._internal.core.models.runs import RunStatus
+from dstack._internal.server.schemas.runs import RunsListProjection
+
+
+def _make_run(
+    run_name: str,
+    status: RunStatus,
+    submitted_at: datetime,
+    last_processed_at: Optional[datetime] = None,
+    deleted: bool = False,
+    run_id: Optional[uuid.UUID] = None,
+) -> Mock:
+    run = Mock()
+    run.id = run_id or uuid.uuid4()
+    run.run_spec.run_name = run_name
+    run.status = status
+    run.submitted_at = submitted_at
+    run.last_processed_at = last_processed_at or submitted_at
+    run.deleted = deleted
+    run.jobs = []
+    return run
+
+
+def _make_api(list_results: List[List[Mock]]) -> MagicMock:
+    api = MagicMock()
+    api.client.runs.list.side_effect = list_results
+    api.runs.from_model.side_effect = lambda r: r
+    return api
+
+
+class TestRunsWatcher:
+    def test_merges_changed_runs(self):
+        t = datetime(2023, 1, 2, 3, 4, tzinfo=timezone.utc)
+        active_run = _make_run("active", RunStatus.RUNNING, submitted_at=t)
+        finished_run = _make_run("finished", RunStatus.DONE, submitted_at=t - timedelta(hours=1))
+        updated_run = _make_run(
+            "active",
+            RunStatus.DONE,
+            submitted_at=t,
+            last_processed_at=t + timedelta(minutes=5),
+            run_id=active_run.id,
+        )
+        new_run = _make_run("new", RunStatus.SUBMITTED, submitted_at=t + timedelta(minutes=1))
+        api = _make_api([[active_run], [finished_run], [updated_run, new_run]])
+        watcher = RunsWatcher(api=api, all=False)
+        watcher.update()
+        assert watcher.list() == [active_run]
+        watcher.update()
+        assert watcher.list() == [new_run]
+        assert watcher.get("active") is updated_run
+        assert api.client.runs.list.call_args.kwargs["changed_after"] == t - CHANGES_CURSOR_MARGIN
+
+    def test_shows_latest_run_if_no_active_runs(self):
+        t = datetime(2023, 1, 2, 3, 4, tzinfo=timezone.utc)
+        finished_run = _make_run("finished", RunStatus.DONE, submitted_at=t)
+        api = _make_api([[], [finished_run], []])
+        watcher = RunsWatcher(api=api, all=False)
+        watcher.update()
+        watcher.update()
+        assert watcher.list() == [finished_run]
+
+    def test_removes_deleted_runs(self):
+        t = datetime(2023, 1, 2, 3, 4, tzinfo=timezone.utc)
+        run = _make_run("run", RunStatus.DONE, submitted_at=t)
+        deleted_run = _make_run(
+            "run",
+            RunStatus.DONE,
+            submitted_at=t,
+            last_processed_at=t + timedelta(minutes=1),
+            deleted=True,
+            run_id=run.id,
+        )
+        api = _make_api([[run], [deleted_run]])
+        watcher = RunsWatcher(api=api, all=True)
+        watcher.update()
+        assert watcher.list() == [run]
+        watcher.update()
+        assert watcher.list() == []
+        assert watcher.get("run") is None
+
+    def test_lists_all_runs_if_server_does_not_support_changes(self):
+        t = datetime(2023, 1, 2, 3, 4, tzinfo=timezone.utc)
+        run = _make_run("run", RunStatus.RUNNING, submitted_at=t)
+        updated_run = _make_run(
+            "run",
+            RunStatus.DONE,
+            submitted_at=t,
+            last_processed_at=t + timedelta(minutes=1),
+            run_id=run.id,
+        )
+        api = _make_api(
+            [
+                [run],
+                ServerValidationError("Server validation error"),
+                [updated_run],
+                [updated_run],
+            ]
+        )
+        watcher = RunsWatcher(api=api, all=True)
+        watcher.update()
+        watcher.update()
+        assert watcher.list() == [updated_run]
+        watcher.update()
+        assert api.client.runs.list.call_count == 4
+        last_call_kwargs = api.client.runs.list.call_args.kwargs
+        assert "changed_after" not in last_call_kwargs
+        assert last_call_kwargs["projection"] == RunsListProjection.FULL
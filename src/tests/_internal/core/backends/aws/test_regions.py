@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, patch
+
+from dstack._internal.core.backends.aws.regions import (
+    RegionMetadata,
+    RegionMetadataCache,
+    get_credentials_key,
+    has_quota,
+)
+from dstack._internal.core.models.backends.aws import AWSAccessKeyCreds, AWSDefaultCreds
+
+
+class TestRegionMetadataCache:
+    def test_loads_each_region_once(self):
+        cache = RegionMetadataCache()
+        session = MagicMock()
+        metadata = RegionMetadata(quotas={"P/OnDemand": 8}, availability_zones=["us-east-1a"])
+        with patch(
+            "dstack._internal.core.backends.aws.regions._load_region_metadata",
+            return_value=metadata,
+        ) as load_mock:
+            result1 = cache.get_regions_metadata(session, "key", ["us-east-1", "us-west-2"])
+            result2 = cache.get_regions_metadata(session, "key", ["us-east-1"])
+        assert result1 == {"us-east-1": metadata, "us-west-2": metadata}
+        assert result2 == {"us-east-1": metadata}
+        assert load_mock.call_count == 2
+
+    def test_does_not_share_metadata_between_credentials(self):
+        cache = RegionMetadataCache()
+        session = MagicMock()
+        metadata = RegionMetadata(quotas={}, availability_zones=[])
+        with patch(
+            "dstack._internal.core.backends.aws.regions._load_region_metadata",
+            return_value=metadata,
+        ) as load_mock:
+            cache.get_regions_metadata(session, "key1", ["us-east-1"])
+            cache.get_regions_metadata(session, "key2", ["us-east-1"])
+        assert load_mock.call_count == 2
+
+    def test_returns_only_available_reservations(self):
+        cache = RegionMetadataCache()
+        session = MagicMock()
+        reservation = {"InstanceType": "p5.48xlarge"}
+        with patch(
+            "dstack._internal.core.backends.aws.resources.get_reservation",
+            side_effect=lambda ec2_client, reservation_id, instance_count: (
+                reservation if ec2_client is session.client.return_value else None
+            ),
+        ):
+            session.client.side_effect = lambda service, region_name: (
+                session.client.return_value if region_name == "us-east-1" else MagicMock()
+            )
+            result = cache.get_regions_reservations(
+                session, "key", ["us-east-1", "us-west-2"], "cr-123"
+            )
+        assert result == {"us-east-1": reservation}
+
+    def test_does_not_serve_expired_reservations(self):
+        cache = RegionMetadataCache(reservations_ttl=0)
+        session = MagicMock()
+        reservation = {"InstanceType": "p5.48xlarge"}
+        with patch(
+            "dstack._internal.core.backends.aws.resources.get_reservation",
+            side_effect=[reservation, None],
+        ) as get_reservation_mock:
+            result1 = cache.get_regions_reservations(session, "key", ["us-east-1"], "cr-123")
+            result2 = cache.get_regions_reservations(session, "key", ["us-east-1"], "cr-123")
+        assert result1 == {"us-east-1": reservation}
+        assert result2 == {}
+        assert get_reservation_mock.call_count == 2
+
+
+def test_get_credentials_key_does_not_contain_secrets():
+    creds = AWSAccessKeyCreds(access_key="AKIA", secret_key="secret")
+    key = get_credentials_key(creds)
+    assert "secret" not in key
+    assert key == get_credentials_key(AWSAccessKeyCreds(access_key="AKIA", secret_key="secret"))
+    assert key != get_credentials_key(AWSAccessKeyCreds(access_key="AKIA", secret_key="other"))
+    assert get_credentials_key(AWSDefaultCreds()) == "default"
+
+
+def test_has_quota():
+    quotas = {"P/OnDemand": 0, "G/OnDemand": 4}
+    assert not has_quota(quotas, "p5.48xlarge")
+    assert has_quota(quotas, "g5.xlarge")
+    assert not has_quota(quotas, "c5.xlarge")
@@ -0,0 +1,60 @@
+import gpuhunt
+import pytest
+
+from dstack._internal.core.backends.base.offers import (
+    OffersMatcher,
+    offer_to_catalog_item,
+    requirements_to_query_filter,
+)
+from dstack._internal.core.models.backends.base import BackendType
+from dstack._internal.core.models.resources import ResourcesSpec
+from dstack._internal.core.models.runs import Requirements
+from dstack._internal.server.services.offers import generate_shared_offer
+from dstack._internal.server.testing.common import get_instance_offer_with_availability
+
+OFFERS = [
+    get_instance_offer_with_availability(
+        backend=backend, gpu_count=gpu_count, cpu_count=cpu_count, memory_gib=memory_gib, spot=spot
+    )
+    for backend in [BackendType.AWS, BackendType.RUNPOD]
+    for gpu_count in [0, 1, 4]
+    for cpu_count in [2, 16]
+    for memory_gib in [8, 64]
+    for spot in [False, True]
+]
+
+REQUIREMENTS = [
+    Requirements(resources=ResourcesSpec()),
+    Requirements(resources=ResourcesSpec(cpu="4..", memory="16GB..")),
+    Requirements(resources=ResourcesSpec(gpu="T4:2..")),
+    Requirements(resources=ResourcesSpec(gpu="A100")),
+    Requirements(resources=ResourcesSpec(gpu="nvidia:16GB")),
+    Requirements(resources=ResourcesSpec(gpu="1..2", disk="200GB..")),
+    Requirements(resources=ResourcesSpec(gpu={"total_memory": "64GB.."}), spot=True),
+    Requirements(resources=ResourcesSpec(gpu={"compute_capability": "7.0"}), max_price=0.5),
+    Requirements(resources=ResourcesSpec(gpu={"vendor": "amd"})),
+]
+
+
+class TestOffersMatcher:
+    @pytest.mark.parametrize("requirements", REQUIREMENTS)
+    def test_matches_same_as_gpuhunt(self, requirements: Requirements):
+        matcher = OffersMatcher(requirements)
+        q = requirements_to_query_filter(requirements)
+        for offer in OFFERS:
+            expected = gpuhunt.matches(offer_to_catalog_item(offer), q)
+            assert matcher.matches(offer) == expected, offer
+
+    @pytest.mark.parametrize("requirements", REQUIREMENTS)
+    def test_finds_min_matching_blocks_same_as_gpuhunt(self, requirements: Requirements):
+        matcher = OffersMatcher(requirements)
+        q = requirements_to_query_filter(requirements)
+        for offer in OFFERS:
+            total_blocks = 4
+            expected = None
+            for blocks in range(1, total_blocks + 1):
+                shared_offer = generate_shared_offer(offer, blocks, total_blocks)
+                if gpuhunt.matches(offer_to_catalog_item(shared_offer), q):
+                    expected = blocks
+                    break
+            assert matcher.get_min_matching_blocks(offer, total_blocks) == expected, offer
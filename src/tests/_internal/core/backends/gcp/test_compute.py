@@ -0,0 +1,98 @@
+import json
+from typing import Optional
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from dstack._internal.core.backends.gcp.compute import GCPCompute
+from dstack._internal.core.errors import ProvisioningError
+from dstack._internal.core.models.backends.base import BackendType
+from dstack._internal.core.models.runs import JobProvisioningData
+from dstack._internal.server.testing.common import get_job_provisioning_data
+
+
+@pytest.fixture
+def compute() -> GCPCompute:
+    module = "dstack._internal.core.backends.gcp.compute"
+    with (
+        patch(f"{module}.auth.authenticate", return_value=(Mock(), None)),
+        patch(f"{module}.compute_v1"),
+        patch(f"{module}.tpu_v2"),
+    ):
+        return GCPCompute(Mock(project_id="test-project", allocate_public_ips=True))
+
+
+def make_provisioning_data(
+    instance_id: str, zone: str = "us-west1-a", is_tpu: bool = False
+) -> JobProvisioningData:
+    provisioning_data = get_job_provisioning_data(backend=BackendType.GCP, region="us-west1")
+    provisioning_data.instance_id = instance_id
+    provisioning_data.hostname = None
+    provisioning_data.internal_ip = None
+    provisioning_data.backend_data = json.dumps({"zone": zone, "is_tpu": is_tpu})
+    return provisioning_data
+
+
+def make_instance(name: str, status: str, ip: Optional[str] = None) -> MagicMock:
+    instance = MagicMock(status=status)
+    instance.name = name
+    instance.network_interfaces[0].access_configs[0].nat_i_p = ip
+    instance.network_interfaces[0].network_i_p = "10.0.0.1"
+    return instance
+
+
+class TestUpdateProvisioningDataBatch:
+    def test_lists_instances_per_zone(self, compute: GCPCompute):
+        compute.instances_client.list.side_effect = lambda request: {
+            "us-west1-a": [
+                make_instance("running", "RUNNING", ip="1.1.1.1"),
+                make_instance("staging", "STAGING"),
+            ],
+            "us-west1-b": [make_instance("other-zone", "RUNNING", ip="2.2.2.2")],
+        }[request.zone]
+        provisioning_data_list = [
+            make_provisioning_data("running"),
+            make_provisioning_data("staging"),
+            make_provisioning_data("not-found"),
+            make_provisioning_data("other-zone", zone="us-west1-b"),
+        ]
+        errors = compute.update_provisioning_data_batch(provisioning_data_list, "pub", "priv")
+        assert compute.instances_client.list.call_count == 2
+        request = compute.instances_client.list.call_args_list[0].kwargs["request"]
+        assert request.project == "test-project"
+        assert request.zone == "us-west1-a"
+        assert request.filter == (
+            '(name = "running") OR (name = "staging") OR (name = "not-found")'
+        )
+        assert [pd.hostname for pd in provisioning_data_list] == [
+            "1.1.1.1",
+            None,
+            None,
+            "2.2.2.2",
+        ]
+        assert errors[0] is None
+        assert errors[1] is None
+        assert isinstance(errors[2], ProvisioningError)
+        assert errors[3] is None
+
+    def test_updates_tpus_separately(self, compute: GCPCompute):
+        compute.instances_client.list.return_value = [make_instance("vm", "RUNNING", ip="1.1.1.1")]
+        provisioning_data_list = [
+            make_provisioning_data("vm"),
+            make_provisioning_data("tpu-1", is_tpu=True),
+            make_provisioning_data("tpu-2", is_tpu=True),
+        ]
+        with patch.object(
+            compute,
+            "update_provisioning_data",
+            side_effect=[None, ProvisioningError("Instance not found")],
+        ) as update_mock:
+            errors = compute.update_provisioning_data_batch(provisioning_data_list, "pub", "priv")
+        assert compute.instances_client.list.call_count == 1
+        assert sorted(c.args[0].instance_id for c in update_mock.call_args_list) == [
+            "tpu-1",
+            "tpu-2",
+        ]
+        assert errors[0] is None
+        assert provisioning_data_list[0].hostname == "1.1.1.1"
+        assert sum(isinstance(e, ProvisioningError) for e in errors[1:]) == 1
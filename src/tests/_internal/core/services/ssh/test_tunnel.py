@@ -245,6 +245,23 @@ class TestSSHTunnel:
         command = sample_tunnel_with_all_params.exec_command()
         assert command == ["/usr/bin/ssh", "-S", "/tmp/control.sock", "ubuntu@my-server"]
 
+    def test_forward_command(self, sample_tunnel_with_all_params: SSHTunnel) -> None:
+        command = sample_tunnel_with_all_params.forward_command(
+            ports_to_forwarded_sockets({10999: 40000, 10998: 40001})
+        )
+        assert command == [
+            "/usr/bin/ssh",
+            "-S",
+            "/tmp/control.sock",
+            "-O",
+            "forward",
+            "-L",
+            "localhost:40000:localhost:10999",
+            "-L",
+            "localhost:40001:localhost:10998",
+            "ubuntu@my-server",
+        ]
+
 
 def test_ports_to_forwarded_sockets() -> None:
     assert ports_to_forwarded_sockets({80: 8000, 22: 2200}, bind_local="::1") == [
@@ -3,6 +3,7 @@ from unittest.mock import patch
 
 import pytest
 
+from dstack._internal.proxy.gateway.services import registry
 from dstack._internal.proxy.gateway.testing.common import Mocks
 
 
@@ -11,9 +12,14 @@ def system_mocks() -> Generator[Mocks, None, None]:
     nginx = "dstack._internal.proxy.gateway.services.nginx"
     connection = "dstack._internal.proxy.lib.services.service_connection"
     with (
+        # asyncio locks cannot be shared between tests' event loops
+        patch.dict(registry.service_locks, clear=True),
+        patch.dict(registry._pending_replica_changes, clear=True),
         patch(f"{nginx}.sudo") as sudo,
+        patch(f"{nginx}.RELOAD_DEBOUNCE_TIME", 0),
         patch(f"{nginx}.Nginx.reload") as reload_nginx,
         patch(f"{nginx}.Nginx.run_certbot") as run_certbot,
+        patch(f"{nginx}.Nginx.certificate_exists", return_value=False),
         patch(f"{connection}.ServiceConnection.open") as open_conn,
         patch(f"{connection}.ServiceConnection.close") as close_conn,
     ):
@@ -1,4 +1,5 @@
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -35,3 +36,66 @@ async def test_persist_repo(tmp_path: Path) -> None:
     assert await repo.list_entrypoints() == [entrypoint_1]
     assert set(await repo.list_services()) == {srv_1, srv_2}
     assert await repo.list_models("proj-1") == [model_1]
+
+
+@pytest.mark.asyncio
+async def test_persist_repo_appends_changes_to_journal(tmp_path: Path) -> None:
+    file = tmp_path / "state-v2.json"
+    journal_file = tmp_path / "state-v2.json.journal"
+    repo = GatewayProxyRepo.load(file)
+    await repo.set_project(make_project("proj-1"))
+    await repo.set_service(make_service("proj-1", "run-1"))
+    await repo.set_service(make_service("proj-1", "run-2"))
+    await repo.delete_service("proj-1", "run-1")
+    await repo.set_model(make_model("proj-1", "model-1", run_name="run-2"))
+    await repo.delete_models_by_run("proj-1", "run-2")
+    await repo.delete_service("proj-1", "run-2")
+    assert not file.exists()
+    assert len(journal_file.read_text().splitlines()) == 7
+
+    repo = GatewayProxyRepo.load(file)
+    assert await repo.get_project("proj-1") == make_project("proj-1")
+    assert await repo.list_services() == []
+    assert await repo.list_models("proj-1") == []
+    assert repo._state.services == {}
+    assert repo._state.models == {}
+
+
+@pytest.mark.asyncio
+async def test_persist_repo_compacts_journal(tmp_path: Path) -> None:
+    file = tmp_path / "state-v2.json"
+    journal_file = tmp_path / "state-v2.json.journal"
+    repo = GatewayProxyRepo.load(file)
+    with patch("dstack._internal.proxy.gateway.repo.repo.JOURNAL_MAX_ENTRIES", 2):
+        await repo.set_service(make_service("proj-1", "run-1"))
+        await repo.set_service(make_service("proj-1", "run-2"))
+        assert not file.exists()
+        await repo.set_service(make_service("proj-1", "run-3"))
+        assert file.exists()
+        assert not journal_file.exists()
+        await repo.delete_service("proj-1", "run-1")
+        assert journal_file.exists()
+
+    repo = GatewayProxyRepo.load(file)
+    assert {s.run_name for s in await repo.list_services()} == {"run-2", "run-3"}
+
+
+@pytest.mark.asyncio
+async def test_load_repo_recovers_from_incomplete_journal_entry(tmp_path: Path) -> None:
+    file = tmp_path / "state-v2.json"
+    repo = GatewayProxyRepo.load(file)
+    await repo.set_project(make_project("proj-1"))
+    with (tmp_path / "state-v2.json.journal").open("a") as f:
+        f.write('{"path": ["projects", "proj-2"], "val')
+
+    repo = GatewayProxyRepo.load(file)
+    assert await repo.get_project("proj-1") == make_project("proj-1")
+    assert await repo.get_project("proj-2") is None
+    # changes after recovering are not lost
+    await repo.set_project(make_project("proj-3"))
+    await repo.set_project(make_project("proj-4"))
+
+    repo = GatewayProxyRepo.load(file)
+    assert await repo.get_project("proj-1") == make_project("proj-1")
+    assert await repo.get_project("proj-3") == make_project("proj-3")
+    assert await repo.get_project("proj-4") == make_project("proj-4")
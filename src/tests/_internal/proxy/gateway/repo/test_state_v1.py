@@ -457,8 +457,8 @@ async def test_not_migrates_if_migrated_before(tmp_path: Path) -> None:
 
     repo = GatewayProxyRepo.load(v2_file)
     await repo.set_project(make_project("test-proj"))
-    state_v2_after_write_operation = v2_file.read_text()
-    assert state_v2_after_write_operation != state_v2_after_initial_migration
 
     migrate_from_state_v1(v1_file, v2_file, keys_dir)
-    assert v2_file.read_text() == state_v2_after_write_operation
+    assert v2_file.read_text() == state_v2_after_initial_migration
+    repo = GatewayProxyRepo.load(v2_file)
+    assert await repo.get_project("test-proj") == make_project("test-proj")
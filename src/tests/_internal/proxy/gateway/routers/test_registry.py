@@ -1,7 +1,9 @@
+import asyncio
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from unittest.mock import patch
 
 import httpx
 import pytest
@@ -16,9 +18,9 @@ from dstack._internal.proxy.lib.models import ChatModel, OpenAIChatModelFormat
 
 
 def make_client(
-    nginx_conf_dir: Path, repo: Optional[GatewayProxyRepo] = None
+    nginx_conf_dir: Path, repo: Optional[GatewayProxyRepo] = None, nginx: Optional[Nginx] = None
 ) -> httpx.AsyncClient:
-    app = make_app(repo=repo or GatewayProxyRepo(), nginx=Nginx(conf_dir=nginx_conf_dir))
+    app = make_app(repo=repo or GatewayProxyRepo(), nginx=nginx or Nginx(conf_dir=nginx_conf_dir))
     return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/")
 
 
@@ -114,12 +116,14 @@ class TestRegisterService:
         assert "return 503;" in conf
 
     async def test_register_with_https(self, tmp_path: Path, system_mocks: Mocks) -> None:
-        client = make_client(tmp_path)
+        nginx = Nginx(conf_dir=tmp_path)
+        client = make_client(tmp_path, nginx=nginx)
         resp = await client.post(
             "/api/registry/test-proj/services/register",
             json=register_service_payload(domain="test-run.gtw.test", https=True),
         )
         assert resp.status_code == 200
+        await nginx.wait_for_certificates()
         conf = (tmp_path / "443-test-run.gtw.test.conf").read_text()
         assert "listen 80;" in conf
         assert "listen 443 ssl;" in conf
@@ -289,6 +293,68 @@ class TestRegisterReplica:
         conf_after = (tmp_path / "443-test-run.gtw.test.conf").read_text()
         assert conf_after == conf_before
 
+    async def test_register_many_concurrently(self, tmp_path: Path, system_mocks: Mocks) -> None:
+        client = make_client(tmp_path)
+        resp = await client.post(
+            "/api/registry/test-proj/services/register",
+            json=register_service_payload(run_name="test-run", domain="test-run.gtw.test"),
+        )
+        assert resp.status_code == 200
+        with patch("dstack._internal.proxy.gateway.services.nginx.RELOAD_DEBOUNCE_TIME", 0.1):
+            resps = await asyncio.gather(
+                *(
+                    client.post(
+                        "/api/registry/test-proj/services/test-run/replicas/register",
+                        json=register_replica_payload(job_id=f"replica-{i}"),
+                    )
+                    for i in range(10)
+                )
+            )
+        assert [resp.status_code for resp in resps] == [200] * 10
+        conf = (tmp_path / "443-test-run.gtw.test.conf").read_text()
+        for i in range(10):
+            assert f"# replica replica-{i}" in conf
+        # the first replica is applied immediately, the rest are applied together
+        assert system_mocks.reload_nginx.call_count == 3
+        assert system_mocks.open_conn.call_count == 10
+
+    async def test_register_concurrently_with_repo_error(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        repo = GatewayProxyRepo()
+        client = make_client(tmp_path, repo=repo)
+        resp = await client.post(
+            "/api/registry/test-proj/services/register",
+            json=register_service_payload(run_name="test-run", domain="test-run.gtw.test"),
+        )
+        assert resp.status_code == 200
+        set_service = repo.set_service
+        calls = 0
+
+        async def fail_second_call(service):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise OSError("disk is full")
+            await set_service(service)
+
+        with patch.object(repo, "set_service", side_effect=fail_second_call):
+            results = await asyncio.gather(
+                *(
+                    client.post(
+                        "/api/registry/test-proj/services/test-run/replicas/register",
+                        json=register_replica_payload(job_id=f"replica-{i}"),
+                    )
+                    for i in range(4)
+                ),
+                return_exceptions=True,
+            )
+        # the first replica is applied alone, the rest are applied together and fail together
+        assert results[0].status_code == 200
+        assert all(isinstance(r, OSError) for r in results[1:])
+        service = await repo.get_service("test-proj", "test-run")
+        assert [r.id for r in service.replicas] == ["replica-0"]
+
 
 @pytest.mark.asyncio
 class TestUnregisterService:
@@ -443,15 +509,18 @@ class TestRegisterEntrypoint:
         assert system_mocks.run_certbot.call_count == 0
 
     async def test_register_with_https(self, tmp_path: Path, system_mocks: Mocks) -> None:
-        client = make_client(tmp_path)
+        nginx = Nginx(conf_dir=tmp_path)
+        client = make_client(tmp_path, nginx=nginx)
         resp = await client.post(
             "/api/registry/test-proj/entrypoints/register",
             json={"domain": "gateway.gtw.test", "https": True},
         )
         assert resp.status_code == 200
+        await nginx.wait_for_certificates()
         conf = (tmp_path / "443-gateway.gtw.test.conf").read_text()
         assert "proxy_pass http://localhost:8000/api/models/test-proj/;" in conf
         assert "listen 80;" in conf
         assert "listen 443 ssl;" in conf
-        assert system_mocks.reload_nginx.call_count == 1
+        # the HTTP config is applied first, the HTTPS one once the certificate is obtained
+        assert system_mocks.reload_nginx.call_count == 2
         assert system_mocks.run_certbot.call_count == 1
@@ -1,17 +1,23 @@
 from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
 from unittest.mock import patch
 
 import httpx
 import pytest
 
 from dstack._internal.proxy.gateway.app import make_app
+from dstack._internal.proxy.gateway.models import ACMESettings
 from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
+from dstack._internal.proxy.gateway.services.nginx import ModelEntrypointConfig, Nginx
+from dstack._internal.proxy.gateway.testing.common import Mocks
+from dstack._internal.proxy.lib.errors import ProxyError
 from dstack._internal.proxy.lib.models import Service
 from dstack._internal.proxy.lib.testing.common import make_project, make_service
 
 
-def make_client(repo: GatewayProxyRepo) -> httpx.AsyncClient:
-    app = make_app(repo)
+def make_client(repo: GatewayProxyRepo, nginx: Optional[Nginx] = None) -> httpx.AsyncClient:
+    app = make_app(repo, nginx)
     return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/")
 
 
@@ -142,3 +148,20 @@ async def test_collect_stats(services: Iterable[Service], collector_stats, expec
         resp = await client.get("/api/stats/collect")
         assert resp.status_code == 200
         assert resp.json() == expected_response
+
+
+@pytest.mark.asyncio
+async def test_get_certificate_failures(tmp_path: Path, system_mocks: Mocks) -> None:
+    system_mocks.run_certbot.side_effect = ProxyError("DNS is not configured")
+    nginx = Nginx(conf_dir=tmp_path)
+    for domain, https in [("failed.gtw.test", True), ("http.gtw.test", False)]:
+        conf = ModelEntrypointConfig(domain=domain, https=https, project_name="test-proj")
+        await nginx.register(conf, ACMESettings())
+    await nginx.wait_for_certificates()
+    client = make_client(GatewayProxyRepo(), nginx)
+    resp = await client.get("/api/stats/certificate-failures")
+    assert resp.status_code == 200
+    [failure] = resp.json()
+    assert failure["domain"] == "failed.gtw.test"
+    assert failure["error"] == "DNS is not configured"
+    assert 0 < failure["retry_in"] <= 300
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.proxy.gateway.models import ACMESettings
+from dstack._internal.proxy.gateway.services.nginx import ModelEntrypointConfig, Nginx
+from dstack._internal.proxy.gateway.testing.common import Mocks
+from dstack._internal.proxy.lib.errors import ProxyError, UnexpectedProxyError
+
+CERTIFICATES = "dstack._internal.proxy.gateway.services.certificates"
+
+
+def make_config(domain: str, https: bool = False) -> ModelEntrypointConfig:
+    return ModelEntrypointConfig(domain=domain, https=https, project_name="test-proj")
+
+
+@pytest.mark.asyncio
+class TestNginx:
+    async def test_applies_concurrent_changes_with_one_reload(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        nginx = Nginx(conf_dir=tmp_path)
+        with patch("dstack._internal.proxy.gateway.services.nginx.RELOAD_DEBOUNCE_TIME", 0.1):
+            await asyncio.gather(
+                *(nginx.register(make_config(f"{i}.gtw.test"), ACMESettings()) for i in range(5))
+            )
+        assert system_mocks.reload_nginx.call_count == 1
+        assert len(list(tmp_path.iterdir())) == 5
+
+    async def test_rolls_back_all_changes_if_reload_fails(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        nginx = Nginx(conf_dir=tmp_path)
+        await nginx.register(make_config("old.gtw.test"), ACMESettings())
+        old_conf = (tmp_path / "443-old.gtw.test.conf").read_text()
+        system_mocks.reload_nginx.side_effect = UnexpectedProxyError("Invalid nginx config")
+        with patch("dstack._internal.proxy.gateway.services.nginx.RELOAD_DEBOUNCE_TIME", 0.1):
+            results = await asyncio.gather(
+                nginx.unregister("old.gtw.test"),
+                nginx.register(make_config("new.gtw.test"), ACMESettings()),
+                return_exceptions=True,
+            )
+        assert all(isinstance(r, UnexpectedProxyError) for r in results)
+        assert system_mocks.reload_nginx.call_count == 2
+        assert [p.name for p in tmp_path.iterdir()] == ["443-old.gtw.test.conf"]
+        assert (tmp_path / "443-old.gtw.test.conf").read_text() == old_conf
+
+    async def test_waits_for_same_config_written_by_another_call(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        nginx = Nginx(conf_dir=tmp_path)
+        system_mocks.reload_nginx.side_effect = UnexpectedProxyError("Invalid nginx config")
+        with patch("dstack._internal.proxy.gateway.services.nginx.RELOAD_DEBOUNCE_TIME", 0.1):
+            results = await asyncio.gather(
+                nginx.register(make_config("test.gtw.test"), ACMESettings()),
+                nginx.register(make_config("test.gtw.test"), ACMESettings()),
+                return_exceptions=True,
+            )
+        assert all(isinstance(r, UnexpectedProxyError) for r in results)
+        assert system_mocks.reload_nginx.call_count == 1
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_does_not_wait_for_certificates(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        certbot_release = threading.Event()
+        system_mocks.run_certbot.side_effect = lambda *args: certbot_release.wait(5)
+        nginx = Nginx(conf_dir=tmp_path)
+        try:
+            await nginx.register(make_config("slow.gtw.test", https=True), ACMESettings())
+            await nginx.register(make_config("other.gtw.test"), ACMESettings())
+            assert "listen 443 ssl;" not in (tmp_path / "443-slow.gtw.test.conf").read_text()
+            assert (tmp_path / "443-other.gtw.test.conf").exists()
+        finally:
+            certbot_release.set()
+        await nginx.wait_for_certificates()
+        assert "listen 443 ssl;" in (tmp_path / "443-slow.gtw.test.conf").read_text()
+        assert system_mocks.run_certbot.call_count == 1
+
+    async def test_obtains_certificate_after_serving_acme_challenge(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        conf_path = tmp_path / "443-test.gtw.test.conf"
+
+        def run_certbot(*args) -> None:
+            # certbot does not change nginx config, the site serves the challenge over HTTP
+            assert system_mocks.reload_nginx.call_count == 1
+            assert "location /.well-known/acme-challenge/" in conf_path.read_text()
+
+        system_mocks.run_certbot.side_effect = run_certbot
+        nginx = Nginx(conf_dir=tmp_path)
+        await nginx.register(make_config("test.gtw.test", https=True), ACMESettings())
+        await nginx.wait_for_certificates()
+        assert system_mocks.run_certbot.call_count == 1
+        assert "listen 443 ssl;" in conf_path.read_text()
+
+    async def test_serves_over_http_if_certificate_fails(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        system_mocks.run_certbot.side_effect = ProxyError("DNS is not configured")
+        nginx = Nginx(conf_dir=tmp_path)
+        await nginx.register(make_config("test.gtw.test", https=True), ACMESettings())
+        await nginx.wait_for_certificates()
+        conf = (tmp_path / "443-test.gtw.test.conf").read_text()
+        assert "listen 80;" in conf
+        assert "listen 443 ssl;" not in conf
+        # not retried right away
+        await nginx.register(make_config("test.gtw.test", https=True), ACMESettings())
+        await nginx.wait_for_certificates()
+        assert system_mocks.run_certbot.call_count == 1
+        [failure] = nginx.get_certificate_failures()
+        assert failure.domain == "test.gtw.test"
+        assert failure.error == "DNS is not configured"
+        assert 0 < failure.retry_in <= 300
+
+    async def test_retries_failed_certificate(self, tmp_path: Path, system_mocks: Mocks) -> None:
+        system_mocks.run_certbot.side_effect = [ProxyError("DNS is not configured"), None]
+        nginx = Nginx(conf_dir=tmp_path)
+        with patch(f"{CERTIFICATES}.RETRY_INTERVAL", 0.05):
+            await nginx.register(make_config("test.gtw.test", https=True), ACMESettings())
+            await nginx.wait_for_certificates()
+            assert [f.domain for f in nginx.get_certificate_failures()] == ["test.gtw.test"]
+            await asyncio.sleep(0.1)
+            await nginx.wait_for_certificates()
+        assert system_mocks.run_certbot.call_count == 2
+        assert nginx.get_certificate_failures() == []
+        assert "listen 443 ssl;" in (tmp_path / "443-test.gtw.test.conf").read_text()
+
+    async def test_stops_retrying_after_unregister(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        system_mocks.run_certbot.side_effect = ProxyError("DNS is not configured")
+        nginx = Nginx(conf_dir=tmp_path)
+        with patch(f"{CERTIFICATES}.RETRY_INTERVAL", 0.05):
+            await nginx.register(make_config("test.gtw.test", https=True), ACMESettings())
+            await nginx.wait_for_certificates()
+            await nginx.unregister("test.gtw.test")
+            await asyncio.sleep(0.1)
+            await nginx.wait_for_certificates()
+        assert system_mocks.run_certbot.call_count == 1
+        assert nginx.get_certificate_failures() == []
+
+    async def test_retries_enabling_https_if_reload_fails(
+        self, tmp_path: Path, system_mocks: Mocks
+    ) -> None:
+        system_mocks.reload_nginx.side_effect = [
+            None,
+            UnexpectedProxyError("Invalid nginx config"),
+            None,
+        ]
+        nginx = Nginx(conf_dir=tmp_path)
+        conf_path = tmp_path / "443-test.gtw.test.conf"
+        with patch(f"{CERTIFICATES}.RETRY_INTERVAL", 0.05):
+            await nginx.register(make_config("test.gtw.test", https=True), ACMESettings())
+            await nginx.wait_for_certificates()
+            assert "listen 443 ssl;" not in conf_path.read_text()
+            [failure] = nginx.get_certificate_failures()
+            assert failure.domain == "test.gtw.test"
+            assert "Invalid nginx config" in failure.error
+            await asyncio.sleep(0.1)
+            await nginx.wait_for_certificates()
+        assert system_mocks.reload_nginx.call_count == 3
+        assert nginx.get_certificate_failures() == []
+        assert "listen 443 ssl;" in conf_path.read_text()
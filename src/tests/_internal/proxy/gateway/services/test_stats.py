@@ -151,3 +151,55 @@ async def test_collect_stats_after_log_update(tmp_path: Path) -> None:
         f.flush()
         result = await collector.collect()
         assert result == both_chunks_stats
+
+
+@pytest.mark.asyncio
+async def test_collect_stats_evicts_old_frames_over_time(tmp_path: Path) -> None:
+    access_log_path = tmp_path / "dstack.access.log"
+    access_log_path.write_text(
+        dedent(
+            """
+            2024-12-06T12:09:15+00:00 srv.gtw.test 200 0.100
+            2024-12-06T12:09:45+00:00 srv.gtw.test 200 0.300
+            """
+        ).lstrip()
+    )
+    collector = StatsCollector(access_log_path)
+    with freeze_time(datetime(2024, 12, 6, 12, 10, tzinfo=timezone.utc)):
+        result = await collector.collect()
+    assert result == {
+        "srv.gtw.test": {
+            30: Stat(requests=1, request_time=0.3),
+            60: Stat(requests=2, request_time=0.2),
+            300: Stat(requests=2, request_time=0.2),
+        },
+    }
+    with freeze_time(datetime(2024, 12, 6, 12, 10, 30, tzinfo=timezone.utc)):
+        result = await collector.collect()
+    assert result == {
+        "srv.gtw.test": {
+            30: Stat(requests=0, request_time=0.0),
+            60: Stat(requests=1, request_time=0.3),
+            300: Stat(requests=2, request_time=0.2),
+        },
+    }
+    with freeze_time(datetime(2024, 12, 6, 12, 15, tzinfo=timezone.utc)):
+        result = await collector.collect()
+    assert result == {}
+
+
+@pytest.mark.asyncio
+@freeze_time(datetime(2024, 12, 6, 12, 10, tzinfo=timezone.utc))
+async def test_collect_stats_with_request_time_percentiles(tmp_path: Path) -> None:
+    access_log_path = tmp_path / "dstack.access.log"
+    lines = [f"2024-12-06T12:09:50+00:00 srv.gtw.test 200 {i / 100:.3f}" for i in range(1, 101)]
+    access_log_path.write_text("\n".join(lines) + "\n")
+    collector = StatsCollector(access_log_path, request_time_percentiles=True)
+    result = await collector.collect()
+    stat = result["srv.gtw.test"][30]
+    assert stat.requests == 100
+    assert stat.request_time == 0.505
+    # Percentiles are upper bounds of ~19% wide buckets
+    assert 0.5 <= stat.request_time_p50 <= 0.5 * 1.2
+    assert 0.95 <= stat.request_time_p95 <= 0.95 * 1.2
+    assert 0.99 <= stat.request_time_p99 <= 0.99 * 1.2
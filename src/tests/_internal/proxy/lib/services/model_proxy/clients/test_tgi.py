@@ -0,0 +1,42 @@
+from unittest.mock import Mock
+
+import pytest
+
+from dstack._internal.proxy.lib.errors import ProxyError
+from dstack._internal.proxy.lib.schemas.model_proxy import ChatCompletionsRequest, ChatMessage
+from dstack._internal.proxy.lib.services.model_proxy.clients.tgi import TGIChatCompletions
+
+CHAT_TEMPLATE = (
+    "{% for message in messages %}"
+    "{% if message.role == 'system' %}{{ raise_exception('System messages not supported') }}"
+    "{% endif %}<{{ message.role }}>{{ message.content }}"
+    "{% endfor %}"
+    "{% if add_generation_prompt %}<assistant>{% endif %}"
+)
+
+
+class TestTGIChatCompletions:
+    def test_reuses_compiled_chat_template(self):
+        client1 = TGIChatCompletions(Mock(), chat_template=CHAT_TEMPLATE, eos_token="</s>")
+        client2 = TGIChatCompletions(Mock(), chat_template=CHAT_TEMPLATE, eos_token="</s>")
+        assert client1.chat_template is client2.chat_template
+
+    def test_renders_chat_template(self):
+        client = TGIChatCompletions(Mock(), chat_template=CHAT_TEMPLATE, eos_token="</s>")
+        payload = client.get_payload(
+            ChatCompletionsRequest(model="test", messages=[ChatMessage(role="user", content="Hi")])
+        )
+        assert payload["inputs"] == "<user>Hi<assistant>"
+
+    def test_raises_template_exceptions(self):
+        client = TGIChatCompletions(Mock(), chat_template=CHAT_TEMPLATE, eos_token="</s>")
+        with pytest.raises(ProxyError, match="System messages not supported"):
+            client.get_payload(
+                ChatCompletionsRequest(
+                    model="test", messages=[ChatMessage(role="system", content="Hi")]
+                )
+            )
+
+    def test_raises_on_invalid_chat_template(self):
+        with pytest.raises(ProxyError, match="Failed to compile"):
+            TGIChatCompletions(Mock(), chat_template="{% for %}", eos_token="</s>")
@@ -0,0 +1,101 @@
+import httpx
+import pytest
+
+from dstack._internal.proxy.lib.models import Replica
+from dstack._internal.proxy.lib.services.replica_balancing import (
+    EJECTION_CONSECUTIVE_ERRORS,
+    EWMALatencyReplicaBalancer,
+    LeastRequestsReplicaBalancer,
+    PowerOfTwoChoicesReplicaBalancer,
+    RandomReplicaBalancer,
+    StatsTrackingTransport,
+)
+
+
+class AsyncStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b"ok"
+
+
+def make_replica(replica_id: str) -> Replica:
+    return Replica(
+        id=replica_id,
+        app_port=80,
+        ssh_destination="ubuntu@10.0.0.1",
+        ssh_port=22,
+        ssh_proxy=None,
+    )
+
+
+class TestReplicaBalancers:
+    def test_least_requests_chooses_least_loaded_replica(self):
+        balancer = LeastRequestsReplicaBalancer()
+        replicas = [make_replica("a"), make_replica("b"), make_replica("c")]
+        balancer.get_stats("a").in_flight = 2
+        balancer.get_stats("b").in_flight = 1
+        balancer.get_stats("c").in_flight = 3
+        assert balancer.choose(replicas).id == "b"
+
+    def test_ewma_latency_prefers_fast_and_unknown_replicas(self):
+        balancer = EWMALatencyReplicaBalancer()
+        replicas = [make_replica("a"), make_replica("b")]
+        balancer.get_stats("a").on_response(1.0)
+        balancer.get_stats("b").on_response(0.1)
+        assert balancer.choose(replicas).id == "b"
+        balancer.get_stats("b").in_flight = 20
+        assert balancer.choose(replicas).id == "a"
+        assert balancer.choose(replicas + [make_replica("c")]).id == "c"
+
+    def test_power_of_two_choices_chooses_less_loaded_of_two(self):
+        balancer = PowerOfTwoChoicesReplicaBalancer()
+        replicas = [make_replica("a"), make_replica("b")]
+        balancer.get_stats("a").in_flight = 5
+        for _ in range(10):
+            assert balancer.choose(replicas).id == "b"
+
+    def test_skips_ejected_replicas(self):
+        balancer = RandomReplicaBalancer()
+        replicas = [make_replica("a"), make_replica("b")]
+        for _ in range(EJECTION_CONSECUTIVE_ERRORS):
+            balancer.get_stats("a").on_connection_error()
+        for _ in range(10):
+            assert balancer.choose(replicas).id == "b"
+        for _ in range(EJECTION_CONSECUTIVE_ERRORS):
+            balancer.get_stats("b").on_connection_error()
+        assert balancer.choose(replicas).id in ("a", "b")
+        balancer.get_stats("a").on_response(0.1)
+        assert not balancer.get_stats("a").is_ejected()
+
+
+class TestStatsTrackingTransport:
+    @pytest.mark.asyncio
+    async def test_tracks_in_flight_requests_until_response_closed(self):
+        balancer = LeastRequestsReplicaBalancer()
+        stats = balancer.get_stats("a")
+        transport = StatsTrackingTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200, stream=AsyncStream())), stats
+        )
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.send(client.build_request("GET", "/"), stream=True)
+            assert stats.in_flight == 1
+            assert stats.ewma_latency is not None
+            await response.aread()
+            await response.aclose()
+            assert stats.in_flight == 0
+            await client.get("/")
+            assert stats.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_counts_connection_errors(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        balancer = LeastRequestsReplicaBalancer()
+        stats = balancer.get_stats("a")
+        transport = StatsTrackingTransport(httpx.MockTransport(handler), stats)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(EJECTION_CONSECUTIVE_ERRORS):
+                with pytest.raises(httpx.ConnectError):
+                    await client.get("/")
+        assert stats.in_flight == 0
+        assert stats.is_ejected()
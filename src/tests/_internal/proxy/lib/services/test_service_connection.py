@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.proxy.lib.services.service_connection import ServiceConnectionPool
+
+
+class TestServiceConnectionPoolNginxClients:
+    @pytest.mark.asyncio
+    async def test_reuses_clients_per_domain(self):
+        pool = ServiceConnectionPool()
+        client1 = pool.get_nginx_client("a.example.com")
+        client2 = pool.get_nginx_client("b.example.com")
+        assert pool.get_nginx_client("a.example.com") is client1
+        assert client1 is not client2
+        assert client1.headers["Host"] == "a.example.com"
+        assert client2.headers["Host"] == "b.example.com"
+        assert client1._transport is client2._transport
+        await pool.remove_all()
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_clients(self):
+        pool = ServiceConnectionPool()
+        with patch("dstack._internal.proxy.lib.services.service_connection.NGINX_MAX_CLIENTS", 2):
+            client_a = pool.get_nginx_client("a.example.com")
+            pool.get_nginx_client("b.example.com")
+            pool.get_nginx_client("a.example.com")
+            pool.get_nginx_client("c.example.com")
+            assert pool.get_nginx_client("a.example.com") is client_a
+            assert set(pool._nginx_clients) == {"a.example.com", "c.example.com"}
+        await pool.remove_all()
+
+    @pytest.mark.asyncio
+    async def test_remove_all_closes_clients(self):
+        pool = ServiceConnectionPool()
+        client = pool.get_nginx_client("a.example.com")
+        await pool.remove_all()
+        assert pool.get_nginx_client("a.example.com") is not client
+        await pool.remove_all()
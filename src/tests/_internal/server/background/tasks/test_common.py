@@ -0,0 +1,74 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dstack._internal.core.models.instances import InstanceStatus
+from dstack._internal.server.background.tasks.common import claim_and_process
+from dstack._internal.server.db import get_session_ctx
+from dstack._internal.server.models import InstanceModel
+from dstack._internal.server.services.locking import get_locker
+from dstack._internal.server.testing.common import create_instance, create_pool, create_project
+
+
+class TestClaimAndProcess:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_skips_rows_processed_since_claim(self, test_db, session: AsyncSession):
+        project = await create_project(session=session)
+        pool = await create_pool(session, project)
+        instance1 = await create_instance(session, project, pool, name="i-1")
+        instance2 = await create_instance(session, project, pool, name="i-2")
+        instance2.last_processed_at = instance1.last_processed_at + dt.timedelta(seconds=1)
+        await session.commit()
+        processed = []
+
+        async def process(session: AsyncSession, instance: InstanceModel):
+            processed.append(instance.id)
+            # Another replica processes instance2 while instance1 is being processed
+            async with get_session_ctx() as other_session:
+                await other_session.execute(
+                    update(InstanceModel)
+                    .where(InstanceModel.id == instance2.id)
+                    .values(last_processed_at=instance2.last_processed_at + dt.timedelta(1))
+                )
+
+        await claim_and_process(
+            model=InstanceModel,
+            filters=[InstanceModel.status == InstanceStatus.IDLE],
+            process_func=process,
+            batch_size=2,
+            max_workers=1,
+        )
+
+        assert processed == [instance1.id]
+        _, lockset = get_locker().get_lockset(InstanceModel.__tablename__)
+        assert instance1.id not in lockset
+        assert instance2.id not in lockset
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_does_not_claim_locked_rows(self, test_db, session: AsyncSession):
+        project = await create_project(session=session)
+        pool = await create_pool(session, project)
+        instance = await create_instance(session, project, pool)
+        processed = []
+
+        async def process(session: AsyncSession, instance: InstanceModel):
+            processed.append(instance.id)
+
+        _, lockset = get_locker().get_lockset(InstanceModel.__tablename__)
+        lockset.add(instance.id)
+        try:
+            await claim_and_process(
+                model=InstanceModel,
+                filters=[InstanceModel.status == InstanceStatus.IDLE],
+                process_func=process,
+                batch_size=2,
+                max_workers=1,
+            )
+        finally:
+            lockset.discard(instance.id)
+
+        assert processed == []
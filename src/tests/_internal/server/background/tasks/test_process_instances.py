@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from dstack._internal.core.errors import BackendError
 from dstack._internal.core.models.backends.base import BackendType
+from dstack._internal.core.models.fleets import FleetConfiguration, InstanceGroupPlacement
 from dstack._internal.core.models.instances import (
     Gpu,
     InstanceAvailability,
@@ -19,6 +20,7 @@ from dstack._internal.core.models.instances import (
     Resources,
 )
 from dstack._internal.core.models.profiles import TerminationPolicy
+from dstack._internal.core.models.resources import Range
 from dstack._internal.core.models.runs import (
     JobProvisioningData,
     JobStatus,
@@ -28,6 +30,7 @@ from dstack._internal.server.background.tasks.process_instances import (
     process_instances,
 )
 from dstack._internal.server.testing.common import (
+    create_fleet,
     create_instance,
     create_job,
     create_pool,
@@ -35,6 +38,7 @@ from dstack._internal.server.testing.common import (
     create_repo,
     create_run,
     create_user,
+    get_fleet_spec,
     get_remote_connection_info,
 )
 from dstack._internal.utils.common import get_current_datetime
@@ -42,6 +46,44 @@ from dstack._internal.utils.common import get_current_datetime
 pytestmark = pytest.mark.usefixtures("image_config_mock")
 
 
+class TestBatchClaim:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_processes_claimed_instances(
+        self, test_db, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        # In-memory SQLite shares one connection between sessions, so process sequentially
+        monkeypatch.setattr(
+            "dstack._internal.server.settings.BACKGROUND_BATCH_CLAIM_MAX_WORKERS", 1
+        )
+        project = await create_project(session=session)
+        pool = await create_pool(session, project)
+        instances = [
+            await create_instance(
+                session, project, pool, status=InstanceStatus.PROVISIONING, name=f"i-{i}"
+            )
+            for i in range(3)
+        ]
+        for instance in instances:
+            instance.termination_deadline = get_current_datetime() + dt.timedelta(days=1)
+        await session.commit()
+
+        with patch(
+            "dstack._internal.server.background.tasks.process_instances._instance_healthcheck"
+        ) as healthcheck:
+            healthcheck.return_value = HealthStatus(healthy=True, reason="OK")
+            await process_instances(batch_size=2, batch_claim=True)
+
+        for instance in instances:
+            await session.refresh(instance)
+        assert sorted(i.status for i in instances) == [
+            InstanceStatus.IDLE,
+            InstanceStatus.IDLE,
+            InstanceStatus.PROVISIONING,
+        ]
+        assert healthcheck.call_count == 2
+
+
 class TestCheckShim:
     @pytest.mark.asyncio
     @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
@@ -554,6 +596,38 @@ class TestCreateInstance:
         assert instance.total_blocks == expected_blocks
         assert instance.busy_blocks == 0
 
+    async def test_waits_for_master_instance_in_cluster_fleet(self, session: AsyncSession):
+        project = await create_project(session=session)
+        pool = await create_pool(session, project)
+        fleet = await create_fleet(
+            session,
+            project,
+            spec=get_fleet_spec(
+                conf=FleetConfiguration(
+                    name="test-fleet",
+                    nodes=Range(min=2, max=2),
+                    placement=InstanceGroupPlacement.CLUSTER,
+                )
+            ),
+        )
+        master = await create_instance(
+            session, project, pool, fleet=fleet, status=InstanceStatus.PENDING, instance_num=0
+        )
+        worker = await create_instance(
+            session, project, pool, fleet=fleet, status=InstanceStatus.PENDING, instance_num=1
+        )
+        master.job_provisioning_data = None
+        master.last_processed_at = get_current_datetime()
+        worker.job_provisioning_data = None
+        worker.last_processed_at = get_current_datetime() - dt.timedelta(minutes=1)
+        await session.commit()
+        with patch("dstack._internal.server.services.backends.get_project_backends") as m:
+            await process_instances()
+            m.assert_not_called()
+
+        await session.refresh(worker)
+        assert worker.status == InstanceStatus.PENDING
+
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
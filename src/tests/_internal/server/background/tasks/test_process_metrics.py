@@ -1,9 +1,9 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import pytest
 from freezegun import freeze_time
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dstack._internal.core.models.instances import InstanceStatus
@@ -13,9 +13,11 @@ from dstack._internal.server import settings
 from dstack._internal.server.background.tasks.process_metrics import (
     collect_metrics,
     delete_metrics,
+    rollup_metrics,
 )
-from dstack._internal.server.models import JobMetricsPoint
+from dstack._internal.server.models import JobMetricsPoint, JobMetricsRollup
 from dstack._internal.server.schemas.runner import GPUMetrics, MetricsResponse
+from dstack._internal.server.services.metrics import pack_values, unpack_values
 from dstack._internal.server.services.projects import add_project_member
 from dstack._internal.server.testing.common import (
     create_instance,
@@ -138,3 +140,103 @@ class TestDeleteMetrics:
         points = res.scalars().all()
         assert len(points) == 1
         assert points[0].id == last_metric.id
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    @freeze_time(datetime(2023, 1, 2, 3, 5, 20, tzinfo=timezone.utc))
+    async def test_deletes_old_rollups(self, test_db, session: AsyncSession):
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run)
+        for resolution, bucket_start in [
+            (60, datetime(2023, 1, 2, 3, 3, tzinfo=timezone.utc)),
+            (60, datetime(2023, 1, 2, 3, 4, tzinfo=timezone.utc)),
+            (600, datetime(2023, 1, 2, 2, 50, tzinfo=timezone.utc)),
+        ]:
+            bucket_start_micro = int(bucket_start.timestamp() * 1_000_000)
+            session.add(
+                JobMetricsRollup(
+                    job_id=job.id,
+                    resolution_seconds=resolution,
+                    bucket_start_micro=bucket_start_micro,
+                    timestamp_micro=bucket_start_micro,
+                    cpu_usage_micro=0,
+                    memory_usage_bytes=0,
+                    memory_working_set_bytes=0,
+                    gpus_memory_usage_bytes=pack_values([]),
+                    gpus_util_percent=pack_values([]),
+                )
+            )
+        await session.commit()
+        with (
+            patch.object(settings, "SERVER_METRICS_ROLLUP_1M_TTL_SECONDS", 90),
+            patch.object(settings, "SERVER_METRICS_ROLLUP_10M_TTL_SECONDS", 3600),
+        ):
+            await delete_metrics()
+        res = await session.execute(select(JobMetricsRollup))
+        rollups = res.scalars().all()
+        assert sorted((r.resolution_seconds, r.bucket_start_micro) for r in rollups) == [
+            (60, int(datetime(2023, 1, 2, 3, 4, tzinfo=timezone.utc).timestamp() * 1_000_000)),
+            (600, int(datetime(2023, 1, 2, 2, 50, tzinfo=timezone.utc).timestamp() * 1_000_000)),
+        ]
+
+
+class TestRollupMetrics:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_rolls_up_complete_buckets(self, test_db, session: AsyncSession):
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run)
+        for second, memory_usage_bytes in [(0, 100), (30, 200), (60, 300), (120, 400)]:
+            await create_job_metrics_point(
+                session=session,
+                job_model=job,
+                timestamp=datetime(2023, 1, 2, 3, 58, 10, tzinfo=timezone.utc)
+                + timedelta(seconds=second),
+                cpu_usage_micro=second * 1_000_000,
+                memory_usage_bytes=memory_usage_bytes,
+                gpus_memory_usage_bytes=[memory_usage_bytes],
+                gpus_util_percent=[10],
+            )
+        # The 04:00 bucket is not complete yet
+        with freeze_time(datetime(2023, 1, 2, 4, 0, 50, tzinfo=timezone.utc)):
+            await rollup_metrics()
+        res = await session.execute(
+            select(JobMetricsRollup).order_by(
+                JobMetricsRollup.resolution_seconds, JobMetricsRollup.bucket_start_micro
+            )
+        )
+        rollups = res.scalars().all()
+        assert [(r.resolution_seconds, r.memory_usage_bytes) for r in rollups] == [
+            (60, 150),
+            (60, 300),
+            (600, 225),
+        ]
+        assert [r.cpu_usage_micro for r in rollups] == [30_000_000, 60_000_000, 60_000_000]
+        assert [unpack_values(r.gpus_memory_usage_bytes) for r in rollups] == [
+            [150],
+            [300],
+            [225],
+        ]
+        with freeze_time(datetime(2023, 1, 2, 4, 1, 40, tzinfo=timezone.utc)):
+            await rollup_metrics()
+        res = await session.execute(
+            select(JobMetricsRollup).where(JobMetricsRollup.resolution_seconds == 60)
+        )
+        assert len(res.scalars().all()) == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["postgres"], indirect=True)
+    async def test_releases_lock(self, test_db, session: AsyncSession):
+        with freeze_time(datetime(2023, 1, 2, 4, 0, 50, tzinfo=timezone.utc)):
+            await rollup_metrics()
+            await rollup_metrics()
+        res = await session.execute(
+            text("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND granted")
+        )
+        assert res.scalar() == 0
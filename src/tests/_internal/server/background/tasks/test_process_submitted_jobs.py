@@ -454,6 +454,78 @@ class TestProcessSubmittedJobs:
             job.instance_assigned and job.instance is not None and job.instance.id == instance.id
         )
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_does_not_assign_job_to_unsuitable_instances(
+        self, test_db, session: AsyncSession
+    ):
+        project = await create_project(session)
+        user = await create_user(session)
+        pool = await create_pool(session=session, project=project)
+        repo = await create_repo(
+            session=session,
+            project_id=project.id,
+        )
+        fleet = await create_fleet(session=session, project=project)
+        other_fleet = await create_fleet(session=session, project=project)
+        await create_instance(
+            session=session,
+            project=project,
+            pool=pool,
+            fleet=other_fleet,
+            status=InstanceStatus.IDLE,
+            name="other-fleet",
+        )
+        await create_instance(
+            session=session,
+            project=project,
+            pool=pool,
+            fleet=fleet,
+            status=InstanceStatus.IDLE,
+            unreachable=True,
+            name="unreachable",
+        )
+        await create_instance(
+            session=session,
+            project=project,
+            pool=pool,
+            fleet=fleet,
+            status=InstanceStatus.PROVISIONING,
+            name="provisioning",
+        )
+        instance = await create_instance(
+            session=session,
+            project=project,
+            pool=pool,
+            fleet=fleet,
+            status=InstanceStatus.IDLE,
+            name="suitable",
+        )
+        await session.refresh(pool)
+        run = await create_run(
+            session=session,
+            project=project,
+            repo=repo,
+            user=user,
+        )
+        run.fleet_id = fleet.id
+        await session.commit()
+        job = await create_job(
+            session=session,
+            run=run,
+            instance_assigned=False,
+        )
+        await process_submitted_jobs()
+        res = await session.execute(
+            select(JobModel)
+            .where(JobModel.id == job.id)
+            .options(joinedload(JobModel.instance))
+            .execution_options(populate_existing=True)
+        )
+        job = res.unique().scalar_one()
+        assert job.instance_assigned
+        assert job.instance is not None and job.instance.id == instance.id
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
     async def test_assigns_job_to_instance_with_volumes(self, test_db, session: AsyncSession):
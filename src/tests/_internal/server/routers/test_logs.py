@@ -1,11 +1,26 @@
+import asyncio
+import json
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dstack._internal.core.models.runs import JobStatus
 from dstack._internal.core.models.users import GlobalRole, ProjectRole
+from dstack._internal.server.schemas.logs import PollLogsRequest
+from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
+from dstack._internal.server.services import logs as logs_services
 from dstack._internal.server.services.logs.filelog import FileLogStorage
 from dstack._internal.server.services.projects import add_project_member
-from dstack._internal.server.testing.common import create_project, create_user, get_auth_headers
+from dstack._internal.server.testing.common import (
+    create_job,
+    create_project,
+    create_repo,
+    create_run,
+    create_user,
+    get_auth_headers,
+)
+from dstack._internal.utils.common import run_async
 
 
 class TestPollLogs:
@@ -96,3 +111,103 @@ class TestPollLogs:
                 },
             ]
         }
+
+
+@pytest.mark.usefixtures("image_config_mock")
+class TestStreamLogs:
+    @pytest.fixture(autouse=True)
+    def fast_polling(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(logs_services, "LOG_STREAM_POLL_INTERVAL", 0.01)
+        monkeypatch.setattr(logs_services, "LOG_STREAM_FINISHED_JOB_GRACE_PERIOD", 0)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_returns_403_if_not_project_member(
+        self, test_db, session: AsyncSession, client: AsyncClient
+    ):
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        response = await client.post(
+            f"/api/project/{project.name}/logs/stream",
+            headers=get_auth_headers(user.token),
+        )
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_streams_logs_until_job_finished(
+        self, test_db, test_log_storage: FileLogStorage, session: AsyncSession, client: AsyncClient
+    ):
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        await add_project_member(
+            session=session, project=project, user=user, project_role=ProjectRole.USER
+        )
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run, status=JobStatus.DONE)
+        test_log_storage.write_logs(
+            project=project,
+            run_name=run.run_name,
+            job_submission_id=job.id,
+            runner_logs=[],
+            job_logs=[
+                RunnerLogEvent(timestamp=1696586513234, message=b"Hello"),
+                RunnerLogEvent(timestamp=1696586513235, message=b"World"),
+            ],
+        )
+        response = await client.post(
+            f"/api/project/{project.name}/logs/stream",
+            headers=get_auth_headers(user.token),
+            json={"run_name": run.run_name, "job_submission_id": str(job.id), "limit": 1},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line[len("data: ") :])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert [[log["message"] for log in event["logs"]] for event in events] == [
+            ["SGVsbG8="],
+            ["V29ybGQ="],
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_wakes_up_on_written_logs(
+        self,
+        test_db,
+        test_log_storage: FileLogStorage,
+        session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(logs_services, "LOG_STREAM_POLL_INTERVAL", 60)
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run, status=JobStatus.RUNNING)
+        stream = logs_services.stream_logs(
+            project=project,
+            request=PollLogsRequest(
+                run_name=run.run_name,
+                job_submission_id=job.id,
+                start_time=None,
+                end_time=None,
+            ),
+        )
+        next_logs = asyncio.create_task(stream.__anext__())
+        await asyncio.sleep(0.1)
+        assert not next_logs.done()
+        await run_async(
+            logs_services.write_logs,
+            project=project,
+            run_name=run.run_name,
+            job_submission_id=job.id,
+            runner_logs=[],
+            job_logs=[RunnerLogEvent(timestamp=1696586513234, message=b"Hello")],
+        )
+        logs = await asyncio.wait_for(next_logs, timeout=5)
+        assert [log.message for log in logs] == ["SGVsbG8="]
+        await stream.aclose()
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
 import pytest
+from freezegun import freeze_time
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -111,6 +112,53 @@ class TestGetJobMetrics:
             ]
         }
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    @freeze_time(datetime(2023, 1, 2, 3, 5, 0, tzinfo=timezone.utc))
+    async def test_returns_metrics_in_time_range(
+        self, test_db, session: AsyncSession, client: AsyncClient
+    ):
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        await add_project_member(
+            session=session, project=project, user=user, project_role=ProjectRole.USER
+        )
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run)
+        for second in [5, 15, 25, 35]:
+            await create_job_metrics_point(
+                session=session,
+                job_model=job,
+                timestamp=datetime(2023, 1, 2, 3, 4, second, tzinfo=timezone.utc),
+                cpu_usage_micro=second * 1_000_000,
+                memory_usage_bytes=second,
+            )
+        response = await client.get(
+            f"/api/project/{project.name}/metrics/job/{run.run_name}",
+            params={
+                "after": "2023-01-02T03:04:10+00:00",
+                "before": "2023-01-02T03:04:30+00:00",
+            },
+            headers=get_auth_headers(user.token),
+        )
+        assert response.status_code == 200
+        metrics = {m["name"]: m for m in response.json()["metrics"]}
+        assert metrics["cpu_usage_percent"] == {
+            "name": "cpu_usage_percent",
+            "timestamps": ["2023-01-02T03:04:15+00:00", "2023-01-02T03:04:25+00:00"],
+            "values": [100, 100],
+        }
+        assert metrics["memory_usage_bytes"]["values"] == [15, 25]
+        response = await client.get(
+            f"/api/project/{project.name}/metrics/job/{run.run_name}",
+            params={"after": "2023-01-02T03:04:00+00:00", "limit": 2},
+            headers=get_auth_headers(user.token),
+        )
+        assert response.status_code == 200
+        metrics = {m["name"]: m for m in response.json()["metrics"]}
+        assert metrics["memory_usage_bytes"]["values"] == [25, 35]
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
     async def test_ignores_deleted_runs(self, test_db, session: AsyncSession, client: AsyncClient):
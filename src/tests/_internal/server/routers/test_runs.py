@@ -608,6 +608,113 @@ class TestListRuns:
         assert len(response2_json) == 1
         assert response2_json[0]["id"] == str(run2.id)
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_lists_runs_changed_after(
+        self, test_db, session: AsyncSession, client: AsyncClient
+    ):
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        await add_project_member(
+            session=session, project=project, user=user, project_role=ProjectRole.USER
+        )
+        repo = await create_repo(session=session, project_id=project.id)
+        await create_run(
+            session=session,
+            project=project,
+            repo=repo,
+            user=user,
+            run_name="unchanged-run",
+            submitted_at=datetime(2023, 1, 2, 1, 0, tzinfo=timezone.utc),
+        )
+        changed_run = await create_run(
+            session=session,
+            project=project,
+            repo=repo,
+            user=user,
+            run_name="changed-run",
+            submitted_at=datetime(2023, 1, 2, 2, 0, tzinfo=timezone.utc),
+        )
+        changed_run.last_processed_at = datetime(2023, 1, 2, 3, 0, tzinfo=timezone.utc)
+        run_with_changed_job = await create_run(
+            session=session,
+            project=project,
+            repo=repo,
+            user=user,
+            run_name="run-with-changed-job",
+            submitted_at=datetime(2023, 1, 2, 1, 30, tzinfo=timezone.utc),
+        )
+        await create_job(
+            session=session,
+            run=run_with_changed_job,
+            last_processed_at=datetime(2023, 1, 2, 3, 0, tzinfo=timezone.utc),
+        )
+        await session.commit()
+        response = await client.post(
+            "/api/runs/list",
+            headers=get_auth_headers(user.token),
+            json={"changed_after": "2023-01-02T02:30:00+00:00"},
+        )
+        assert response.status_code == 200, response.json()
+        assert [r["id"] for r in response.json()] == [
+            str(changed_run.id),
+            str(run_with_changed_job.id),
+        ]
+        response = await client.post(
+            "/api/runs/list",
+            headers=get_auth_headers(user.token),
+            json={"changed_after": "2023-01-02T04:00:00+00:00"},
+        )
+        assert response.status_code == 200, response.json()
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_lists_runs_projections(
+        self, test_db, session: AsyncSession, client: AsyncClient
+    ):
+        user = await create_user(session=session, global_role=GlobalRole.USER)
+        project = await create_project(session=session, owner=user)
+        await add_project_member(
+            session=session, project=project, user=user, project_role=ProjectRole.USER
+        )
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        for replica_num in range(2):
+            for submission_num in range(3):
+                await create_job(
+                    session=session,
+                    run=run,
+                    replica_num=replica_num,
+                    submission_num=submission_num,
+                    status=JobStatus.FAILED if submission_num < 2 else JobStatus.RUNNING,
+                )
+        responses = {}
+        for projection in ["full", "latest_submission", "summary"]:
+            response = await client.post(
+                "/api/runs/list",
+                headers=get_auth_headers(user.token),
+                json={"projection": projection},
+            )
+            assert response.status_code == 200, response.json()
+            assert len(response.json()) == 1
+            responses[projection] = response.json()[0]
+        full, latest, summary = (
+            responses["full"],
+            responses["latest_submission"],
+            responses["summary"],
+        )
+        assert [len(j["job_submissions"]) for j in full["jobs"]] == [3, 3]
+        assert [len(j["job_submissions"]) for j in latest["jobs"]] == [1, 1]
+        assert [j["job_submissions"][0] for j in latest["jobs"]] == [
+            j["job_submissions"][-1] for j in full["jobs"]
+        ]
+        assert latest["latest_job_submission"] == full["latest_job_submission"]
+        assert summary["jobs"] == []
+        assert summary["latest_job_submission"] is None
+        for key in ["id", "run_spec", "status", "submitted_at", "user", "project_name"]:
+            assert summary[key] == full[key]
+
 
 class TestGetRun:
     @pytest.mark.asyncio
@@ -1,14 +1,19 @@
-from typing import Generator, Optional, Tuple
+from typing import AsyncIterator, Generator, Optional, Tuple
 from unittest.mock import patch
 
 import httpx
 import pytest
 from fastapi import FastAPI
 from fastapi.responses import PlainTextResponse
+from starlette.requests import ClientDisconnect
 
 from dstack._internal.proxy.gateway.repo.repo import GatewayProxyRepo
 from dstack._internal.proxy.lib.auth import BaseProxyAuthProvider
 from dstack._internal.proxy.lib.repo import BaseProxyRepo
+from dstack._internal.proxy.lib.services.replica_balancing import (
+    ReplicaStats,
+    StatsTrackingTransport,
+)
 from dstack._internal.proxy.lib.services.service_connection import ServiceClient
 from dstack._internal.proxy.lib.testing.auth import ProxyTestAuthProvider
 from dstack._internal.proxy.lib.testing.common import (
@@ -239,3 +244,47 @@ async def test_strip_prefix(
     resp = await client.get(f"http://test-host{downstream_path}")
     assert resp.status_code == 200
     assert resp.text == upstream_path
+
+
+@pytest.mark.asyncio
+async def test_closes_upstream_response_if_client_disconnects_before_streaming() -> None:
+    async def stream() -> AsyncIterator[bytes]:
+        yield b"ok"
+
+    stats = ReplicaStats()
+    transport = StatsTrackingTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, content=stream())), stats
+    )
+    client = ServiceClient(base_url="http://test/", transport=transport)
+    repo = ProxyTestRepo()
+    await repo.set_project(make_project("test-proj"))
+    await repo.set_service(make_service("test-proj", "test-run"))
+    app = make_app(repo)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/proxy/services/test-proj/test-run/",
+        "raw_path": b"/proxy/services/test-proj/test-run/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test-host")],
+        "server": ("test-host", 80),
+        "client": ("127.0.0.1", 12345),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        raise OSError("Connection reset by peer")
+
+    with patch(
+        "dstack._internal.proxy.lib.services.service_connection.ServiceConnectionPool.get_or_add"
+    ) as add_connection_mock:
+        add_connection_mock.return_value.client.return_value = client
+        with pytest.raises(ClientDisconnect):
+            await app(scope, receive, send)
+    assert stats.in_flight == 0
@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dstack._internal.core.errors import SSHError
+from dstack._internal.core.services.ssh.tunnel import SSHTunnel
+from dstack._internal.server.services.runner.pool import (
+    RunnerTunnelPool,
+    TunnelKey,
+    get_tunnel_key,
+)
+from dstack._internal.utils.path import FileContent
+
+
+class TestRunnerTunnelPool:
+    @pytest.fixture
+    def tunnel_mock(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        tunnel = MagicMock(spec_set=SSHTunnel)
+        tunnel.check.return_value = True
+        tunnel_cls = MagicMock(return_value=tunnel)
+        monkeypatch.setattr("dstack._internal.server.services.runner.pool.SSHTunnel", tunnel_cls)
+        return tunnel
+
+    @pytest.fixture
+    def key(self) -> TunnelKey:
+        return get_tunnel_key("ubuntu@host", 22, FileContent("key"), [])
+
+    def test_reuses_master_connection(self, tunnel_mock: MagicMock, key: TunnelKey):
+        pool = RunnerTunnelPool(idle_timeout=300, check_interval=30)
+        ports1 = pool.get_ports(key, FileContent("key"), [], [10999])
+        ports2 = pool.get_ports(key, FileContent("key"), [], [10999])
+        assert ports1 == ports2
+        tunnel_mock.open.assert_called_once()
+        tunnel_mock.forward.assert_called_once()
+        tunnel_mock.check.assert_not_called()
+
+    def test_adds_missing_forwardings(self, tunnel_mock: MagicMock, key: TunnelKey):
+        pool = RunnerTunnelPool(idle_timeout=300, check_interval=30)
+        pool.get_ports(key, FileContent("key"), [], [10999])
+        ports = pool.get_ports(key, FileContent("key"), [], [10999, 10998])
+        assert set(ports) == {10999, 10998}
+        tunnel_mock.open.assert_called_once()
+        assert tunnel_mock.forward.call_count == 2
+
+    def test_reopens_dead_master_connection(self, tunnel_mock: MagicMock, key: TunnelKey):
+        pool = RunnerTunnelPool(idle_timeout=300, check_interval=30)
+        pool.get_ports(key, FileContent("key"), [], [10999])
+        pool.mark_suspicious(key)
+        tunnel_mock.check.return_value = False
+        pool.get_ports(key, FileContent("key"), [], [10999])
+        tunnel_mock.check.assert_called_once()
+        tunnel_mock.close.assert_called_once()
+        assert tunnel_mock.open.call_count == 2
+        assert tunnel_mock.forward.call_count == 2
+
+    def test_discards_tunnel_on_ssh_error(self, tunnel_mock: MagicMock, key: TunnelKey):
+        pool = RunnerTunnelPool(idle_timeout=300, check_interval=30)
+        tunnel_mock.forward.side_effect = SSHError
+        with pytest.raises(SSHError):
+            pool.get_ports(key, FileContent("key"), [], [10999])
+        assert len(pool) == 0
+        tunnel_mock.close.assert_called_once()
+
+    def test_evicts_idle_tunnels(self, tunnel_mock: MagicMock, key: TunnelKey):
+        pool = RunnerTunnelPool(idle_timeout=0, check_interval=30)
+        pool.get_ports(key, FileContent("key"), [], [10999])
+        pool.evict_idle()
+        assert len(pool) == 0
+        tunnel_mock.close.assert_called_once()
+
+    def test_does_not_reopen_tunnel_evicted_concurrently(
+        self, tunnel_mock: MagicMock, key: TunnelKey
+    ):
+        pool = RunnerTunnelPool(idle_timeout=0, check_interval=30)
+        pool.get_ports(key, FileContent("key"), [], [10999])
+        get_or_create = pool._get_or_create
+        evicted = False
+
+        def get_or_create_and_evict(*args):
+            nonlocal evicted
+            pooled = get_or_create(*args)
+            if not evicted:
+                # eviction happens after the tunnel is got but before it's locked
+                evicted = True
+                pool.evict_idle()
+            return pooled
+
+        with patch.object(pool, "_get_or_create", side_effect=get_or_create_and_evict):
+            pool.get_ports(key, FileContent("key"), [], [10999])
+        assert len(pool) == 1
+        tunnel_mock.close.assert_called_once()
+        assert tunnel_mock.open.call_count == 2
+
+
+def test_get_tunnel_key_does_not_contain_private_keys():
+    key = get_tunnel_key("ubuntu@host", 22, FileContent("secret"), [])
+    assert "secret" not in repr(key)
+    assert key == get_tunnel_key("ubuntu@host", 22, FileContent("secret"), [])
+    assert key != get_tunnel_key("ubuntu@host", 22, FileContent("other"), [])
@@ -13,7 +13,7 @@ import pytest_asyncio
 from freezegun import freeze_time
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from dstack._internal.core.models.logs import LogEvent, LogEventSource
+from dstack._internal.core.models.logs import LogEvent, LogEventSource, LogProducer
 from dstack._internal.server.models import ProjectModel
 from dstack._internal.server.schemas.logs import PollLogsRequest
 from dstack._internal.server.schemas.runner import LogEvent as RunnerLogEvent
@@ -21,7 +21,12 @@ from dstack._internal.server.services.logs.aws import (
     CloudWatchLogStorage,
 )
 from dstack._internal.server.services.logs.base import LogStorageError
-from dstack._internal.server.services.logs.filelog import FileLogStorage
+from dstack._internal.server.services.logs.filelog import (
+    FileLogFormat,
+    FileLogStorage,
+    convert_log_file_to_binary,
+)
+from dstack._internal.server.services.logs.writer import MAX_WRITE_ATTEMPTS, BufferedLogWriter
 from dstack._internal.server.testing.common import create_project
 
 
@@ -55,6 +60,201 @@ class TestFileLogStorage:
             '{"timestamp": "2023-10-06T10:01:53.235000+00:00", "log_source": "stdout", "message": "V29ybGQ="}\n'
         )
 
+    @pytest.fixture
+    def poll_logs_request(self) -> PollLogsRequest:
+        return PollLogsRequest(
+            run_name="test_run",
+            job_submission_id=UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e"),
+            start_time=None,
+            end_time=None,
+            limit=100,
+            diagnose=True,
+        )
+
+    def _write_runner_logs(self, log_storage: FileLogStorage, project: ProjectModel, n: int):
+        for i in range(n):
+            log_storage.write_logs(
+                project=project,
+                run_name="test_run",
+                job_submission_id=UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e"),
+                runner_logs=[RunnerLogEvent(timestamp=1696586513000 + i, message=str(i).encode())],
+                job_logs=[],
+            )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    @pytest.mark.parametrize("log_format", [FileLogFormat.JSON, FileLogFormat.BINARY])
+    async def test_poll_logs_ascending_with_limit(
+        self,
+        test_db,
+        log_format: FileLogFormat,
+        session: AsyncSession,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        poll_logs_request: PollLogsRequest,
+    ):
+        monkeypatch.setattr(
+            "dstack._internal.server.services.logs.filelog.INDEX_INTERVAL_BYTES", 200
+        )
+        project = await create_project(session=session)
+        log_storage = FileLogStorage(tmp_path, log_format=log_format)
+        self._write_runner_logs(log_storage, project, 20)
+        poll_logs_request.limit = 3
+        messages = []
+        while True:
+            logs = log_storage.poll_logs(project, poll_logs_request).logs
+            if not logs:
+                break
+            assert len(logs) <= 3
+            messages.extend(base64.b64decode(log.message).decode() for log in logs)
+            poll_logs_request.start_time = logs[-1].timestamp
+        assert messages == [str(i) for i in range(20)]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    @pytest.mark.parametrize("log_format", [FileLogFormat.JSON, FileLogFormat.BINARY])
+    async def test_poll_logs_descending_with_limit(
+        self,
+        test_db,
+        log_format: FileLogFormat,
+        session: AsyncSession,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        poll_logs_request: PollLogsRequest,
+    ):
+        monkeypatch.setattr(
+            "dstack._internal.server.services.logs.filelog.INDEX_INTERVAL_BYTES", 200
+        )
+        monkeypatch.setattr("dstack._internal.server.services.logs.filelog._READ_CHUNK_SIZE", 50)
+        project = await create_project(session=session)
+        log_storage = FileLogStorage(tmp_path, log_format=log_format)
+        self._write_runner_logs(log_storage, project, 20)
+        poll_logs_request.descending = True
+        poll_logs_request.limit = 3
+        poll_logs_request.start_time = datetime(2023, 10, 6, 10, 1, 53, 2000, tzinfo=timezone.utc)
+        poll_logs_request.end_time = datetime(2023, 10, 6, 10, 1, 53, 15000, tzinfo=timezone.utc)
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert [base64.b64decode(log.message) for log in logs] == [b"14", b"13", b"12"]
+        poll_logs_request.limit = 100
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert [base64.b64decode(log.message) for log in logs] == [
+            str(i).encode() for i in range(14, 2, -1)
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_poll_logs_skips_partially_written_line(
+        self, test_db, session: AsyncSession, tmp_path: Path, poll_logs_request: PollLogsRequest
+    ):
+        project = await create_project(session=session)
+        log_storage = FileLogStorage(tmp_path)
+        self._write_runner_logs(log_storage, project, 2)
+        log_file_path = log_storage._get_log_file_path(
+            project.name,
+            "test_run",
+            UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e"),
+            LogProducer.RUNNER,
+        )
+        with open(log_file_path, "a") as f:
+            f.write('{"timestamp": "2023-10-06T10:01:53.')
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert len(logs) == 2
+        poll_logs_request.descending = True
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert [base64.b64decode(log.message) for log in logs] == [b"1", b"0"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_poll_binary_logs_skips_partially_written_block(
+        self, test_db, session: AsyncSession, tmp_path: Path, poll_logs_request: PollLogsRequest
+    ):
+        project = await create_project(session=session)
+        log_storage = FileLogStorage(tmp_path, log_format=FileLogFormat.BINARY)
+        self._write_runner_logs(log_storage, project, 2)
+        log_file_path = log_storage._get_log_file_path(
+            project.name,
+            "test_run",
+            UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e"),
+            LogProducer.RUNNER,
+        )
+        assert not log_file_path.exists()
+        with open(log_file_path.with_suffix(".bin"), "ab") as f:
+            f.write(b"\x00\xff\x00\x00\x00partial")
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert [base64.b64decode(log.message) for log in logs] == [b"0", b"1"]
+        poll_logs_request.descending = True
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert [base64.b64decode(log.message) for log in logs] == [b"1", b"0"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_continues_writing_json_logs_in_json(
+        self, test_db, session: AsyncSession, tmp_path: Path, poll_logs_request: PollLogsRequest
+    ):
+        project = await create_project(session=session)
+        self._write_runner_logs(
+            FileLogStorage(tmp_path, log_format=FileLogFormat.JSON), project, 1
+        )
+        log_storage = FileLogStorage(tmp_path, log_format=FileLogFormat.BINARY)
+        self._write_runner_logs(log_storage, project, 2)
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert [base64.b64decode(log.message) for log in logs] == [b"0", b"0", b"1"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_continues_writing_binary_logs_in_binary(
+        self, test_db, session: AsyncSession, tmp_path: Path, poll_logs_request: PollLogsRequest
+    ):
+        project = await create_project(session=session)
+        self._write_runner_logs(
+            FileLogStorage(tmp_path, log_format=FileLogFormat.BINARY), project, 1
+        )
+        log_storage = FileLogStorage(tmp_path, log_format=FileLogFormat.JSON)
+        self._write_runner_logs(log_storage, project, 2)
+        logs = log_storage.poll_logs(project, poll_logs_request).logs
+        assert [base64.b64decode(log.message) for log in logs] == [b"0", b"0", b"1"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_converts_json_logs_to_binary(
+        self,
+        test_db,
+        session: AsyncSession,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        poll_logs_request: PollLogsRequest,
+    ):
+        monkeypatch.setattr(
+            "dstack._internal.server.services.logs.filelog.INDEX_INTERVAL_BYTES", 200
+        )
+        project = await create_project(session=session)
+        log_storage = FileLogStorage(tmp_path)
+        self._write_runner_logs(log_storage, project, 20)
+        json_logs = log_storage.poll_logs(project, poll_logs_request).logs
+        log_file_path = log_storage._get_log_file_path(
+            project.name,
+            "test_run",
+            UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e"),
+            LogProducer.RUNNER,
+        )
+        binary_log_file_path = convert_log_file_to_binary(log_file_path)
+        assert not log_file_path.exists()
+        assert binary_log_file_path.stat().st_size < len(
+            "".join(log.json() + "\n" for log in json_logs)
+        )
+        assert log_storage.poll_logs(project, poll_logs_request).logs == json_logs
+        poll_logs_request.start_time = json_logs[9].timestamp
+        poll_logs_request.limit = 2
+        assert log_storage.poll_logs(project, poll_logs_request).logs == json_logs[10:12]
+
+    def test_init_error_invalid_log_format(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        monkeypatch.setattr("dstack._internal.server.settings.SERVER_FILE_LOG_FORMAT", "protobuf")
+        with pytest.raises(
+            LogStorageError,
+            match="Invalid DSTACK_SERVER_FILE_LOG_FORMAT 'protobuf'. Allowed values: json, binary",
+        ):
+            FileLogStorage(tmp_path)
+
 
 class TestCloudWatchLogStorage:
     FAKE_NOW = datetime(2023, 10, 6, 10, 1, 54, tzinfo=timezone.utc)
@@ -764,3 +964,65 @@ class TestCloudWatchLogStorage:
             for c in mock_client.put_log_events.call_args_list
         ]
         assert actual == expected
+
+
+class TestBufferedLogWriter:
+    @pytest.fixture
+    def project(self) -> ProjectModel:
+        return ProjectModel(name="test-proj")
+
+    def test_coalesces_writes_of_job_submission(self, project: ProjectModel):
+        storage = Mock()
+        writer = BufferedLogWriter(storage=storage, max_buffered_events=100)
+        job_submission_id = UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e")
+        event1 = RunnerLogEvent(timestamp=1, message=b"1")
+        event2 = RunnerLogEvent(timestamp=2, message=b"2")
+        writer.write_logs(project, "test-run", job_submission_id, [], [event1])
+        writer.write_logs(project, "test-run", job_submission_id, [event1], [event2])
+        storage.write_logs.assert_not_called()
+        writer.flush()
+        storage.write_logs.assert_called_once_with(
+            project=project,
+            run_name="test-run",
+            job_submission_id=job_submission_id,
+            runner_logs=[event1],
+            job_logs=[event1, event2],
+        )
+        assert len(writer) == 0
+
+    def test_flushes_when_full(self, project: ProjectModel):
+        storage = Mock()
+        writer = BufferedLogWriter(storage=storage, max_buffered_events=2)
+        job_submission_id = UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e")
+        event = RunnerLogEvent(timestamp=1, message=b"1")
+        writer.write_logs(project, "test-run", job_submission_id, [], [event])
+        storage.write_logs.assert_not_called()
+        writer.write_logs(project, "test-run", job_submission_id, [], [event])
+        storage.write_logs.assert_called_once()
+
+    def test_retries_failed_writes_in_order(self, project: ProjectModel):
+        storage = Mock()
+        storage.write_logs.side_effect = [LogStorageError(), None]
+        writer = BufferedLogWriter(storage=storage, max_buffered_events=100)
+        job_submission_id = UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e")
+        event1 = RunnerLogEvent(timestamp=1, message=b"1")
+        event2 = RunnerLogEvent(timestamp=2, message=b"2")
+        writer.write_logs(project, "test-run", job_submission_id, [], [event1])
+        writer.flush()
+        writer.write_logs(project, "test-run", job_submission_id, [], [event2])
+        writer.flush()
+        assert storage.write_logs.call_args.kwargs["job_logs"] == [event1, event2]
+        assert len(writer) == 0
+
+    def test_drops_logs_after_max_attempts(self, project: ProjectModel):
+        storage = Mock()
+        storage.write_logs.side_effect = LogStorageError()
+        writer = BufferedLogWriter(storage=storage, max_buffered_events=100)
+        job_submission_id = UUID("1b0e1b45-2f8c-4ab6-8010-a0d1a3e44e0e")
+        writer.write_logs(
+            project, "test-run", job_submission_id, [], [RunnerLogEvent(timestamp=1, message=b"")]
+        )
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            writer.flush()
+        assert storage.write_logs.call_count == MAX_WRITE_ATTEMPTS
+        assert len(writer) == 0
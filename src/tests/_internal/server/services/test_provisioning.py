@@ -0,0 +1,110 @@
+import asyncio
+from typing import List, Optional
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.core.backends.base.compute import Compute
+from dstack._internal.core.errors import ProvisioningError
+from dstack._internal.core.models.runs import JobProvisioningData
+from dstack._internal.server.services.provisioning import update_provisioning_data
+from dstack._internal.server.testing.common import get_job_provisioning_data
+
+
+class BatchingCompute(Compute):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: List[List[str]] = []
+
+    def get_offers(self, requirements=None):
+        return []
+
+    def run_job(self, *args, **kwargs):
+        raise NotImplementedError()
+
+    def terminate_instance(self, instance_id, region, backend_data=None):
+        pass
+
+    def update_provisioning_data_batch(
+        self,
+        provisioning_data_list: List[JobProvisioningData],
+        project_ssh_public_key: str,
+        project_ssh_private_key: str,
+    ) -> List[Optional[Exception]]:
+        self.batches.append([pd.instance_id for pd in provisioning_data_list])
+        errors: List[Optional[Exception]] = []
+        for provisioning_data in provisioning_data_list:
+            if provisioning_data.instance_id == "failing":
+                errors.append(ProvisioningError("Instance not found"))
+                continue
+            provisioning_data.hostname = f"{provisioning_data.instance_id}.host"
+            errors.append(None)
+        return errors
+
+
+class NonBatchingCompute(BatchingCompute):
+    update_provisioning_data_batch = Compute.update_provisioning_data_batch
+
+
+def make_provisioning_data(instance_id: str, region: str = "us") -> JobProvisioningData:
+    provisioning_data = get_job_provisioning_data(region=region)
+    provisioning_data.instance_id = instance_id
+    provisioning_data.hostname = None
+    return provisioning_data
+
+
+@pytest.mark.asyncio
+class TestUpdateProvisioningData:
+    async def test_batches_concurrent_calls_by_region(self):
+        compute = BatchingCompute()
+        provisioning_data_list = [
+            make_provisioning_data("a", region="us"),
+            make_provisioning_data("b", region="us"),
+            make_provisioning_data("c", region="eu"),
+        ]
+        await asyncio.gather(
+            *(
+                update_provisioning_data(compute, pd, "pub", "priv")
+                for pd in provisioning_data_list
+            )
+        )
+        assert sorted(compute.batches) == [["a", "b"], ["c"]]
+        assert [pd.hostname for pd in provisioning_data_list] == ["a.host", "b.host", "c.host"]
+
+    async def test_raises_error_only_for_failed_instance(self):
+        compute = BatchingCompute()
+        results = await asyncio.gather(
+            update_provisioning_data(compute, make_provisioning_data("ok"), "pub", "priv"),
+            update_provisioning_data(compute, make_provisioning_data("failing"), "pub", "priv"),
+            return_exceptions=True,
+        )
+        assert results[0] is None
+        assert isinstance(results[1], ProvisioningError)
+        assert compute.batches == [["ok", "failing"]]
+
+    async def test_calls_backends_without_batching_directly(self):
+        compute = NonBatchingCompute()
+        with patch.object(compute, "update_provisioning_data") as update_mock:
+            await asyncio.gather(
+                update_provisioning_data(compute, make_provisioning_data("a"), "pub", "priv"),
+                update_provisioning_data(compute, make_provisioning_data("b"), "pub", "priv"),
+            )
+        assert update_mock.call_count == 2
+        assert compute.batches == []
+
+
+class TestComputeUpdateProvisioningDataBatch:
+    def test_calls_update_provisioning_data_for_each_instance(self):
+        compute = BatchingCompute()
+        provisioning_data_list = [make_provisioning_data("a"), make_provisioning_data("b")]
+        with patch.object(
+            compute,
+            "update_provisioning_data",
+            side_effect=[None, ProvisioningError("Instance not found")],
+        ) as update_mock:
+            errors = Compute.update_provisioning_data_batch(
+                compute, provisioning_data_list, "pub", "priv"
+            )
+        assert update_mock.call_count == 2
+        assert errors[0] is None
+        assert isinstance(errors[1], ProvisioningError)
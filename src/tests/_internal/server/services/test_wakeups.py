@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dstack._internal.core.models.runs import JobStatus
+from dstack._internal.server.services.wakeups import (
+    WakeupBus,
+    WakeupTopic,
+    get_topics_for_job_status,
+    get_wakeup_bus,
+)
+from dstack._internal.server.testing.common import (
+    create_job,
+    create_project,
+    create_repo,
+    create_run,
+    create_user,
+)
+
+pytestmark = pytest.mark.usefixtures("image_config_mock")
+
+
+class TestGetTopicsForJobStatus:
+    def test_new_submission_wakes_up_submitted_jobs(self):
+        assert get_topics_for_job_status(None, JobStatus.SUBMITTED) == {
+            WakeupTopic.RUNS,
+            WakeupTopic.SUBMITTED_JOBS,
+        }
+
+    def test_provisioned_job_wakes_up_running_jobs(self):
+        assert get_topics_for_job_status(JobStatus.SUBMITTED, JobStatus.PROVISIONING) == {
+            WakeupTopic.RUNS,
+            WakeupTopic.RUNNING_JOBS,
+        }
+
+    def test_transition_within_topic_does_not_wake_up_processor(self):
+        assert get_topics_for_job_status(JobStatus.PULLING, JobStatus.RUNNING) == {
+            WakeupTopic.RUNS
+        }
+
+
+class TestWakeupBus:
+    @pytest.mark.asyncio
+    async def test_coalesces_wakeups_while_handler_is_running(self):
+        bus = WakeupBus()
+        calls = 0
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await release.wait()
+
+        bus.subscribe(WakeupTopic.RUNS, handler)
+        bus.publish([WakeupTopic.RUNS])
+        await started.wait()
+        for _ in range(3):
+            bus.publish([WakeupTopic.RUNS])
+        release.set()
+        await asyncio.gather(*bus._tasks)
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_publishes_status_changes_on_commit(
+        self, test_db, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr("dstack._internal.server.settings.BACKGROUND_WAKEUPS_ENABLED", True)
+        published = []
+        monkeypatch.setattr(get_wakeup_bus(), "publish", published.append)
+        project = await create_project(session=session)
+        user = await create_user(session=session)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run, status=JobStatus.SUBMITTED)
+        assert WakeupTopic.SUBMITTED_JOBS in published[-1]
+
+        published.clear()
+        job.status = JobStatus.PROVISIONING
+        await session.flush()
+        assert published == []
+        await session.commit()
+        assert published == [{WakeupTopic.RUNS, WakeupTopic.RUNNING_JOBS}]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("test_db", ["sqlite", "postgres"], indirect=True)
+    async def test_does_not_publish_rolled_back_changes(
+        self, test_db, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr("dstack._internal.server.settings.BACKGROUND_WAKEUPS_ENABLED", True)
+        published = []
+        monkeypatch.setattr(get_wakeup_bus(), "publish", published.append)
+        project = await create_project(session=session)
+        user = await create_user(session=session)
+        repo = await create_repo(session=session, project_id=project.id)
+        run = await create_run(session=session, project=project, repo=repo, user=user)
+        job = await create_job(session=session, run=run, status=JobStatus.RUNNING)
+        published.clear()
+
+        job.status = JobStatus.TERMINATING
+        await session.flush()
+        await session.rollback()
+        await session.commit()
+        assert published == []
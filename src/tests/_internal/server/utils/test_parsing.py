@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.core.models.runs import JobProvisioningData, RunSpec
+from dstack._internal.server import settings
+from dstack._internal.server.testing.common import get_job_provisioning_data, get_run_spec
+from dstack._internal.server.utils.parsing import (
+    clear_parsed_models_cache,
+    get_parsed_models_cache_stats,
+    parse_raw_cached,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_parsed_models_cache()
+    yield
+    clear_parsed_models_cache()
+
+
+class TestParseRawCached:
+    def test_parses_same_json_once(self):
+        raw = get_run_spec(run_name="test-run", repo_id="test-repo").json()
+        stats_before = get_parsed_models_cache_stats()
+        run_spec1 = parse_raw_cached(RunSpec.__response__, raw)
+        run_spec2 = parse_raw_cached(RunSpec.__response__, raw)
+        assert run_spec1 == RunSpec.__response__.parse_raw(raw)
+        assert run_spec2 == run_spec1
+        assert run_spec2.merged_profile == run_spec1.merged_profile
+        stats = get_parsed_models_cache_stats()
+        assert stats.misses - stats_before.misses == 1
+        assert stats.hits - stats_before.hits == 1
+
+    def test_parses_changed_json(self):
+        jpd = get_job_provisioning_data()
+        jpd1 = parse_raw_cached(JobProvisioningData.__response__, jpd.json())
+        jpd.hostname = "changed"
+        jpd2 = parse_raw_cached(JobProvisioningData.__response__, jpd.json())
+        assert jpd1.hostname != "changed"
+        assert jpd2.hostname == "changed"
+
+    def test_returns_copies(self):
+        raw = get_job_provisioning_data().json()
+        jpd = parse_raw_cached(JobProvisioningData.__response__, raw)
+        jpd.hostname = "changed"
+        assert parse_raw_cached(JobProvisioningData.__response__, raw).hostname != "changed"
+
+    def test_does_not_cache_if_disabled(self):
+        raw = get_job_provisioning_data().json()
+        with patch.object(settings, "SERVER_PARSED_MODELS_CACHE_SIZE", 0):
+            parse_raw_cached(JobProvisioningData.__response__, raw)
+            parse_raw_cached(JobProvisioningData.__response__, raw)
+        assert get_parsed_models_cache_stats().size == 0
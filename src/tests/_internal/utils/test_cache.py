@@ -0,0 +1,112 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from dstack._internal.utils.cache import CacheStats, SingleFlightCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSingleFlightCache:
+    def test_returns_cached_value_within_ttl(self):
+        timer = FakeTimer()
+        cache = SingleFlightCache(maxsize=2, ttl=10, timer=timer)
+        load = Mock(return_value=1)
+        assert cache.get("a", load) == 1
+        timer.now = 9
+        assert cache.get("a", load) == 1
+        load.assert_called_once()
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_reloads_expired_value(self):
+        timer = FakeTimer()
+        cache = SingleFlightCache(maxsize=2, ttl=10, timer=timer)
+        load = Mock(side_effect=[1, 2])
+        assert cache.get("a", load) == 1
+        timer.now = 10
+        assert cache.get("a", load) == 2
+        assert cache.stats.misses == 2
+
+    def test_evicts_least_recently_used(self):
+        cache = SingleFlightCache(maxsize=2, ttl=10, timer=FakeTimer())
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 1)
+        cache.get("c", lambda: 3)
+        assert cache.peek("a") == 1
+        assert cache.peek("b") is None
+        assert cache.stats.size == 2
+
+    def test_serves_stale_value_while_refreshing(self):
+        timer = FakeTimer()
+        cache = SingleFlightCache(maxsize=2, ttl=10, stale_ttl=10, timer=timer)
+        release = threading.Event()
+
+        def refresh():
+            release.wait(5)
+            return 2
+
+        cache.get("a", lambda: 1)
+        timer.now = 15
+        assert cache.get("a", refresh) == 1
+        # Refresh is in progress, no more refreshes are started
+        assert cache.get("a", Mock(side_effect=AssertionError)) == 1
+        release.set()
+        deadline = time.monotonic() + 5
+        while cache.peek("a") != 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get("a", Mock(side_effect=AssertionError)) == 2
+        assert cache.stats.stale_hits == 2
+
+    def test_coalesces_concurrent_misses(self):
+        cache = SingleFlightCache(maxsize=2, ttl=10)
+        started = threading.Event()
+        release = threading.Event()
+        calls = 0
+
+        def load():
+            nonlocal calls
+            calls += 1
+            started.set()
+            release.wait(5)
+            return 1
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(cache.get("a", load)))
+        leader.start()
+        assert started.wait(5)
+        followers = [
+            threading.Thread(target=lambda: results.append(cache.get("a", load))) for _ in range(3)
+        ]
+        for t in followers:
+            t.start()
+        while cache.stats.coalesced < 3:
+            pass
+        release.set()
+        for t in [leader, *followers]:
+            t.join(5)
+        assert results == [1, 1, 1, 1]
+        assert calls == 1
+
+    def test_propagates_load_error_and_does_not_cache_it(self):
+        cache = SingleFlightCache(maxsize=2, ttl=10)
+        with pytest.raises(ValueError):
+            cache.get("a", Mock(side_effect=ValueError))
+        assert cache.get("a", lambda: 1) == 1
+        assert cache.stats.load_errors == 1
+
+
+class TestCacheStats:
+    def test_adds_stats(self):
+        assert CacheStats(hits=1, misses=2, size=3) + CacheStats(hits=4, load_errors=1) == (
+            CacheStats(hits=5, misses=2, load_errors=1, size=3)
+        )
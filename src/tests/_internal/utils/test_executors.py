@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from dstack._internal.utils.executors import NamedExecutor
+
+
+class TestNamedExecutor:
+    @pytest.mark.asyncio
+    async def test_runs_func_in_named_thread(self):
+        executor = NamedExecutor(name="test", max_workers=1)
+        try:
+            result = await executor.run(
+                lambda x, y: (x + y, threading.current_thread().name), 1, y=2
+            )
+        finally:
+            executor.shutdown()
+        assert result[0] == 3
+        assert result[1].startswith("dstack-test")
+        stats = executor.stats
+        assert stats.completed == 1
+        assert stats.active == 0
+        assert stats.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_tracks_queued_tasks(self):
+        executor = NamedExecutor(name="test", max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        try:
+            tasks = [asyncio.create_task(executor.run(block)) for _ in range(3)]
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            stats = executor.stats
+            assert stats.active == 1
+            assert stats.queued == 2
+            release.set()
+            await asyncio.gather(*tasks)
+        finally:
+            release.set()
+            executor.shutdown()
+        assert executor.stats.completed == 3
+
+    @pytest.mark.asyncio
+    async def test_does_not_count_cancelled_queued_tasks(self):
+        executor = NamedExecutor(name="test", max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        try:
+            running_task = asyncio.create_task(executor.run(block))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            queued_task = asyncio.create_task(executor.run(block))
+            await asyncio.sleep(0)
+            assert executor.stats.queued == 1
+            queued_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued_task
+            assert executor.stats.queued == 0
+            release.set()
+            await running_task
+        finally:
+            release.set()
+            executor.shutdown()
+        stats = executor.stats
+        assert stats.queued == 0
+        assert stats.completed == 1
+
+    @pytest.mark.asyncio
+    async def test_warns_if_saturated_once_per_interval(self):
+        executor = NamedExecutor(name="test", max_workers=1, saturation_warning_wait_time=0)
+        try:
+            with patch("dstack._internal.utils.executors.logger") as logger_mock:
+                await executor.run(lambda: None)
+                await executor.run(lambda: None)
+        finally:
+            executor.shutdown()
+        logger_mock.warning.assert_called_once()